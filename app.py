@@ -6,17 +6,66 @@ A local web dashboard for monitoring OpenClaw activity on macOS.
 
 import os
 import glob
-import subprocess
 import json
 import re
+import time
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, g, render_template_string, jsonify, request
+
+from cli_runner import CommandRunner
+from collector_scheduler import CollectorScheduler
+from debug_tools import MemoryTracer, SamplingProfiler, authorize as authorize_debug
+from health_probes import HealthProbes
+from http_cache import RenderCache, is_not_modified, negotiate_encoding, validator_headers
+from log_index import LogIndex
+from log_rules import load_rule_engine
+from metrics_history import MetricsHistory
+from log_tail import LinePrefilter, LogTailer
+from paged_lists import PagedList, PagedViews
+from prom_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from session_model import TaskModel
+from session_store import SessionStoreCache
+from snapshot_stream import SnapshotStream
 
 app = Flask(__name__)
 
 # Configuration
 LOG_DIR = "/tmp/openclaw"
 REFRESH_INTERVAL = 10  # seconds
+LOG_BUFFER_SIZE = 500  # parsed activity events kept in memory by the log tailer
+
+# Rows per panel in / and /api/data; the rest are paged in from /api/logs, /api/tasks and /api/cron
+PANEL_ROWS = {
+    'logs': 80,
+    'tasks': 120,
+    'cron_jobs': 10,
+}
+
+# Task status by age since the session last updated: fresh delegated work is todo,
+# medium-age work pending, and anything older completed unless it was aborted
+TASK_STAGES = (
+    (20 * 60 * 1000, 'todo'),
+    (2 * 60 * 60 * 1000, 'pending'),
+)
+TASK_STATUSES = ('pending', 'completed', 'failed', 'todo')
+
+# Background refresh interval per collector (seconds)
+COLLECTOR_INTERVALS = {
+    'logs': 5,
+    'tasks': 10,
+    'cron_jobs': 60,
+    'codex_usage': 60,
+    'openclaw_usage': 15,
+}
+
+# How long a request waits for a collector's first result before rendering without it
+COLLECTOR_DEADLINES = {
+    'logs': 2,
+    'tasks': 2,
+    'cron_jobs': 5,
+    'codex_usage': 5,
+    'openclaw_usage': 5,
+}
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -82,29 +131,34 @@ HTML_TEMPLATE = """
             <h1>🖥️ OpenClaw Dashboard</h1>
             <div>
                 <button class="refresh-btn" onclick="refreshData()">🔄 Refresh</button>
-                <span class="auto-refresh">Auto-refresh: {{ refresh_interval }}s</span>
+                <span class="auto-refresh" id="refresh-mode">Auto-refresh: {{ refresh_interval }}s</span>
             </div>
         </header>
         
-        {% if warning %}
-        <div class="warning">{{ warning }}</div>
-        {% endif %}
+        <div id="warnings">
+            {% if warning %}
+            <div class="warning">{{ warning }}</div>
+            {% endif %}
+            {% if notes %}
+            <div class="warning">{{ notes|join(' ') }}</div>
+            {% endif %}
+        </div>
         
         <div class="counters">
             <div class="counter pending">
-                <div class="counter-value">{{ stats.pending }}</div>
+                <div class="counter-value" id="stat-pending">{{ stats.pending }}</div>
                 <div class="counter-label">Pending</div>
             </div>
             <div class="counter completed">
-                <div class="counter-value">{{ stats.completed }}</div>
+                <div class="counter-value" id="stat-completed">{{ stats.completed }}</div>
                 <div class="counter-label">Completed</div>
             </div>
             <div class="counter failed">
-                <div class="counter-value">{{ stats.failed }}</div>
+                <div class="counter-value" id="stat-failed">{{ stats.failed }}</div>
                 <div class="counter-label">Failed</div>
             </div>
             <div class="counter todo">
-                <div class="counter-value">{{ stats.todo }}</div>
+                <div class="counter-value" id="stat-todo">{{ stats.todo }}</div>
                 <div class="counter-label">TODO</div>
             </div>
         </div>
@@ -120,12 +174,12 @@ HTML_TEMPLATE = """
         <div class="panel">
             <div class="panel-header">
                 <span>📋 Tasks</span>
-                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;">{{ tasks|length }} items</span>
+                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;" id="tasks-count">{{ pages.tasks.total }} items</span>
             </div>
-            <div class="panel-content">
+            <div class="panel-content" id="tasks">
                 {% if tasks %}
                     {% for task in tasks %}
-                    <div class="task-item" data-status="{{ task.status }}">
+                    <div class="task-item" data-status="{{ task.status }}" data-key="{{ task.key }}">
                         <div class="task-main">
                             <div class="task-name">{{ task.name }}</div>
                             <div class="task-summary">{{ task.summary }}</div>
@@ -142,9 +196,9 @@ HTML_TEMPLATE = """
         <div class="panel">
             <div class="panel-header">
                 <span>📝 Recent Activity</span>
-                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;">{{ logs|length }} lines</span>
+                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;" id="logs-count">{{ pages.logs.total }} lines</span>
             </div>
-            <div class="panel-content">
+            <div class="panel-content" id="logs">
                 {% if logs %}
                     {% for log in logs %}
                     <div class="log-line">
@@ -161,9 +215,9 @@ HTML_TEMPLATE = """
         <div class="panel">
             <div class="panel-header">
                 <span>⏰ Cron Jobs</span>
-                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;">{{ cron_jobs|length }} jobs</span>
+                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;" id="cron-count">{{ pages.cron_jobs.total }} jobs</span>
             </div>
-            <div class="panel-content">
+            <div class="panel-content" id="cron">
                 {% if cron_jobs %}
                     {% for job in cron_jobs %}
                     <div class="task-item">
@@ -177,13 +231,13 @@ HTML_TEMPLATE = """
             </div>
         </div>
         
-        {% if codex_usage %}
-        <div class="panel">
+        <div class="panel" id="codex-panel"{% if not codex_usage %} style="display: none;"{% endif %}>
             <div class="panel-header">
                 <span>🔮 Codex Usage</span>
-                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;">{{ codex_usage.plan or 'Account' }}</span>
+                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;" id="codex-plan">{% if codex_usage %}{{ codex_usage.plan or 'Account' }}{% endif %}</span>
             </div>
-            <div class="panel-content" style="max-height: 180px;">
+            <div class="panel-content" style="max-height: 180px;" id="codex">
+                {% if codex_usage %}
                 <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
                     <div>
                         <div style="color: #9ca3af; font-size: 12px; margin-bottom: 4px;">Primary Window</div>
@@ -201,17 +255,17 @@ HTML_TEMPLATE = """
                     {{ codex_usage.accountEmail }}
                 </div>
                 {% endif %}
+                {% endif %}
             </div>
         </div>
-        {% endif %}
         
-        {% if openclaw_usage %}
-        <div class="panel">
+        <div class="panel" id="openclaw-panel"{% if not openclaw_usage %} style="display: none;"{% endif %}>
             <div class="panel-header">
                 <span>🦞 OpenClaw Sessions</span>
-                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;">{{ openclaw_usage.totalActive }} active</span>
+                <span style="font-weight: normal; font-size: 13px; color: #9ca3af;" id="openclaw-active">{% if openclaw_usage %}{{ openclaw_usage.totalActive }} active{% endif %}</span>
             </div>
-            <div class="panel-content" style="max-height: 220px;">
+            <div class="panel-content" style="max-height: 220px;" id="openclaw">
+                {% if openclaw_usage %}
                 {% if openclaw_usage.mainSession %}
                 <div style="margin-bottom: 12px; padding-bottom: 12px; border-bottom: 1px solid #3d3d3d;">
                     <div style="color: #9ca3af; font-size: 12px; margin-bottom: 4px;">Main Session</div>
@@ -235,13 +289,18 @@ HTML_TEMPLATE = """
                 {% else %}
                     <div class="empty-state">No session data</div>
                 {% endif %}
+                {% endif %}
             </div>
         </div>
-        {% endif %}
     </div>
     
     <script>
         let currentFilter = 'all';
+        let state = null;
+        let lastEventId = null;
+        let stream = null;
+        let streamConnected = false;
+        let reconnectDelay = 1000;
         
         function setFilter(filter) {
             currentFilter = filter;
@@ -249,7 +308,7 @@ HTML_TEMPLATE = """
                 chip.classList.toggle('active', chip.dataset.filter === filter);
             });
             
-            document.querySelectorAll('.task-item').forEach(item => {
+            document.querySelectorAll('#tasks .task-item').forEach(item => {
                 if (filter === 'all' || item.dataset.status === filter) {
                     item.style.display = 'flex';
                 } else {
@@ -258,6 +317,289 @@ HTML_TEMPLATE = """
             });
         }
         
+        function esc(value) {
+            return String(value == null ? '' : value)
+                .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+                .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+        }
+        
+        function emptyState(text) {
+            return `<div class="empty-state">${text}</div>`;
+        }
+        
+        function taskHtml(task) {
+            return `<div class="task-item" data-status="${esc(task.status)}" data-key="${esc(task.key)}">
+                <div class="task-main">
+                    <div class="task-name">${esc(task.name)}</div>
+                    <div class="task-summary">${esc(task.summary)}</div>
+                </div>
+                <span class="task-status ${esc(task.status)}">${esc(task.status)}</span>
+            </div>`;
+        }
+        
+        function logHtml(log) {
+            return `<div class="log-line">
+                <span class="log-time">${esc(log.time)}</span>
+                <span>${esc(log.message)}</span>
+            </div>`;
+        }
+        
+        function cronHtml(job) {
+            return `<div class="task-item">
+                <span class="task-name">${esc(job.name)}</span>
+                <span class="task-status todo">${esc(job.schedule)}</span>
+            </div>`;
+        }
+        
+        function codexHtml(usage) {
+            const windowHtml = (label, w) => `<div>
+                <div style="color: #9ca3af; font-size: 12px; margin-bottom: 4px;">${label}</div>
+                <div style="font-size: 1.4rem; font-weight: bold;">${esc(w && w.usedPercent)}%</div>
+                <div style="font-size: 11px; color: #6b7280;">${esc(w && w.resetDescription)}</div>
+            </div>`;
+            let html = `<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px;">
+                ${windowHtml('Primary Window', usage.primary)}${windowHtml('Secondary Window', usage.secondary)}
+            </div>`;
+            if (usage.accountEmail) {
+                html += `<div style="margin-top: 12px; padding-top: 12px; border-top: 1px solid #3d3d3d; font-size: 12px; color: #9ca3af;">${esc(usage.accountEmail)}</div>`;
+            }
+            return html;
+        }
+        
+        function openclawHtml(usage) {
+            const ratio = r => r ? ` (${esc(r)}%)` : '';
+            let html = '';
+            const main = usage.mainSession;
+            if (main) {
+                html += `<div style="margin-bottom: 12px; padding-bottom: 12px; border-bottom: 1px solid #3d3d3d;">
+                    <div style="color: #9ca3af; font-size: 12px; margin-bottom: 4px;">Main Session</div>
+                    <div style="font-size: 13px;">${esc(main.model)}</div>
+                    <div style="font-size: 12px;">${esc(main.totalTokens || 0)} tokens / ${esc(main.contextTokens || 0)} context${ratio(main.tokenRatio)}</div>
+                </div>`;
+            }
+            if (usage.topSessions && usage.topSessions.length) {
+                html += '<div style="color: #9ca3af; font-size: 12px; margin-bottom: 8px;">Top Sessions by Tokens</div>';
+                html += usage.topSessions.map(s => `<div class="task-item">
+                    <div class="task-main">
+                        <div class="task-name" style="font-size: 12px;">${esc(s.key)}</div>
+                        <div class="task-summary" style="font-size: 11px;">${esc(s.model)} • ${esc(s.totalTokens || 0)} tokens${ratio(s.tokenRatio)}</div>
+                    </div>
+                </div>`).join('');
+            } else {
+                html += emptyState('No session data');
+            }
+            return html;
+        }
+        
+        // Keyed DOM patch: rows whose key and content are unchanged are kept as-is,
+        // changed rows are replaced, and rows are only moved when the order changed.
+        function patchList(container, items, keyOf, htmlOf, emptyText) {
+            if (!items.length) {
+                container.innerHTML = emptyState(emptyText);
+                return;
+            }
+            const existing = new Map();
+            Array.from(container.children).forEach(el => {
+                if (el.dataset.key) existing.set(el.dataset.key, el);
+                else el.remove();
+            });
+            const seen = new Map();
+            let cursor = container.firstElementChild;
+            items.forEach(item => {
+                const base = String(keyOf(item));
+                const n = seen.get(base) || 0;
+                seen.set(base, n + 1);
+                const key = n ? `${base}#${n}` : base;
+                const sig = JSON.stringify(item);
+                let el = existing.get(key);
+                existing.delete(key);
+                if (!el || el.dataset.sig !== sig) {
+                    const tpl = document.createElement('template');
+                    tpl.innerHTML = htmlOf(item).trim();
+                    const fresh = tpl.content.firstElementChild;
+                    fresh.dataset.key = key;
+                    fresh.dataset.sig = sig;
+                    if (el) {
+                        if (el === cursor) cursor = fresh;
+                        el.replaceWith(fresh);
+                    }
+                    el = fresh;
+                }
+                if (el === cursor) cursor = cursor.nextElementSibling;
+                else container.insertBefore(el, cursor);
+            });
+            existing.forEach(el => el.remove());
+        }
+        
+        // Rows past each panel's first page, fetched from the list endpoints as the panel is scrolled
+        const paging = {
+            tasks: {url: '/api/tasks', keyOf: t => t.key, older: [], shown: [], cursor: undefined, loading: false},
+            logs: {url: '/api/logs', keyOf: l => l.id, older: [], shown: [], cursor: undefined, loading: false},
+            cron_jobs: {url: '/api/cron', keyOf: j => j.name, older: [], shown: [], cursor: undefined, loading: false},
+        };
+        
+        // Live first page plus loaded older rows; rows pushed off the first page join the older ones
+        function panelRows(name) {
+            const p = paging[name], live = state[name] || [];
+            const liveKeys = new Set(live.map(p.keyOf));
+            if (p.older.length) {
+                const dropped = p.shown.filter(item => !liveKeys.has(p.keyOf(item)));
+                if (name === 'logs') dropped.reverse();
+                const droppedKeys = new Set(dropped.map(p.keyOf));
+                p.older = dropped.concat(p.older.filter(item => !droppedKeys.has(p.keyOf(item))));
+            }
+            p.shown = live;
+            const older = p.older.filter(item => !liveKeys.has(p.keyOf(item)));
+            return name === 'logs' ? older.slice().reverse().concat(live) : live.concat(older);
+        }
+        
+        function loadMore(name, el) {
+            const p = paging[name];
+            const cursor = p.cursor === undefined ? state && state.pages && state.pages[name].next : p.cursor;
+            if (p.loading || !cursor) return;
+            p.loading = true;
+            fetch(`${p.url}?limit=50&cursor=${encodeURIComponent(cursor)}`)
+                .then(res => res.json())
+                .then(page => {
+                    if (!page.results) return;
+                    p.older = p.older.concat(page.results);
+                    p.cursor = page.nextCursor;
+                    const height = el.scrollHeight;
+                    renderers[name](state[name]);
+                    // Older activity goes above what the user is reading; keep it in place
+                    if (name === 'logs') el.scrollTop += el.scrollHeight - height;
+                })
+                .catch(err => {
+                    console.error('Load more failed:', err);
+                })
+                .finally(() => {
+                    p.loading = false;
+                });
+        }
+        
+        function patchHtml(el, html) {
+            if (el._html !== html) {
+                el.innerHTML = html;
+                el._html = html;
+            }
+        }
+        
+        function statusNotes(data) {
+            const errors = data.errors || {}, lastGood = data.lastGood || {};
+            const notes = [];
+            const collecting = (data.partial || []).filter(name => !(name in errors));
+            if (collecting.length) notes.push(`Still collecting: ${collecting.join(', ')}.`);
+            const stale = (data.stale || []).map(name =>
+                `${name} (as of ${new Date(lastGood[name]).toLocaleTimeString([], {hour12: false})})`);
+            if (stale.length) notes.push(`Showing stale data for: ${stale.join(', ')}.`);
+            Object.keys(errors).sort().forEach(name => notes.push(`${name} refresh failed: ${errors[name]}`));
+            return notes;
+        }
+        
+        function renderWarnings(data) {
+            let html = '';
+            if (data.warning) html += `<div class="warning">${esc(data.warning)}</div>`;
+            const notes = statusNotes(data);
+            if (notes.length) html += `<div class="warning">${esc(notes.join(' '))}</div>`;
+            patchHtml(document.getElementById('warnings'), html);
+        }
+        
+        const renderers = {
+            stats(stats) {
+                ['pending', 'completed', 'failed', 'todo'].forEach(k => {
+                    document.getElementById('stat-' + k).textContent = stats[k];
+                });
+            },
+            tasks() {
+                patchList(document.getElementById('tasks'), panelRows('tasks'), t => t.key, taskHtml, 'No tasks found');
+                setFilter(currentFilter);
+            },
+            logs() {
+                patchList(document.getElementById('logs'), panelRows('logs'), l => l.id, logHtml, 'No log entries found');
+            },
+            cron_jobs() {
+                patchList(document.getElementById('cron'), panelRows('cron_jobs'), j => j.name, cronHtml, 'No cron jobs configured');
+            },
+            pages(pages) {
+                document.getElementById('tasks-count').textContent = `${pages.tasks.total} items`;
+                document.getElementById('logs-count').textContent = `${pages.logs.total} lines`;
+                document.getElementById('cron-count').textContent = `${pages.cron_jobs.total} jobs`;
+            },
+            codex_usage(usage) {
+                document.getElementById('codex-panel').style.display = usage ? '' : 'none';
+                if (!usage) return;
+                document.getElementById('codex-plan').textContent = usage.plan || 'Account';
+                patchHtml(document.getElementById('codex'), codexHtml(usage));
+            },
+            openclaw_usage(usage) {
+                document.getElementById('openclaw-panel').style.display = usage ? '' : 'none';
+                if (!usage) return;
+                document.getElementById('openclaw-active').textContent = `${usage.totalActive} active`;
+                patchHtml(document.getElementById('openclaw'), openclawHtml(usage));
+            },
+            warning: renderWarnings,
+            partial: renderWarnings,
+            stale: renderWarnings,
+            lastGood: renderWarnings,
+            errors: renderWarnings,
+        };
+        
+        function render(data, sections) {
+            const done = new Set();
+            sections.forEach(name => {
+                const fn = renderers[name];
+                if (!fn || done.has(fn)) return;
+                done.add(fn);
+                fn(fn === renderWarnings ? data : data[name]);
+            });
+        }
+        
+        function applySection(name, op) {
+            if ('set' in op) {
+                state[name] = op.set;
+            } else if ('append' in op) {
+                state[name] = (state[name] || []).concat(op.append).slice(-op.limit);
+            } else if ('upsert' in op) {
+                const byKey = new Map((state[name] || []).map(item => [item.key, item]));
+                op.remove.forEach(key => byKey.delete(key));
+                op.upsert.forEach(item => byKey.set(item.key, item));
+                state[name] = Array.from(byKey.values())
+                    .sort((a, b) => (b.updatedAt || 0) - (a.updatedAt || 0))
+                    .slice(0, op.limit);
+            }
+        }
+        
+        function connectStream() {
+            const url = '/api/stream' + (lastEventId ? '?lastEventId=' + encodeURIComponent(lastEventId) : '');
+            stream = new EventSource(url);
+            stream.addEventListener('snapshot', e => {
+                state = JSON.parse(e.data);
+                lastEventId = e.lastEventId;
+                render(state, Object.keys(state));
+            });
+            stream.addEventListener('delta', e => {
+                lastEventId = e.lastEventId;
+                if (!state) return;
+                const sections = JSON.parse(e.data);
+                Object.entries(sections).forEach(([name, op]) => applySection(name, op));
+                render(state, Object.keys(sections));
+            });
+            stream.onopen = () => {
+                streamConnected = true;
+                reconnectDelay = 1000;
+                document.getElementById('refresh-mode').textContent = 'Live';
+            };
+            stream.onerror = () => {
+                streamConnected = false;
+                document.getElementById('refresh-mode').textContent = 'Auto-refresh: {{ refresh_interval }}s';
+                // EventSource retries on its own (sending Last-Event-ID); rebuild it if the browser gave up
+                if (stream.readyState === EventSource.CLOSED) {
+                    setTimeout(connectStream, reconnectDelay);
+                    reconnectDelay = Math.min(reconnectDelay * 2, 30000);
+                }
+            };
+        }
+        
         function refreshData() {
             const btn = document.querySelector('.refresh-btn');
             btn.classList.add('loading');
@@ -266,18 +608,32 @@ HTML_TEMPLATE = """
             fetch('/api/data')
                 .then(res => res.json())
                 .then(data => {
-                    location.reload();
+                    state = data;
+                    render(state, Object.keys(state));
                 })
                 .catch(err => {
                     console.error('Refresh failed:', err);
+                })
+                .finally(() => {
                     btn.classList.remove('loading');
                     btn.textContent = '🔄 Refresh';
                 });
         }
         
-        // Auto-refresh
+        [['tasks', 'tasks'], ['logs', 'logs'], ['cron_jobs', 'cron']].forEach(([name, id]) => {
+            const el = document.getElementById(id);
+            el.addEventListener('scroll', () => {
+                const atEnd = name === 'logs' ? el.scrollTop < 40 : el.scrollHeight - el.scrollTop - el.clientHeight < 40;
+                if (atEnd) loadMore(name, el);
+            });
+        });
+        
+        // Live updates over SSE; fall back to polling while the stream is down
+        if (window.EventSource) {
+            connectStream();
+        }
         setInterval(() => {
-            refreshData();
+            if (!streamConnected) refreshData();
         }, {{ refresh_interval }} * 1000);
     </script>
 </body>
@@ -285,14 +641,58 @@ HTML_TEMPLATE = """
 """
 
 
+# Expected format: ISO level [subsystem] message
+_LOG_LINE_RE = re.compile(r"^(\S+)\s+(\w+)\s+\[([^\]]+)\]\s+(.*)$")
+
+_JSON_ARG0_RE = re.compile(r'"0":"([^"]+)"')
+_JSON_ARG1_RE = re.compile(r'"1":"([^"]+)"')
+
+# Summary rewrite rules and keep keywords, compiled once (log_rules.json + user file)
+LOG_RULES = load_rule_engine()
+
+# Lines _parse_log_line could keep: a keep keyword or error/warn anywhere, or a line
+# not in the layout above once stripped (so `ts level [sub] ` with no message is
+# free-form); everything else is skipped without being decoded
+LOG_PREFILTER = LinePrefilter(
+    LOG_RULES.keep_keywords + ('error', 'warn'), rb'\S+[ \t]+\w+[ \t]+\[[^\]\n]+\][ \t]+\S'
+)
+
+# Prometheus metrics for /metrics. Timings are recorded as they happen; counters the
+# components already keep, and the dashboard's gauges, are read when /metrics is scraped
+prom = MetricsRegistry()
+collector_seconds = prom.histogram('collector_duration_seconds', 'Duration of each collector run.', ('collector',))
+collector_errors = prom.counter('collector_errors', 'Collector runs that raised.', ('collector',))
+render_seconds = prom.histogram(
+    'render_duration_seconds', 'Time to render a response body on a render cache miss.', ('route',)
+)
+request_seconds = prom.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route and status (/api/stream excluded).',
+    ('route', 'status')
+)
+
+
+# tracemalloc control for /debug/memory; collectors are wrapped to record their peak allocation
+memory = MemoryTracer()
+
+
+def _observe_collector(name, seconds, error):
+    collector_seconds.labels(name).observe(seconds)
+    if error is not None:
+        collector_errors.labels(name).inc()
+
+
+# CLI calls shared by collectors, probes and requests: one subprocess per argv at a time
+commands = CommandRunner()
+
+
 def _summarize_log_message(raw: str) -> str:
     """Convert noisy OpenClaw log lines into concise, human-readable summaries."""
     s = raw.strip()
 
     # Unwrap common JSON-wrapped console payloads: {"0":"...","1":"...","_meta":...}
     if s.startswith('{"0"'):
-        m1 = re.search(r'"1":"([^"]+)"', s)
-        m0 = re.search(r'"0":"([^"]+)"', s)
+        m1 = _JSON_ARG1_RE.search(s)
+        m0 = _JSON_ARG0_RE.search(s)
         s = (m1.group(1) if m1 else (m0.group(1) if m0 else s))
         s = s.replace('\\\"', '"').replace('\\n', ' ').replace('\\t', ' ').strip()
 
@@ -300,20 +700,10 @@ def _summarize_log_message(raw: str) -> str:
     if '"_meta"' in s and 'embedded run' not in s and 'lane ' not in s and 'sendMessage ok' not in s:
         return ''
 
-    # Common high-signal simplifications
-    replacements = [
-        (r"embedded run tool start:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool started: \1"),
-        (r"embedded run tool end:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool finished: \1"),
-        (r"embedded run done:.*aborted=(true|false).*$", r"Run finished (aborted=\1)"),
-        (r"lane enqueue: lane=([^\s]+).*$", r"Queued: \1"),
-        (r"lane dequeue: lane=([^\s]+).*$", r"Started: \1"),
-        (r"lane task done: lane=([^\s]+).*$", r"Completed: \1"),
-        (r"telegram sendMessage ok chat=([^\s]+).*$", r"Telegram sent to chat \1"),
-    ]
-    for pattern, repl in replacements:
-        m = re.search(pattern, s)
-        if m:
-            return re.sub(pattern, repl, s)
+    # Common high-signal simplifications (see log_rules.json)
+    summary = LOG_RULES.summarize(s)
+    if summary is not None:
+        return summary
 
     # Trim very long JSON-ish blobs to reduce noise
     if len(s) > 220:
@@ -321,61 +711,77 @@ def _summarize_log_message(raw: str) -> str:
     return s
 
 
-def get_openclaw_logs():
-    """Parse recent OpenClaw logs into concise human-readable activity."""
-    logs = []
+def _parse_log_line(line: str):
+    """Turn one raw log line into an activity event, or None if it is filtered out."""
+    line = line.strip()
+    if not line:
+        return None
+
+    m = _LOG_LINE_RE.match(line)
+    if m:
+        ts, level, subsystem, msg = m.groups()
+        level_l = level.lower()
+
+        # Keep errors/warnings always; sample key info/debug lifecycle lines
+        keep = level_l in {"error", "warn"}
+        if not keep:
+            keep = LOG_RULES.keeps(msg)
+        if not keep:
+            return None
+
+        summary = _summarize_log_message(msg)
+        if not summary:
+            return None
+        return {
+            'time': ts,
+            'level': level_l,
+            'subsystem': subsystem,
+            'message': f"[{subsystem}] {summary}"
+        }
+
+    summary = _summarize_log_message(line)
+    if not summary:
+        return None
+    return {'time': '', 'level': '', 'subsystem': '', 'message': summary}
+
+
+_log_tailer = None
+
+
+def _get_log_tailer():
+    """Return the persistent tailer, recreating it if LOG_DIR was changed."""
+    global _log_tailer
     log_pattern = os.path.join(LOG_DIR, "openclaw-*.log")
+    if _log_tailer is None or _log_tailer.pattern != log_pattern:
+        _log_tailer = LogTailer(log_pattern, _parse_log_line, maxlen=LOG_BUFFER_SIZE, prefilter=LOG_PREFILTER)
+    return _log_tailer
 
-    try:
-        log_files = glob.glob(log_pattern)
-        if not log_files:
-            return []
 
-        latest_log = max(log_files, key=os.path.getmtime)
+def _index_fields(line: str):
+    """(time, level, subsystem, message) of any raw log line, for the search index."""
+    line = line.strip()
+    if not line:
+        return None
+    m = _LOG_LINE_RE.match(line)
+    if not m:
+        return ('', '', '', line)  # continuation lines (stack traces) are still searchable
+    ts, level, subsystem, msg = m.groups()
+    return (ts, level.lower(), subsystem, msg)
 
-        with open(latest_log, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
 
-        # Focus on recent lines; include high-signal events first
-        for line in lines[-220:]:
-            line = line.strip()
-            if not line:
-                continue
+# Every log line, searchable via /api/logs/search (indexed in the background)
+log_index = LogIndex(lambda: os.path.join(LOG_DIR, "openclaw-*.log"), _index_fields)
 
-            # Expected format: ISO level [subsystem] message
-            m = re.match(r"^(\S+)\s+(\w+)\s+\[([^\]]+)\]\s+(.*)$", line)
-            if m:
-                ts, level, subsystem, msg = m.groups()
-                level_l = level.lower()
-
-                # Keep errors/warnings always; sample key info/debug lifecycle lines
-                keep = level_l in {"error", "warn"}
-                if not keep:
-                    keep = any(k in msg for k in [
-                        "lane task done", "lane enqueue", "lane dequeue",
-                        "embedded run", "sendMessage ok", "failed", "timeout"
-                    ])
-                if not keep:
-                    continue
-
-                summary = _summarize_log_message(msg)
-                if not summary:
-                    continue
-                logs.append({
-                    'time': ts,
-                    'message': f"[{subsystem}] {summary}"
-                })
-            else:
-                summary = _summarize_log_message(line)
-                if summary:
-                    logs.append({'time': '', 'message': summary})
 
-        return logs[-80:]
+def get_openclaw_logs():
+    """Return buffered high-signal activity, reading only bytes appended since the last call.
 
+    Read errors propagate, so the scheduler keeps serving the last good feed and reports the error.
+    """
+    try:
+        return _get_log_tailer().poll()
     except FileNotFoundError:
         return []
-    except Exception as e:
-        return [{'time': '', 'message': f'Error reading logs: {str(e)}'}]
 
 
 def _short_task_text(text: str, max_len: int = 110) -> str:
@@ -386,312 +792,479 @@ def _short_task_text(text: str, max_len: int = 110) -> str:
     return text
 
 
-def get_subagents_list():
-    """Build task list with agent + concise task summary from session store."""
-    try:
-        store_path = os.path.expanduser('~/.openclaw/agents/main/sessions/sessions.json')
-        if not os.path.exists(store_path):
-            return [], f"session store not found: {store_path}"
+_session_store = None
 
-        with open(store_path, 'r', encoding='utf-8') as f:
-            store = json.load(f)
 
-        now_ms = int(datetime.now().timestamp() * 1000)
-        tasks = []
+def _get_session_store(store_path):
+    """Return the cached session store reader for `store_path` (subagent entries only)."""
+    global _session_store
+    if _session_store is None or _session_store.path != store_path:
+        _session_store = SessionStoreCache(store_path, key_filter=lambda key: 'subagent' in key)
+    return _session_store
 
-        for key, s in store.items():
-            if 'subagent' not in key:
-                continue
 
-            updated_at = int(s.get('updatedAt', 0) or 0)
-            if not updated_at:
-                continue
+def _describe_task(key, s):
+    """Task fields for a session record; the status is filled in by the task model."""
+    model = s.model
+    agent_name = 'lmstudio' if 'qwen' in model.lower() else ('minimax' if 'minimax' in model.lower() else 'agent')
+    return {
+        'key': key,
+        'name': _short_task_text(s.label or 'subagent task', 70),
+        'summary': _short_task_text(f"{agent_name} • {model} • from {s.spawned_by}", 120),
+        'updatedAt': s.updated_at,
+    }
+
+
+def _advance_tasks(value):
+    """Re-publish the tasks collector's value with the status changes that just came due."""
+    _, warning, _ = value
+    task_model.advance()
+    tasks, stats = task_model.view()
+    return tasks, warning, stats
+
+
+# Tasks kept in sync with the session store; age transitions are pushed as they happen
+task_model = TaskModel(_describe_task, TASK_STAGES, statuses=TASK_STATUSES,
+                       on_due=lambda: scheduler.update('tasks', _advance_tasks))
+
 
-            age_ms = max(0, now_ms - updated_at)
-            aborted = bool(s.get('abortedLastRun', False))
-            model = s.get('model', 'unknown')
-            label = s.get('label') or 'subagent task'
-            spawned_by = s.get('spawnedBy', 'main')
-
-            # Heuristic statuses tuned for operator visibility:
-            # - fresh delegated work appears as TODO
-            # - medium-age work appears as pending
-            # - old work considered completed unless aborted
-            if aborted:
-                status = 'failed'
-            elif age_ms < 20 * 60 * 1000:
-                status = 'todo'
-            elif age_ms < 2 * 60 * 60 * 1000:
-                status = 'pending'
-            else:
-                status = 'completed'
-
-            agent_name = 'lmstudio' if 'qwen' in model.lower() else ('minimax' if 'minimax' in model.lower() else 'agent')
-
-            tasks.append({
-                'name': _short_task_text(label, 70),
-                'summary': _short_task_text(f"{agent_name} • {model} • from {spawned_by}", 120),
-                'status': status,
-                'updatedAt': updated_at,
-            })
-
-        tasks.sort(key=lambda x: x.get('updatedAt', 0), reverse=True)
-        return tasks[:120], None
+def get_subagents_list():
+    """Task list, warning and status counts from the session store.
 
+    Only sessions that changed since the last call are re-derived.
+    """
+    store_path = os.path.expanduser('~/.openclaw/agents/main/sessions/sessions.json')
+    try:
+        if os.path.exists(store_path):
+            records, warning = _get_session_store(store_path).load(), None
+        else:
+            records, warning = {}, f"session store not found: {store_path}"
     except json.JSONDecodeError:
-        return [], 'sessions.json parse error'
+        records, warning = {}, 'sessions.json parse error'
     except Exception as e:
-        return [], f"Error: {str(e)}"
+        records, warning = {}, f"Error: {str(e)}"
+    task_model.sync(records)
+    tasks, stats = task_model.view()
+    return tasks, warning, stats
 
 
 def get_cron_jobs():
-    """Parse cron jobs from openclaw cron list."""
-    try:
-        result = subprocess.run(
-            ['openclaw', 'cron', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            return []  # Graceful fallback
-        
-        jobs = []
-        lines = result.stdout.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('Job') or line.startswith('-'):
-                continue
-            if '-----' in line:
-                continue
-            
-            # Simple parsing - use line as job info
-            jobs.append({
-                'name': line[:60] + ('...' if len(line) > 60 else ''),
-                'schedule': 'scheduled'
-            })
+    """Parse cron jobs from openclaw cron list (raises if the CLI fails)."""
+    output = commands.output(['openclaw', 'cron', 'list'], timeout=10)
+    
+    jobs = []
+    lines = output.strip().split('\n')
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('Job') or line.startswith('-'):
+            continue
+        if '-----' in line:
+            continue
         
-        return jobs[:10]  # Limit to 10
+        # Simple parsing - use line as job info
+        jobs.append({
+            'name': line[:60] + ('...' if len(line) > 60 else ''),
+            'schedule': 'scheduled'
+        })
     
-    except Exception:
-        return []  # Graceful fallback
+    return jobs
 
 
 def get_codex_usage():
-    """Collect Codex usage data from codexbar."""
+    """Collect Codex usage data from codexbar (raises if the CLI fails)."""
     try:
-        result = subprocess.run(
-            ['codexbar', 'usage', '--provider', 'codex', '--format', 'json'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            return None
-        
-        data = json.loads(result.stdout)
-        if not data:
-            return None
-        
-        # Get first entry (codex provider)
-        entry = data[0] if isinstance(data, list) else data
-        usage = entry.get('usage', {})
-        
-        primary = usage.get('primary', {})
-        secondary = usage.get('secondary', {})
-        identity = usage.get('identity', {})
-        
-        return {
-            'primary': {
-                'usedPercent': primary.get('usedPercent'),
-                'resetDescription': primary.get('resetDescription')
-            },
-            'secondary': {
-                'usedPercent': secondary.get('usedPercent'),
-                'resetDescription': secondary.get('resetDescription')
-            },
-            'accountEmail': identity.get('accountEmail') or usage.get('accountEmail'),
-            'plan': identity.get('loginMethod') or usage.get('loginMethod')
-        }
+        output = commands.output(['codexbar', 'usage', '--provider', 'codex', '--format', 'json'], timeout=10)
+    except FileNotFoundError:
+        return None  # codexbar is optional; no panel rather than an error
+    
+    data = json.loads(output)
+    if not data:
+        return None
+    
+    # Get first entry (codex provider)
+    entry = data[0] if isinstance(data, list) else data
+    usage = entry.get('usage', {})
     
-    except Exception:
-        return None  # Graceful fallback
+    primary = usage.get('primary', {})
+    secondary = usage.get('secondary', {})
+    identity = usage.get('identity', {})
+    
+    return {
+        'primary': {
+            'usedPercent': primary.get('usedPercent'),
+            'resetDescription': primary.get('resetDescription')
+        },
+        'secondary': {
+            'usedPercent': secondary.get('usedPercent'),
+            'resetDescription': secondary.get('resetDescription')
+        },
+        'accountEmail': identity.get('accountEmail') or usage.get('accountEmail'),
+        'plan': identity.get('loginMethod') or usage.get('loginMethod')
+    }
 
 
 def get_openclaw_usage():
-    """Collect OpenClaw session usage data."""
-    try:
-        result = subprocess.run(
-            ['openclaw', 'sessions', '--active', '180', '--json'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            return None
-        
-        data = json.loads(result.stdout)
-        sessions = data.get('sessions', [])
-        
-        if not sessions:
-            return {'totalActive': 0, 'topSessions': [], 'mainSession': None}
-        
-        # Filter sessions with valid totalTokens
-        valid_sessions = [s for s in sessions if s.get('totalTokens') is not None]
-        
-        # Sort by totalTokens descending and get top 5
-        top_sessions = sorted(valid_sessions, key=lambda x: x.get('totalTokens', 0), reverse=True)[:5]
+    """Collect OpenClaw session usage data (raises if the CLI fails)."""
+    output = commands.output(['openclaw', 'sessions', '--active', '180', '--json'], timeout=10)
+    
+    data = json.loads(output)
+    sessions = data.get('sessions', [])
+    
+    if not sessions:
+        return {'totalActive': 0, 'topSessions': [], 'mainSession': None}
+    
+    # Filter sessions with valid totalTokens
+    valid_sessions = [s for s in sessions if s.get('totalTokens') is not None]
+    
+    # Sort by totalTokens descending and get top 5
+    top_sessions = sorted(valid_sessions, key=lambda x: x.get('totalTokens', 0), reverse=True)[:5]
+    
+    top_5 = []
+    for s in top_sessions:
+        tokens = s.get('totalTokens', 0)
+        context = s.get('contextTokens', 0)
+        ratio = round(tokens / context * 100, 1) if context and tokens else None
         
-        top_5 = []
-        for s in top_sessions:
+        top_5.append({
+            'key': s.get('key', '')[:50] + ('...' if len(s.get('key', '')) > 50 else ''),
+            'model': s.get('model', 'unknown'),
+            'totalTokens': tokens,
+            'contextTokens': context,
+            'tokenRatio': ratio
+        })
+    
+    # Find main session
+    main_session = None
+    for s in sessions:
+        if s.get('key') == 'agent:main:main':
             tokens = s.get('totalTokens', 0)
             context = s.get('contextTokens', 0)
             ratio = round(tokens / context * 100, 1) if context and tokens else None
-            
-            top_5.append({
-                'key': s.get('key', '')[:50] + ('...' if len(s.get('key', '')) > 50 else ''),
-                'model': s.get('model', 'unknown'),
+            main_session = {
                 'totalTokens': tokens,
                 'contextTokens': context,
-                'tokenRatio': ratio
-            })
-        
-        # Find main session
-        main_session = None
-        for s in sessions:
-            if s.get('key') == 'agent:main:main':
-                tokens = s.get('totalTokens', 0)
-                context = s.get('contextTokens', 0)
-                ratio = round(tokens / context * 100, 1) if context and tokens else None
-                main_session = {
-                    'totalTokens': tokens,
-                    'contextTokens': context,
-                    'tokenRatio': ratio,
-                    'model': s.get('model', 'unknown')
-                }
-                break
-        
-        return {
-            'totalActive': len(sessions),
-            'topSessions': top_5,
-            'mainSession': main_session
-        }
+                'tokenRatio': ratio,
+                'model': s.get('model', 'unknown')
+            }
+            break
     
-    except Exception:
-        return None  # Graceful fallback
+    return {
+        'totalActive': len(sessions),
+        'topSessions': top_5,
+        'mainSession': main_session
+    }
 
 
-def calculate_stats(tasks):
-    """Calculate status counters."""
-    stats = {
-        'pending': 0,
-        'completed': 0,
-        'failed': 0,
-        'todo': 0
-    }
-    
-    for task in tasks:
-        status = task.get('status', 'pending').lower()
-        if status in stats:
-            stats[status] += 1
-    
-    return stats
+scheduler = CollectorScheduler(observe=_observe_collector)
+for _name, _func, _default in [
+    ('logs', get_openclaw_logs, []),
+    ('tasks', get_subagents_list, ([], None, dict.fromkeys(TASK_STATUSES, 0))),
+    ('cron_jobs', get_cron_jobs, []),
+    ('codex_usage', get_codex_usage, None),
+    ('openclaw_usage', get_openclaw_usage, None),
+]:
+    scheduler.register(_name, memory.track(_name, _func), COLLECTOR_INTERVALS[_name],
+                       deadline=COLLECTOR_DEADLINES[_name], default=_default)
 
+# Paged, filterable views of the panel lists, indexed once per snapshot
+panels = PagedViews({
+    'logs': lambda snap: PagedList(snap['logs'][::-1], key=lambda e: e.get('id', 0), indexed=('level', 'subsystem')),
+    'tasks': lambda snap: PagedList(
+        snap['tasks'][0], key=lambda t: [t.get('updatedAt', 0), t['key']], indexed=('status',)
+    ),
+    'cron_jobs': lambda snap: PagedList(snap['cron_jobs']),
+})
 
-@app.route('/')
-def index():
-    """Main dashboard page."""
-    logs = get_openclaw_logs()
-    tasks, warning = get_subagents_list()
-    cron_jobs = get_cron_jobs()
-    stats = calculate_stats(tasks)
-    codex_usage = get_codex_usage()
-    openclaw_usage = get_openclaw_usage()
-    
+
+def panel_rows(snap):
+    """First page of each panel's rows, plus each list's total and the cursor for the rest."""
+    rows, pages = {}, {}
+    for name, limit in PANEL_ROWS.items():
+        rows[name], next_cursor, total = panels.view(name, snap).page(limit)
+        pages[name] = {'total': total, 'next': next_cursor}
+    rows['logs'] = rows['logs'][::-1]  # the activity feed reads oldest to newest
+    return rows, pages
+
+
+def snapshot_metrics(snap):
+    """Numeric metrics recorded to history; collectors without fresh data are skipped."""
+    skipped = snap.partial | snap.stale
+    metrics = {}
+    if 'tasks' not in skipped:
+        _, _, stats = snap['tasks']
+        metrics.update({f'tasks.{status}': count for status, count in stats.items()})
+    usage = snap['openclaw_usage']
+    if usage and 'openclaw_usage' not in skipped:
+        metrics['openclaw.totalActive'] = usage['totalActive']
+        for s in usage['topSessions']:
+            metrics[f"openclaw.tokens.{s['key']}"] = s['totalTokens']
+        if usage['mainSession']:
+            metrics['openclaw.mainSession.totalTokens'] = usage['mainSession']['totalTokens']
+    codex = snap['codex_usage']
+    if codex and 'codex_usage' not in skipped:
+        metrics['codex.primary.usedPercent'] = codex['primary']['usedPercent']
+        metrics['codex.secondary.usedPercent'] = codex['secondary']['usedPercent']
+    return metrics
+
+
+# Metric samples persisted to SQLite for /api/history
+history = MetricsHistory(sample=lambda: snapshot_metrics(scheduler.snapshot()))
+
+
+def _not_modified(snap):
+    """A 304 response if the client's cached copy matches `snap`, else None."""
+    if is_not_modified(snap, request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since')):
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+        return Response(status=304, headers=validator_headers(snap, encoding))
+    return None
+
+
+# Page and JSON bodies, rendered (and gzipped) once per snapshot for all clients
+rendered = RenderCache(observe=lambda route, seconds: render_seconds.labels(route).observe(seconds))
+
+
+def _cached_response(route, snap, render, mimetype):
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    body, headers = rendered.respond(route, snap, render, encoding)
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def status_notes(snap):
+    """Warning lines for collectors that are still collecting, stale or failing."""
+    notes = []
+    collecting = sorted(snap.partial - set(snap.errors))
+    if collecting:
+        notes.append(f"Still collecting: {', '.join(collecting)}.")
+    if snap.stale:
+        stale = [
+            f"{name} (as of {datetime.fromtimestamp(snap.updated_at[name]).strftime('%H:%M:%S')})"
+            for name in sorted(snap.stale)
+        ]
+        notes.append(f"Showing stale data for: {', '.join(stale)}.")
+    for name, error in sorted(snap.errors.items()):
+        notes.append(f"{name} refresh failed: {error}")
+    return notes
+
+
+def render_dashboard(snap):
+    """Render the full dashboard page for a snapshot."""
+    _, warning, stats = snap['tasks']
+    rows, pages = panel_rows(snap)
     return render_template_string(
         HTML_TEMPLATE,
-        logs=logs,
-        tasks=tasks,
-        cron_jobs=cron_jobs,
+        logs=rows['logs'],
+        tasks=rows['tasks'],
+        cron_jobs=rows['cron_jobs'],
+        pages=pages,
         stats=stats,
         warning=warning,
+        notes=status_notes(snap),
         refresh_interval=REFRESH_INTERVAL,
-        codex_usage=codex_usage,
-        openclaw_usage=openclaw_usage
+        codex_usage=snap['codex_usage'],
+        openclaw_usage=snap['openclaw_usage']
     )
 
 
+@app.before_request
+def _start_timer():
+    g.started = time.perf_counter()
+
+
+@app.after_request
+def _observe_request(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if route != '/api/stream' and 'started' in g:
+        request_seconds.labels(route, response.status_code).observe(time.perf_counter() - g.started)
+    return response
+
+
+@app.route('/')
+def index():
+    """Main dashboard page."""
+    snap = scheduler.snapshot()
+    cached = _not_modified(snap)
+    if cached is not None:
+        return cached
+    return _cached_response('/', snap, render_dashboard, 'text/html')
+
+
+def build_api_payload(snap):
+    """JSON-able dashboard sections for /api/data and /api/stream."""
+    _, warning, stats = snap['tasks']
+    rows, pages = panel_rows(snap)
+    return {
+        'logs': rows['logs'],
+        'tasks': rows['tasks'],
+        'cron_jobs': rows['cron_jobs'],
+        'pages': pages,
+        'stats': stats,
+        'codex_usage': snap['codex_usage'],
+        'openclaw_usage': snap['openclaw_usage'],
+        'warning': warning,
+        'partial': sorted(snap.partial),
+        'stale': sorted(snap.stale),
+        'lastGood': {name: int(snap.updated_at[name] * 1000) for name in sorted(snap.stale)},
+        'errors': dict(sorted(snap.errors.items()))
+    }
+
+
+snapshot_stream = SnapshotStream(scheduler, build_api_payload)
+
+
 @app.route('/api/data')
 def api_data():
     """JSON API for auto-refresh."""
-    logs = get_openclaw_logs()
-    tasks, _ = get_subagents_list()
-    cron_jobs = get_cron_jobs()
-    stats = calculate_stats(tasks)
-    codex_usage = get_codex_usage()
-    openclaw_usage = get_openclaw_usage()
-    
-    return jsonify({
-        'logs': logs,
-        'tasks': tasks,
-        'cron_jobs': cron_jobs,
-        'stats': stats,
-        'codex_usage': codex_usage,
-        'openclaw_usage': openclaw_usage
-    })
+    snap = scheduler.snapshot()
+    cached = _not_modified(snap)
+    if cached is not None:
+        return cached
+    return _cached_response(
+        '/api/data', snap, lambda s: json.dumps(snapshot_stream.payload_for(s)), 'application/json'
+    )
+
+
+@app.route('/api/history')
+def api_history():
+    """Metric history: ?metric=&from=&to=&step= (Unix seconds), or the metric list without metric."""
+    status, data = history.api(request.args.to_dict())
+    return jsonify(data), status
+
+
+@app.route('/api/logs')
+def api_logs():
+    """Buffered activity, newest first: ?level=&subsystem=&fields=&limit=&cursor=."""
+    status, data = panels.api('logs', scheduler.snapshot(), request.args.to_dict())
+    return jsonify(data), status
+
+
+@app.route('/api/tasks')
+def api_tasks():
+    """Tasks, most recently updated first: ?status=&fields=&limit=&cursor=."""
+    status, data = panels.api('tasks', scheduler.snapshot(), request.args.to_dict())
+    return jsonify(data), status
+
+
+@app.route('/api/cron')
+def api_cron():
+    """Cron jobs: ?fields=&limit=&cursor=."""
+    status, data = panels.api('cron_jobs', scheduler.snapshot(), request.args.to_dict())
+    return jsonify(data), status
+
+
+@app.route('/api/logs/search')
+def api_logs_search():
+    """Search all indexed log lines: ?q=&level=&subsystem=&from=&to=&limit=&cursor=."""
+    status, data = log_index.api(request.args.to_dict())
+    return jsonify(data), status
+
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events: a full snapshot, then only the sections that change."""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    return Response(
+        snapshot_stream.events(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def _probe_openclaw_cli():
+    result = commands.run(['openclaw', '--version'], timeout=5)
+    return result.returncode == 0
+
+
+def _probe_log_files():
+    return len(glob.glob(os.path.join(LOG_DIR, "openclaw-*.log"))) > 0
+
+
+def _probe_sessions():
+    result = commands.run(['openclaw', 'sessions', '--active', '180', '--json'], timeout=10)
+    return result.returncode == 0
+
+
+def _probe_cron():
+    result = commands.run(['openclaw', 'cron', 'list'], timeout=10)
+    return result.returncode == 0
+
+
+# Data-source probes run in the background; health endpoints only read their results
+probes = HealthProbes()
+for _name, _func in [
+    ('openclaw_cli', _probe_openclaw_cli),
+    ('log_files', _probe_log_files),
+    ('sessions', _probe_sessions),
+    ('cron', _probe_cron),
+]:
+    probes.register(_name, _func)
+READY_SOURCES = ('openclaw_cli', 'sessions')
+
+# Sampled CPU profiles of the running process for /debug/profile (needs OPENCLAW_DASHBOARD_DEBUG_TOKEN)
+profiler = SamplingProfiler()
+
+
+def prometheus_samples():
+    """Counters and gauges read from the dashboard's components when /metrics is scraped."""
+    cli = commands.stats()['commands']
+    yield ('cli_runs_total', 'counter', 'CLI subprocesses spawned, by command.',
+           [({'command': cmd}, c['runs']) for cmd, c in cli.items()])
+    yield ('cli_timeouts_total', 'counter', 'CLI runs that timed out or found no free process slot.',
+           [({'command': cmd}, c['timeouts']) for cmd, c in cli.items()])
+    yield ('cli_exits_total', 'counter', 'Completed CLI runs by command and exit code.',
+           [({'command': cmd, 'code': code}, n) for cmd, c in cli.items() for code, n in c.get('exitCodes', {}).items()])
+    cache = [
+        ('cli', sum(c['cached'] + c['coalesced'] for c in cli.values()), sum(c['runs'] for c in cli.values())),
+        ('render', rendered.requests - rendered.renders, rendered.renders),
+    ]
+    if _session_store is not None:
+        cache.append(('sessions', _session_store.loads - _session_store.parses, _session_store.parses))
+    yield ('cache_lookups_total', 'counter', 'Cache lookups by result; hit / (hit + miss) is the hit ratio.',
+           [({'cache': name, 'result': result}, n)
+            for name, hit, miss in cache for result, n in (('hit', hit), ('miss', miss))])
+    yield ('log_bytes_read_total', 'counter', 'Log bytes read by the activity tailer.',
+           [({}, _log_tailer.bytes_read if _log_tailer else 0)])
+    yield ('log_lines_indexed_total', 'counter', 'Log lines added to the search index.',
+           [({}, log_index.lines_indexed)])
+    yield ('task_transitions_total', 'counter', 'Task status changes fired by the age timer wheel.',
+           [({}, task_model.transitions)])
+    yield ('collector_peak_alloc_bytes', 'gauge',
+           'Peak bytes allocated by the last measured run of each collector (only while tracemalloc traces).',
+           [({'collector': name}, entry['lastPeakBytes'])
+            for name, entry in sorted(list(memory.collectors.items())) if entry['lastPeakBytes'] is not None])
+
+    snap = scheduler.snapshot()
+    yield ('collector_age_seconds', 'gauge', 'Seconds since each collector last published.',
+           [({'collector': name}, round(snap.age(name), 3)) for name in sorted(snap.updated_at)])
+    _, _, stats = snap['tasks']
+    yield ('tasks', 'gauge', 'Tasks by status.', [({'status': status}, n) for status, n in stats.items()])
+    usage = snap['openclaw_usage']
+    if usage:
+        yield ('active_sessions', 'gauge', 'Active OpenClaw sessions.', [({}, usage['totalActive'])])
+        yield ('session_tokens', 'gauge', 'Total tokens of the top OpenClaw sessions by usage.',
+               [({'session': s['key']}, s['totalTokens']) for s in usage['topSessions']])
+        if usage['mainSession']:
+            yield ('main_session_tokens', 'gauge', 'Total tokens of the main OpenClaw session.',
+                   [({}, usage['mainSession']['totalTokens'])])
+    codex = snap['codex_usage']
+    if codex:
+        yield ('codex_used_percent', 'gauge', 'Codex rate-limit window usage.',
+               [({'window': window}, codex[window]['usedPercent'])
+                for window in ('primary', 'secondary') if codex[window]['usedPercent'] is not None])
+
+
+prom.add_collector(prometheus_samples)
 
 
 def check_data_sources():
-    """Check availability of each data source."""
-    sources = {
-        'openclaw_cli': False,
-        'log_files': False,
-        'sessions': False,
-        'cron': False
-    }
-    
-    # Check OpenClaw CLI
-    try:
-        result = subprocess.run(['openclaw', '--version'], capture_output=True, timeout=5)
-        sources['openclaw_cli'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    # Check log files
-    try:
-        log_files = glob.glob(os.path.join(LOG_DIR, "openclaw-*.log"))
-        sources['log_files'] = len(log_files) > 0
-    except Exception:
-        pass
-    
-    # Check sessions
-    try:
-        result = subprocess.run(
-            ['openclaw', 'sessions', '--active', '180', '--json'],
-            capture_output=True, timeout=10
-        )
-        sources['sessions'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    # Check cron
-    try:
-        result = subprocess.run(['openclaw', 'cron', 'list'], capture_output=True, timeout=10)
-        sources['cron'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    return sources
+    """Last-known availability of each data source (never probes on the caller's thread)."""
+    return {name: bool(result and result.ok) for name, result in probes.results().items()}
 
 
 def get_health_data():
     """Get health status for /healthz endpoint."""
     sources = check_data_sources()
-    all_ok = sources.get('openclaw_cli', False) and sources.get('sessions', False)
+    all_ok = all(sources[name] for name in READY_SOURCES)
     
     return {
         'status': 'ok' if all_ok else 'degraded',
@@ -701,15 +1274,75 @@ def get_health_data():
     }
 
 
+def get_liveness_data():
+    """In-process liveness for /livez; touches no data source."""
+    return {
+        'status': 'ok',
+        'version': '1.0.0',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def get_readiness_data():
+    """Readiness for /readyz: last probe result per source with its age and latency."""
+    results = probes.results()
+    ready = probes.ready(READY_SOURCES)
+    return {
+        'status': 'ready' if ready else 'not ready',
+        'timestamp': datetime.now().isoformat(),
+        'required': list(READY_SOURCES),
+        'sources': {name: result.as_dict() if result else None for name, result in results.items()},
+        'commands': commands.stats()
+    }
+
+
 @app.route('/healthz')
 def healthz():
     """Health check endpoint."""
     return jsonify(get_health_data())
 
 
+@app.route('/livez')
+def livez():
+    """Liveness: the process is up and serving."""
+    return jsonify(get_liveness_data())
+
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: 503 until the required data sources have probed OK."""
+    data = get_readiness_data()
+    return jsonify(data), 200 if data['status'] == 'ready' else 503
+
+
+@app.route('/debug/profile')
+def debug_profile():
+    """Sampled CPU profile of every thread over ?seconds=N (requires the debug token)."""
+    status, content_type, body = (
+        authorize_debug(request.headers.get('Authorization')) or profiler.api(request.args.to_dict())
+    )
+    return Response(body, status=status, content_type=content_type)
+
+
+@app.route('/debug/memory')
+def debug_memory():
+    """tracemalloc control, top allocation sites and snapshot diffs (requires the debug token)."""
+    status, content_type, body = (
+        authorize_debug(request.headers.get('Authorization')) or memory.api(request.args.to_dict())
+    )
+    return Response(body, status=status, content_type=content_type)
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics."""
+    return Response(prom.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 def print_startup_diagnostics():
     """Print startup diagnostics to console."""
     print("\n📊 Startup Diagnostics:")
+    probes.run_all()
     sources = check_data_sources()
     
     status_map = {True: '✅', False: '❌'}
@@ -741,6 +1374,11 @@ if __name__ == '__main__':
     
     print("🚀 Starting OpenClaw Dashboard...")
     print_startup_diagnostics()
+    scheduler.start()
+    task_model.start()
+    probes.start()
+    history.start()
+    log_index.start()
     print(f"📍 Open http://localhost:{port} in your browser")
     if port != 5000:
         print(f"⚠️  Port 5000 was in use, using port {port} instead")
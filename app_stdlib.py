@@ -12,13 +12,64 @@ import json
 import re
 import http.server
 import socketserver
+import threading
+import time
 from datetime import datetime
+from html import escape
 from urllib.parse import urlparse, parse_qs
 
+from cli_runner import CommandRunner
+from collector_scheduler import CollectorScheduler
+from debug_tools import MemoryTracer, SamplingProfiler, authorize as authorize_debug
+from health_probes import HealthProbes
+from http_cache import RenderCache, is_not_modified, negotiate_encoding, validator_headers
+from log_index import LogIndex
+from log_rules import load_rule_engine
+from metrics_history import MetricsHistory
+from log_tail import LinePrefilter, LogTailer
+from paged_lists import PagedList, PagedViews
+from prom_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from session_model import TaskModel
+from session_store import SessionRecord
+from snapshot_stream import SnapshotStream
+
 # Configuration
 PORT = 5000
 LOG_DIR = "/tmp/openclaw"
 REFRESH_INTERVAL = 10  # seconds
+HTTP_WORKERS = int(os.environ.get('OPENCLAW_DASHBOARD_WORKERS', 64))  # requests handled at once
+MAX_CONNECTIONS = int(os.environ.get('OPENCLAW_DASHBOARD_MAX_CONNECTIONS', 256))  # open connections (a thread each)
+MAX_STREAMS = int(os.environ.get('OPENCLAW_DASHBOARD_MAX_STREAMS', 32))  # concurrent /api/stream clients
+REQUEST_TIMEOUT = 15  # seconds; slow requests and idle keep-alive connections are dropped after this
+LOG_BUFFER_SIZE = 500  # parsed activity events kept in memory by the log tailer
+
+# Rows per panel in / and /api/data; the rest are paged in from /api/logs, /api/tasks and /api/cron
+PANEL_ROWS = {
+    'logs': 80,
+    'tasks': 80,
+    'cron_jobs': 10,
+}
+
+# Task status by age since the session last updated: recently active work is pending,
+# anything older completed unless it was aborted
+TASK_STAGES = (
+    (10 * 60 * 1000, 'pending'),
+)
+TASK_STATUSES = ('pending', 'completed', 'failed', 'todo')
+
+# Background refresh interval per collector (seconds)
+COLLECTOR_INTERVALS = {
+    'logs': 5,
+    'tasks': 10,
+    'cron_jobs': 60,
+}
+
+# How long a request waits for a collector's first result before rendering without it
+COLLECTOR_DEADLINES = {
+    'logs': 2,
+    'tasks': 5,
+    'cron_jobs': 5,
+}
 
 HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -72,33 +123,33 @@ HTML_TEMPLATE = """<!DOCTYPE html>
         .auto-refresh {{ font-size: 12px; color: #6b7280; }}
     </style>
 </head>
-<body>
+<body data-refresh="{refresh_interval}">
     <div class="container">
         <header>
             <h1>🖥️ OpenClaw Dashboard</h1>
             <div>
                 <button class="refresh-btn" onclick="location.reload()">🔄 Refresh</button>
-                <span class="auto-refresh">Auto-refresh: {refresh_interval}s</span>
+                <span class="auto-refresh" id="refresh-mode">Auto-refresh: {refresh_interval}s</span>
             </div>
         </header>
         
-        {warning_html}
+        <div id="warnings">{warning_html}</div>
         
         <div class="counters">
             <div class="counter pending">
-                <div class="counter-value">{stats_pending}</div>
+                <div class="counter-value" id="stat-pending">{stats_pending}</div>
                 <div class="counter-label">Pending</div>
             </div>
             <div class="counter completed">
-                <div class="counter-value">{stats_completed}</div>
+                <div class="counter-value" id="stat-completed">{stats_completed}</div>
                 <div class="counter-label">Completed</div>
             </div>
             <div class="counter failed">
-                <div class="counter-value">{stats_failed}</div>
+                <div class="counter-value" id="stat-failed">{stats_failed}</div>
                 <div class="counter-label">Failed</div>
             </div>
             <div class="counter todo">
-                <div class="counter-value">{stats_todo}</div>
+                <div class="counter-value" id="stat-todo">{stats_todo}</div>
                 <div class="counter-label">TODO</div>
             </div>
         </div>
@@ -112,62 +163,286 @@ HTML_TEMPLATE = """<!DOCTYPE html>
         </div>
         
         <div class="panel">
-            <div class="panel-header">📋 Tasks ({tasks_count} items)</div>
-            <div class="panel-content">
+            <div class="panel-header">📋 Tasks (<span id="tasks-count">{tasks_count} items</span>)</div>
+            <div class="panel-content" id="tasks">
                 {tasks_html}
             </div>
         </div>
         
         <div class="panel">
-            <div class="panel-header">📝 Recent Activity ({logs_count} lines)</div>
-            <div class="panel-content">
+            <div class="panel-header">📝 Recent Activity (<span id="logs-count">{logs_count} lines</span>)</div>
+            <div class="panel-content" id="logs">
                 {logs_html}
             </div>
         </div>
         
         <div class="panel">
-            <div class="panel-header">⏰ Cron Jobs ({cron_count} jobs)</div>
-            <div class="panel-content">
+            <div class="panel-header">⏰ Cron Jobs (<span id="cron-count">{cron_count} jobs</span>)</div>
+            <div class="panel-content" id="cron">
                 {cron_html}
             </div>
         </div>
     </div>
     
-    <script>
-        function filterTasks(filter) {{
-            document.querySelectorAll('.filter-chip').forEach(chip => {{
-                chip.classList.toggle('active', chip.textContent.toLowerCase().includes(filter));
-            }});
-            document.querySelectorAll('.task-item').forEach(item => {{
-                item.style.display = (filter === 'all' || item.dataset.status === filter) ? 'flex' : 'none';
-            }});
-        }}
-        
-        setInterval(() => location.reload(), {refresh_interval} * 1000);
-    </script>
+    {client_script}
 </body>
 </html>
 """
 
+# Page script; kept out of HTML_TEMPLATE so its braces need no escaping for str.format()
+CLIENT_SCRIPT = """<script>
+        const refreshInterval = Number(document.body.dataset.refresh) || 10;
+        let currentFilter = 'all';
+        let state = null;
+        let lastEventId = null;
+        let stream = null;
+        let streamConnected = false;
+        let reconnectDelay = 1000;
+
+        function filterTasks(filter) {
+            currentFilter = filter;
+            document.querySelectorAll('.filter-chip').forEach(chip => {
+                chip.classList.toggle('active', chip.textContent.toLowerCase().includes(filter));
+            });
+            document.querySelectorAll('#tasks .task-item').forEach(item => {
+                item.style.display = (filter === 'all' || item.dataset.status === filter) ? 'flex' : 'none';
+            });
+        }
+
+        function esc(value) {
+            return String(value == null ? '' : value)
+                .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+                .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+        }
+
+        function emptyState(text) {
+            return `<div class="empty-state">${text}</div>`;
+        }
+
+        function statusNotes(data) {
+            const errors = data.errors || {}, lastGood = data.lastGood || {};
+            const notes = [];
+            const collecting = (data.partial || []).filter(name => !(name in errors));
+            if (collecting.length) notes.push(`Still collecting: ${collecting.join(', ')}.`);
+            const stale = (data.stale || []).map(name =>
+                `${name} (as of ${new Date(lastGood[name]).toLocaleTimeString([], {hour12: false})})`);
+            if (stale.length) notes.push(`Showing stale data for: ${stale.join(', ')}.`);
+            Object.keys(errors).sort().forEach(name => notes.push(`${name} refresh failed: ${errors[name]}`));
+            return notes;
+        }
+
+        // Rows past each panel's first page, fetched from the list endpoints as the panel is scrolled
+        const paging = {
+            tasks: {url: '/api/tasks', keyOf: t => t.key, older: [], shown: [], cursor: undefined, loading: false},
+            logs: {url: '/api/logs', keyOf: l => l.id, older: [], shown: [], cursor: undefined, loading: false},
+            cron_jobs: {url: '/api/cron', keyOf: j => j.name, older: [], shown: [], cursor: undefined, loading: false},
+        };
+
+        // Live first page plus loaded older rows; rows pushed off the first page join the older ones
+        function panelRows(name) {
+            const p = paging[name], live = state[name] || [];
+            const liveKeys = new Set(live.map(p.keyOf));
+            if (p.older.length) {
+                const dropped = p.shown.filter(item => !liveKeys.has(p.keyOf(item)));
+                if (name === 'logs') dropped.reverse();
+                const droppedKeys = new Set(dropped.map(p.keyOf));
+                p.older = dropped.concat(p.older.filter(item => !droppedKeys.has(p.keyOf(item))));
+            }
+            p.shown = live;
+            const older = p.older.filter(item => !liveKeys.has(p.keyOf(item)));
+            return name === 'logs' ? older.slice().reverse().concat(live) : live.concat(older);
+        }
+
+        function loadMore(name, el) {
+            const p = paging[name];
+            const cursor = p.cursor === undefined ? state && state.pages && state.pages[name].next : p.cursor;
+            if (p.loading || !cursor) return;
+            p.loading = true;
+            fetch(`${p.url}?limit=50&cursor=${encodeURIComponent(cursor)}`)
+                .then(res => res.json())
+                .then(page => {
+                    if (!page.results) return;
+                    p.older = p.older.concat(page.results);
+                    p.cursor = page.nextCursor;
+                    const height = el.scrollHeight;
+                    renderers[name]();
+                    // Older activity goes above what the user is reading; keep it in place
+                    if (name === 'logs') el.scrollTop += el.scrollHeight - height;
+                })
+                .catch(err => console.error('Load more failed:', err))
+                .finally(() => { p.loading = false; });
+        }
+
+        function renderWarnings(data) {
+            let html = data.warning ? `<div class="warning">${esc(data.warning)}</div>` : '';
+            const notes = statusNotes(data);
+            if (notes.length) html += `<div class="warning">${esc(notes.join(' '))}</div>`;
+            document.getElementById('warnings').innerHTML = html;
+        }
+
+        const renderers = {
+            stats(stats) {
+                ['pending', 'completed', 'failed', 'todo'].forEach(k => {
+                    document.getElementById('stat-' + k).textContent = stats[k];
+                });
+            },
+            tasks() {
+                const tasks = panelRows('tasks');
+                document.getElementById('tasks').innerHTML = tasks.length ? tasks.map(t => `<div class="task-item" data-status="${esc(t.status)}" data-key="${esc(t.key)}">
+            <span class="task-name">${esc(t.name)}</span>
+            <span class="task-status ${esc(t.status)}">${esc(t.status)}</span>
+        </div>`).join('') : emptyState('No tasks found');
+                filterTasks(currentFilter);
+            },
+            logs() {
+                const logs = panelRows('logs');
+                document.getElementById('logs').innerHTML = logs.length ? logs.map(l => `<div class="log-line">
+            <span class="log-time">${esc(l.time)}</span>
+            <span>${esc(l.message)}</span>
+        </div>`).join('') : emptyState('No log entries found');
+            },
+            cron_jobs() {
+                const jobs = panelRows('cron_jobs');
+                document.getElementById('cron').innerHTML = jobs.length ? jobs.map(j => `<div class="task-item">
+            <span class="task-name">${esc(j.name)}</span>
+            <span class="task-status todo">${esc(j.schedule)}</span>
+        </div>`).join('') : emptyState('No cron jobs configured');
+            },
+            pages(pages) {
+                document.getElementById('tasks-count').textContent = `${pages.tasks.total} items`;
+                document.getElementById('logs-count').textContent = `${pages.logs.total} lines`;
+                document.getElementById('cron-count').textContent = `${pages.cron_jobs.total} jobs`;
+            },
+            warning: renderWarnings,
+            partial: renderWarnings,
+            stale: renderWarnings,
+            lastGood: renderWarnings,
+            errors: renderWarnings,
+        };
+
+        function render(data, sections) {
+            const done = new Set();
+            sections.forEach(name => {
+                const fn = renderers[name];
+                if (!fn || done.has(fn)) return;
+                done.add(fn);
+                fn(fn === renderWarnings ? data : data[name]);
+            });
+        }
+
+        function applySection(name, op) {
+            if ('set' in op) {
+                state[name] = op.set;
+            } else if ('append' in op) {
+                state[name] = (state[name] || []).concat(op.append).slice(-op.limit);
+            } else if ('upsert' in op) {
+                const byKey = new Map((state[name] || []).map(item => [item.key, item]));
+                op.remove.forEach(key => byKey.delete(key));
+                op.upsert.forEach(item => byKey.set(item.key, item));
+                state[name] = Array.from(byKey.values())
+                    .sort((a, b) => (b.updatedAt || 0) - (a.updatedAt || 0))
+                    .slice(0, op.limit);
+            }
+        }
+
+        function connectStream() {
+            const url = '/api/stream' + (lastEventId ? '?lastEventId=' + encodeURIComponent(lastEventId) : '');
+            stream = new EventSource(url);
+            stream.addEventListener('snapshot', e => {
+                state = JSON.parse(e.data);
+                lastEventId = e.lastEventId;
+                render(state, Object.keys(state));
+            });
+            stream.addEventListener('delta', e => {
+                lastEventId = e.lastEventId;
+                if (!state) return;
+                const sections = JSON.parse(e.data);
+                Object.entries(sections).forEach(([name, op]) => applySection(name, op));
+                render(state, Object.keys(sections));
+            });
+            stream.onopen = () => {
+                streamConnected = true;
+                reconnectDelay = 1000;
+                document.getElementById('refresh-mode').textContent = 'Live';
+            };
+            stream.onerror = () => {
+                streamConnected = false;
+                document.getElementById('refresh-mode').textContent = `Auto-refresh: ${refreshInterval}s`;
+                // EventSource retries on its own (sending Last-Event-ID); rebuild it if the browser gave up
+                if (stream.readyState === EventSource.CLOSED) {
+                    setTimeout(connectStream, reconnectDelay);
+                    reconnectDelay = Math.min(reconnectDelay * 2, 30000);
+                }
+            };
+        }
+
+        [['tasks', 'tasks'], ['logs', 'logs'], ['cron_jobs', 'cron']].forEach(([name, id]) => {
+            const el = document.getElementById(id);
+            el.addEventListener('scroll', () => {
+                const atEnd = name === 'logs' ? el.scrollTop < 40 : el.scrollHeight - el.scrollTop - el.clientHeight < 40;
+                if (atEnd) loadMore(name, el);
+            });
+        });
+
+        // Live updates over SSE; fall back to reloading while the stream is down
+        if (window.EventSource) {
+            connectStream();
+        }
+        setInterval(() => {
+            if (!streamConnected) location.reload();
+        }, refreshInterval * 1000);
+    </script>"""
+
+
+# Expected format: ISO level [subsystem] message
+_LOG_LINE_RE = re.compile(r"^(\S+)\s+(\w+)\s+\[([^\]]+)\]\s+(.*)$")
+
+# Summary rewrite rules and keep keywords, compiled once (log_rules.json + user file)
+LOG_RULES = load_rule_engine()
+
+# Lines _parse_log_line could keep: a keep keyword or error/warn anywhere, or a line
+# not in the layout above once stripped (so `ts level [sub] ` with no message is
+# free-form); everything else is skipped without being decoded
+LOG_PREFILTER = LinePrefilter(
+    LOG_RULES.keep_keywords + ('error', 'warn'), rb'\S+[ \t]+\w+[ \t]+\[[^\]\n]+\][ \t]+\S'
+)
+
+# Prometheus metrics for /metrics. Timings are recorded as they happen; counters the
+# components already keep, and the dashboard's gauges, are read when /metrics is scraped
+prom = MetricsRegistry()
+collector_seconds = prom.histogram('collector_duration_seconds', 'Duration of each collector run.', ('collector',))
+collector_errors = prom.counter('collector_errors', 'Collector runs that raised.', ('collector',))
+render_seconds = prom.histogram(
+    'render_duration_seconds', 'Time to render a response body on a render cache miss.', ('route',)
+)
+request_seconds = prom.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route and status (/api/stream excluded).',
+    ('route', 'status')
+)
+
+
+# tracemalloc control for /debug/memory; collectors are wrapped to record their peak allocation
+memory = MemoryTracer()
+
+
+def _observe_collector(name, seconds, error):
+    collector_seconds.labels(name).observe(seconds)
+    if error is not None:
+        collector_errors.labels(name).inc()
+
+
+# CLI calls shared by collectors, probes and requests: one subprocess per argv at a time
+commands = CommandRunner()
+
 
 def _summarize_log_message(raw: str) -> str:
     """Convert noisy OpenClaw log lines into concise, human-readable summaries."""
     s = raw.strip()
 
-    # Common high-signal simplifications
-    replacements = [
-        (r"embedded run tool start:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool started: \1"),
-        (r"embedded run tool end:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool finished: \1"),
-        (r"embedded run done:.*aborted=(true|false).*$", r"Run finished (aborted=\1)"),
-        (r"lane enqueue: lane=([^\s]+).*$", r"Queued: \1"),
-        (r"lane dequeue: lane=([^\s]+).*$", r"Started: \1"),
-        (r"lane task done: lane=([^\s]+).*$", r"Completed: \1"),
-        (r"telegram sendMessage ok chat=([^\s]+).*$", r"Telegram sent to chat \1"),
-    ]
-    for pattern, repl in replacements:
-        m = re.search(pattern, s)
-        if m:
-            return re.sub(pattern, repl, s)
+    # Common high-signal simplifications (see log_rules.json)
+    summary = LOG_RULES.summarize(s)
+    if summary is not None:
+        return summary
 
     # Trim very long JSON-ish blobs to reduce noise
     if len(s) > 220:
@@ -175,160 +450,151 @@ def _summarize_log_message(raw: str) -> str:
     return s
 
 
-def get_openclaw_logs():
-    """Parse recent OpenClaw logs into concise human-readable activity."""
-    logs = []
+def _parse_log_line(line: str):
+    """Turn one raw log line into an activity event, or None if it is filtered out."""
+    line = line.strip()
+    if not line:
+        return None
+
+    m = _LOG_LINE_RE.match(line)
+    if m:
+        ts, level, subsystem, msg = m.groups()
+        level_l = level.lower()
+
+        # Keep errors/warnings always; sample key info/debug lifecycle lines
+        keep = level_l in {"error", "warn"}
+        if not keep:
+            keep = LOG_RULES.keeps(msg)
+        if not keep:
+            return None
+
+        return {
+            'time': ts,
+            'level': level_l,
+            'subsystem': subsystem,
+            'message': f"[{subsystem}] {_summarize_log_message(msg)}"
+        }
+
+    # Fallback line format
+    return {'time': '', 'level': '', 'subsystem': '', 'message': _summarize_log_message(line)}
+
+
+_log_tailer = None
+
+
+def _get_log_tailer():
+    """Return the persistent tailer, recreating it if LOG_DIR was changed."""
+    global _log_tailer
     log_pattern = os.path.join(LOG_DIR, "openclaw-*.log")
-    
-    try:
-        log_files = glob.glob(log_pattern)
-        if not log_files:
-            return []
-        
-        latest_log = max(log_files, key=os.path.getmtime)
-        
-        with open(latest_log, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+    if _log_tailer is None or _log_tailer.pattern != log_pattern:
+        _log_tailer = LogTailer(log_pattern, _parse_log_line, maxlen=LOG_BUFFER_SIZE, prefilter=LOG_PREFILTER)
+    return _log_tailer
 
-        # Focus on recent lines; include high-signal events first
-        for line in lines[-220:]:
-            line = line.strip()
-            if not line:
-                continue
 
-            # Expected format: ISO level [subsystem] message
-            m = re.match(r"^(\S+)\s+(\w+)\s+\[([^\]]+)\]\s+(.*)$", line)
-            if m:
-                ts, level, subsystem, msg = m.groups()
-                level_l = level.lower()
-
-                # Keep errors/warnings always; sample key info/debug lifecycle lines
-                keep = level_l in {"error", "warn"}
-                if not keep:
-                    keep = any(k in msg for k in [
-                        "lane task done", "lane enqueue", "lane dequeue",
-                        "embedded run", "sendMessage ok", "failed", "timeout"
-                    ])
-                if not keep:
-                    continue
-
-                logs.append({
-                    'time': ts,
-                    'message': f"[{subsystem}] {_summarize_log_message(msg)}"
-                })
-            else:
-                # Fallback line format
-                logs.append({'time': '', 'message': _summarize_log_message(line)})
+def _index_fields(line: str):
+    """(time, level, subsystem, message) of any raw log line, for the search index."""
+    line = line.strip()
+    if not line:
+        return None
+    m = _LOG_LINE_RE.match(line)
+    if not m:
+        return ('', '', '', line)  # continuation lines (stack traces) are still searchable
+    ts, level, subsystem, msg = m.groups()
+    return (ts, level.lower(), subsystem, msg)
 
-        return logs[-80:]
 
-    except FileNotFoundError:
-        return []
-    except Exception as e:
-        return [{'time': '', 'message': f'Error reading logs: {str(e)}'}]
+# Every log line, searchable via /api/logs/search (indexed in the background)
+log_index = LogIndex(lambda: os.path.join(LOG_DIR, "openclaw-*.log"), _index_fields)
 
 
-def get_subagents_list():
-    """Build task list from OpenClaw sessions (CLI-safe)."""
-    try:
-        result = subprocess.run(
-            ['openclaw', 'sessions', '--active', '180', '--json'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+def get_openclaw_logs():
+    """Return buffered high-signal activity, reading only bytes appended since the last call.
 
-        if result.returncode != 0:
-            err = (result.stderr or result.stdout or '').strip()
-            return [], f"sessions query failed: {err[:140]}"
+    Read errors propagate, so the scheduler keeps serving the last good feed and reports the error.
+    """
+    try:
+        return _get_log_tailer().poll()
+    except FileNotFoundError:
+        return []
 
-        payload = json.loads(result.stdout or '{}')
-        sessions = payload.get('sessions', [])
 
-        tasks = []
-        now_ms = int(datetime.now().timestamp() * 1000)
+def _describe_task(key, s):
+    """Task fields for a session record; the status is filled in by the task model."""
+    name = key.replace('agent:main:', '')
+    if len(name) > 90:
+        name = name[:90] + '...'
+    return {'key': key, 'name': f"{name} ({s.model})", 'updatedAt': s.updated_at}
 
-        for s in sessions:
-            key = s.get('key', '')
-            model = s.get('model', 'unknown')
-            age_ms = s.get('ageMs', 0)
-            aborted = bool(s.get('abortedLastRun', False))
 
-            # Prefer subagent + group/direct work sessions; skip slash/system noise
-            if 'telegram:slash:' in key:
-                continue
+def _advance_tasks(value):
+    """Re-publish the tasks collector's value with the status changes that just came due."""
+    _, warning, _ = value
+    task_model.advance()
+    tasks, stats = task_model.view()
+    return tasks, warning, stats
 
-            # Heuristic status from session fields
-            if aborted:
-                status = 'failed'
-            elif age_ms <= 10 * 60 * 1000:
-                status = 'pending'  # recently active
-            else:
-                status = 'completed'
 
-            name = key.replace('agent:main:', '')
-            if len(name) > 90:
-                name = name[:90] + '...'
+# Tasks kept in sync with the sessions list; age transitions are pushed as they happen
+task_model = TaskModel(_describe_task, TASK_STAGES, statuses=TASK_STATUSES,
+                       on_due=lambda: scheduler.update('tasks', _advance_tasks))
 
-            tasks.append({
-                'name': f"{name} ({model})",
-                'status': status,
-                'updatedAt': s.get('updatedAt', now_ms - age_ms)
-            })
 
-        # Most recent first
-        tasks.sort(key=lambda x: x.get('updatedAt', 0), reverse=True)
-        return tasks[:80], None
+def get_subagents_list():
+    """Task list, warning and status counts from OpenClaw sessions (raises if the CLI fails).
 
+    Only sessions that changed since the last call are re-derived.
+    """
+    try:
+        output = commands.output(['openclaw', 'sessions', '--active', '180', '--json'], timeout=10)
+        payload = json.loads(output or '{}')
     except FileNotFoundError:
-        return [], "OpenClaw CLI not found. Is OpenClaw installed?"
+        raise RuntimeError("OpenClaw CLI not found. Is OpenClaw installed?")
     except subprocess.TimeoutExpired:
-        return [], "sessions command timed out"
+        raise RuntimeError("sessions command timed out")
     except json.JSONDecodeError:
-        return [], "sessions output parse error"
-    except Exception as e:
-        return [], f"Error: {str(e)}"
+        raise RuntimeError("sessions output parse error")
 
+    records = {}
+    now_ms = int(datetime.now().timestamp() * 1000)
 
-def get_cron_jobs():
-    """Parse cron jobs from openclaw cron list."""
-    try:
-        result = subprocess.run(
-            ['openclaw', 'cron', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=10
+    for s in payload.get('sessions', []):
+        key = s.get('key', '')
+
+        # Prefer subagent + group/direct work sessions; skip slash/system noise
+        if 'telegram:slash:' in key:
+            continue
+
+        # ageMs moves on every call, so records keep only fields that change with the session
+        records[key] = SessionRecord(
+            updated_at=s.get('updatedAt', now_ms - s.get('ageMs', 0)),
+            aborted=bool(s.get('abortedLastRun', False)),
+            model=s.get('model', 'unknown'),
+            label=None,
+            spawned_by=None,
         )
-        
-        if result.returncode != 0:
-            return []
-        
-        jobs = []
-        lines = result.stdout.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('Job') or line.startswith('-') or '-----' in line:
-                continue
-            jobs.append({
-                'name': line[:60] + ('...' if len(line) > 60 else ''),
-                'schedule': 'scheduled'
-            })
-        
-        return jobs[:10]
-    
-    except Exception:
-        return []
 
+    task_model.sync(records, now_ms)
+    tasks, stats = task_model.view()
+    return tasks, None, stats
 
-def calculate_stats(tasks):
-    """Calculate status counters."""
-    stats = {'pending': 0, 'completed': 0, 'failed': 0, 'todo': 0}
-    for task in tasks:
-        status = task.get('status', 'pending').lower()
-        if status in stats:
-            stats[status] += 1
-    return stats
+
+def get_cron_jobs():
+    """Parse cron jobs from openclaw cron list (raises if the CLI fails)."""
+    output = commands.output(['openclaw', 'cron', 'list'], timeout=10)
+    
+    jobs = []
+    lines = output.strip().split('\n')
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('Job') or line.startswith('-') or '-----' in line:
+            continue
+        jobs.append({
+            'name': line[:60] + ('...' if len(line) > 60 else ''),
+            'schedule': 'scheduled'
+        })
+    
+    return jobs
 
 
 def render_tasks_html(tasks):
@@ -373,14 +639,64 @@ def render_cron_html(jobs):
     return html
 
 
-def get_dashboard_html():
-    """Generate the dashboard HTML."""
-    logs = get_openclaw_logs()
-    tasks, warning = get_subagents_list()
-    cron_jobs = get_cron_jobs()
-    stats = calculate_stats(tasks)
+scheduler = CollectorScheduler(observe=_observe_collector)
+for _name, _func, _default in [
+    ('logs', get_openclaw_logs, []),
+    ('tasks', get_subagents_list, ([], None, dict.fromkeys(TASK_STATUSES, 0))),
+    ('cron_jobs', get_cron_jobs, []),
+]:
+    scheduler.register(_name, memory.track(_name, _func), COLLECTOR_INTERVALS[_name],
+                       deadline=COLLECTOR_DEADLINES[_name], default=_default)
+
+# Paged, filterable views of the panel lists, indexed once per snapshot
+panels = PagedViews({
+    'logs': lambda snap: PagedList(snap['logs'][::-1], key=lambda e: e.get('id', 0), indexed=('level', 'subsystem')),
+    'tasks': lambda snap: PagedList(
+        snap['tasks'][0], key=lambda t: [t.get('updatedAt', 0), t['key']], indexed=('status',)
+    ),
+    'cron_jobs': lambda snap: PagedList(snap['cron_jobs']),
+})
+LIST_ROUTES = {'/api/logs': 'logs', '/api/tasks': 'tasks', '/api/cron': 'cron_jobs'}
+
+
+def panel_rows(snap):
+    """First page of each panel's rows, plus each list's total and the cursor for the rest."""
+    rows, pages = {}, {}
+    for name, limit in PANEL_ROWS.items():
+        rows[name], next_cursor, total = panels.view(name, snap).page(limit)
+        pages[name] = {'total': total, 'next': next_cursor}
+    rows['logs'] = rows['logs'][::-1]  # the activity feed reads oldest to newest
+    return rows, pages
+
+
+def status_notes(snap):
+    """Warning lines for collectors that are still collecting, stale or failing."""
+    notes = []
+    collecting = sorted(snap.partial - set(snap.errors))
+    if collecting:
+        notes.append(f"Still collecting: {', '.join(collecting)}.")
+    if snap.stale:
+        stale = [
+            f"{name} (as of {datetime.fromtimestamp(snap.updated_at[name]).strftime('%H:%M:%S')})"
+            for name in sorted(snap.stale)
+        ]
+        notes.append(f"Showing stale data for: {', '.join(stale)}.")
+    for name, error in sorted(snap.errors.items()):
+        notes.append(f"{name} refresh failed: {error}")
+    return notes
+
+
+def get_dashboard_html(snap=None):
+    """Generate the dashboard HTML from the latest collector snapshot."""
+    snap = snap or scheduler.snapshot()
+    _, warning, stats = snap['tasks']
+    rows, pages = panel_rows(snap)
     
     warning_html = f'<div class="warning">{warning}</div>' if warning else ''
+    notes = status_notes(snap)
+    if notes:
+        # Notes can carry CLI stderr
+        warning_html += f'<div class="warning">{escape(" ".join(notes))}</div>'
     
     return HTML_TEMPLATE.format(
         refresh_interval=REFRESH_INTERVAL,
@@ -389,62 +705,137 @@ def get_dashboard_html():
         stats_completed=stats['completed'],
         stats_failed=stats['failed'],
         stats_todo=stats['todo'],
-        tasks_count=len(tasks),
-        tasks_html=render_tasks_html(tasks),
-        logs_count=len(logs),
-        logs_html=render_logs_html(logs),
-        cron_count=len(cron_jobs),
-        cron_html=render_cron_html(cron_jobs)
+        tasks_count=pages['tasks']['total'],
+        tasks_html=render_tasks_html(rows['tasks']),
+        logs_count=pages['logs']['total'],
+        logs_html=render_logs_html(rows['logs']),
+        cron_count=pages['cron_jobs']['total'],
+        cron_html=render_cron_html(rows['cron_jobs']),
+        client_script=CLIENT_SCRIPT
     )
 
 
-def check_data_sources():
-    """Check availability of each data source."""
-    sources = {
-        'openclaw_cli': False,
-        'log_files': False,
-        'sessions': False,
-        'cron': False
+def build_api_payload(snap):
+    """JSON-able dashboard sections for /api/data and /api/stream."""
+    _, warning, stats = snap['tasks']
+    rows, pages = panel_rows(snap)
+    return {
+        'logs': rows['logs'],
+        'tasks': rows['tasks'],
+        'cron_jobs': rows['cron_jobs'],
+        'pages': pages,
+        'stats': stats,
+        'warning': warning,
+        'partial': sorted(snap.partial),
+        'stale': sorted(snap.stale),
+        'lastGood': {name: int(snap.updated_at[name] * 1000) for name in sorted(snap.stale)},
+        'errors': dict(sorted(snap.errors.items()))
     }
-    
-    # Check OpenClaw CLI
-    try:
-        result = subprocess.run(['openclaw', '--version'], capture_output=True, timeout=5)
-        sources['openclaw_cli'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    # Check log files
-    try:
-        log_files = glob.glob(os.path.join(LOG_DIR, "openclaw-*.log"))
-        sources['log_files'] = len(log_files) > 0
-    except Exception:
-        pass
-    
-    # Check sessions
-    try:
-        result = subprocess.run(
-            ['openclaw', 'sessions', '--active', '180', '--json'],
-            capture_output=True, timeout=10
-        )
-        sources['sessions'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    # Check cron
-    try:
-        result = subprocess.run(['openclaw', 'cron', 'list'], capture_output=True, timeout=10)
-        sources['cron'] = result.returncode == 0
-    except Exception:
-        pass
-    
-    return sources
+
+
+snapshot_stream = SnapshotStream(scheduler, build_api_payload)
+
+
+def snapshot_metrics(snap):
+    """Numeric metrics recorded to history; collectors without fresh data are skipped."""
+    skipped = snap.partial | snap.stale
+    metrics = {}
+    if 'tasks' not in skipped:
+        _, _, stats = snap['tasks']
+        metrics.update({f'tasks.{status}': count for status, count in stats.items()})
+    if 'cron_jobs' not in skipped:
+        metrics['cron.jobs'] = len(snap['cron_jobs'])
+    return metrics
+
+
+# Metric samples persisted to SQLite for /api/history
+history = MetricsHistory(sample=lambda: snapshot_metrics(scheduler.snapshot()))
+
+# Page and JSON bodies, rendered (and gzipped) once per snapshot for all clients
+rendered = RenderCache(observe=lambda route, seconds: render_seconds.labels(route).observe(seconds))
+
+
+def _probe_openclaw_cli():
+    result = commands.run(['openclaw', '--version'], timeout=5)
+    return result.returncode == 0
+
+
+def _probe_log_files():
+    return len(glob.glob(os.path.join(LOG_DIR, "openclaw-*.log"))) > 0
+
+
+def _probe_sessions():
+    result = commands.run(['openclaw', 'sessions', '--active', '180', '--json'], timeout=10)
+    return result.returncode == 0
+
+
+def _probe_cron():
+    result = commands.run(['openclaw', 'cron', 'list'], timeout=10)
+    return result.returncode == 0
+
+
+# Data-source probes run in the background; health endpoints only read their results
+probes = HealthProbes()
+for _name, _func in [
+    ('openclaw_cli', _probe_openclaw_cli),
+    ('log_files', _probe_log_files),
+    ('sessions', _probe_sessions),
+    ('cron', _probe_cron),
+]:
+    probes.register(_name, _func)
+READY_SOURCES = ('openclaw_cli', 'sessions')
+
+# Sampled CPU profiles of the running process for /debug/profile (needs OPENCLAW_DASHBOARD_DEBUG_TOKEN)
+profiler = SamplingProfiler()
+
+
+def prometheus_samples():
+    """Counters and gauges read from the dashboard's components when /metrics is scraped."""
+    cli = commands.stats()['commands']
+    yield ('cli_runs_total', 'counter', 'CLI subprocesses spawned, by command.',
+           [({'command': cmd}, c['runs']) for cmd, c in cli.items()])
+    yield ('cli_timeouts_total', 'counter', 'CLI runs that timed out or found no free process slot.',
+           [({'command': cmd}, c['timeouts']) for cmd, c in cli.items()])
+    yield ('cli_exits_total', 'counter', 'Completed CLI runs by command and exit code.',
+           [({'command': cmd, 'code': code}, n) for cmd, c in cli.items() for code, n in c.get('exitCodes', {}).items()])
+    cache = [
+        ('cli', sum(c['cached'] + c['coalesced'] for c in cli.values()), sum(c['runs'] for c in cli.values())),
+        ('render', rendered.requests - rendered.renders, rendered.renders),
+    ]
+    yield ('cache_lookups_total', 'counter', 'Cache lookups by result; hit / (hit + miss) is the hit ratio.',
+           [({'cache': name, 'result': result}, n)
+            for name, hit, miss in cache for result, n in (('hit', hit), ('miss', miss))])
+    yield ('log_bytes_read_total', 'counter', 'Log bytes read by the activity tailer.',
+           [({}, _log_tailer.bytes_read if _log_tailer else 0)])
+    yield ('log_lines_indexed_total', 'counter', 'Log lines added to the search index.',
+           [({}, log_index.lines_indexed)])
+    yield ('task_transitions_total', 'counter', 'Task status changes fired by the age timer wheel.',
+           [({}, task_model.transitions)])
+    yield ('collector_peak_alloc_bytes', 'gauge',
+           'Peak bytes allocated by the last measured run of each collector (only while tracemalloc traces).',
+           [({'collector': name}, entry['lastPeakBytes'])
+            for name, entry in sorted(list(memory.collectors.items())) if entry['lastPeakBytes'] is not None])
+
+    snap = scheduler.snapshot()
+    yield ('collector_age_seconds', 'gauge', 'Seconds since each collector last published.',
+           [({'collector': name}, round(snap.age(name), 3)) for name in sorted(snap.updated_at)])
+    _, _, stats = snap['tasks']
+    yield ('tasks', 'gauge', 'Tasks by status.', [({'status': status}, n) for status, n in stats.items()])
+    yield ('cron_jobs', 'gauge', 'Cron jobs listed by the CLI.', [({}, len(snap['cron_jobs']))])
+
+
+prom.add_collector(prometheus_samples)
+
+
+def check_data_sources():
+    """Last-known availability of each data source (never probes on the caller's thread)."""
+    return {name: bool(result and result.ok) for name, result in probes.results().items()}
 
 
 def get_health_data():
     """Get health status for /healthz endpoint."""
     sources = check_data_sources()
-    all_ok = sources.get('openclaw_cli', False) and sources.get('sessions', False)
+    all_ok = all(sources[name] for name in READY_SOURCES)
     
     return {
         'status': 'ok' if all_ok else 'degraded',
@@ -454,9 +845,32 @@ def get_health_data():
     }
 
 
+def get_liveness_data():
+    """In-process liveness for /livez; touches no data source."""
+    return {
+        'status': 'ok',
+        'version': '1.0.0',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def get_readiness_data():
+    """Readiness for /readyz: last probe result per source with its age and latency."""
+    results = probes.results()
+    ready = probes.ready(READY_SOURCES)
+    return {
+        'status': 'ready' if ready else 'not ready',
+        'timestamp': datetime.now().isoformat(),
+        'required': list(READY_SOURCES),
+        'sources': {name: result.as_dict() if result else None for name, result in results.items()},
+        'commands': commands.stats()
+    }
+
+
 def print_startup_diagnostics():
     """Print startup diagnostics to console."""
     print("\n📊 Startup Diagnostics:")
+    probes.run_all()
     sources = check_data_sources()
     
     status_map = {True: '✅', False: '❌'}
@@ -473,29 +887,187 @@ def print_startup_diagnostics():
 class DashboardHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for the dashboard."""
     
+    # Persistent connections: every response carries Content-Length (or closes)
+    protocol_version = 'HTTP/1.1'
+    # Socket timeout: bounds a slow request and how long an idle keep-alive connection is held
+    timeout = REQUEST_TIMEOUT
+    # Headers and body go out as separate writes; with Nagle on, a keep-alive
+    # client's delayed ACK stalls every response by ~40 ms
+    disable_nagle_algorithm = True
+    
     def do_GET(self):
-        """Handle GET requests."""
-        if self.path == '/' or self.path == '/index.html':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html; charset=utf-8')
-            self.end_headers()
-            html = get_dashboard_html()
-            self.wfile.write(html.encode('utf-8'))
-        elif self.path == '/healthz':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
+        """Handle GET requests, timing each one for /metrics."""
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        self.response_status = None
+        # Held per request, so an idle keep-alive connection doesn't keep a worker busy
+        self.server.acquire_worker()
+        try:
+            self.route_get(url)
+        finally:
+            self.server.release_worker()
+        if url.path != '/api/stream':
+            route = 'unmatched' if self.response_status == 404 else url.path
+            request_seconds.labels(route, self.response_status).observe(time.perf_counter() - started)
+    
+    def route_get(self, url):
+        """Dispatch a GET request by path."""
+        if url.path == '/' or url.path == '/index.html':
+            self.send_snapshot('/', 'text/html; charset=utf-8', get_dashboard_html)
+        elif url.path == '/api/data':
+            self.send_snapshot('/api/data', 'application/json',
+                               lambda snap: json.dumps(snapshot_stream.payload_for(snap)))
+        elif url.path == '/api/stream':
+            self.send_stream(url)
+        elif url.path in LIST_ROUTES:
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            status, data = panels.api(LIST_ROUTES[url.path], scheduler.snapshot(), params)
+            self.send_body(status, 'application/json', json.dumps(data).encode('utf-8'))
+        elif url.path == '/api/logs/search':
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            status, data = log_index.api(params)
+            self.send_body(status, 'application/json', json.dumps(data).encode('utf-8'))
+        elif url.path == '/api/history':
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            status, data = history.api(params)
+            self.send_body(status, 'application/json', json.dumps(data).encode('utf-8'))
+        elif url.path == '/healthz':
             health_data = get_health_data()
-            self.wfile.write(json.dumps(health_data).encode('utf-8'))
+            self.send_body(200, 'application/json', json.dumps(health_data).encode('utf-8'))
+        elif url.path == '/livez':
+            self.send_body(200, 'application/json', json.dumps(get_liveness_data()).encode('utf-8'))
+        elif url.path == '/readyz':
+            readiness = get_readiness_data()
+            status = 200 if readiness['status'] == 'ready' else 503
+            self.send_body(status, 'application/json', json.dumps(readiness).encode('utf-8'))
+        elif url.path == '/debug/profile':
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            status, content_type, body = (
+                authorize_debug(self.headers.get('Authorization')) or profiler.api(params)
+            )
+            self.send_body(status, content_type, body)
+        elif url.path == '/debug/memory':
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            status, content_type, body = (
+                authorize_debug(self.headers.get('Authorization')) or memory.api(params)
+            )
+            self.send_body(status, content_type, body)
+        elif url.path == '/metrics':
+            self.send_body(200, METRICS_CONTENT_TYPE, prom.render().encode('utf-8'))
         else:
-            self.send_response(404)
+            self.send_body(404, 'text/plain; charset=utf-8', b'Not found')
+    
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+        if self.server.crowded.is_set() and not self.close_connection:
+            # A new connection is waiting for a slot; this client reconnects on its next poll
+            self.send_header('Connection', 'close')
+    
+    def send_body(self, status, content_type, body, headers=()):
+        """Send a complete response with an exact Content-Length."""
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_snapshot(self, route, content_type, render):
+        """Send a snapshot-backed body: 304 if unchanged, else the shared (possibly gzipped) render."""
+        snap = scheduler.snapshot()
+        encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+        if is_not_modified(snap, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')):
+            self.send_response(304)
+            for name, value in validator_headers(snap, encoding):
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        body, headers = rendered.respond(route, snap, render, encoding)
+        self.send_body(200, content_type, body, headers)
+    
+    def send_stream(self, url):
+        """Server-Sent Events: a full snapshot, then only the sections that change."""
+        if not self.server.streams.acquire(blocking=False):
+            self.send_body(503, 'text/plain; charset=utf-8', b'Too many stream clients')
+            return
+        try:
+            # A stream never ends on its own, so it should not hold one of the request workers
+            self.server.release_worker()
+            last_event_id = self.headers.get('Last-Event-ID') or parse_qs(url.query).get('lastEventId', [None])[0]
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header('Content-type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
             self.end_headers()
+            for frame in snapshot_stream.events(last_event_id):
+                self.wfile.write(frame.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass  # client went away
+        finally:
+            self.server.streams.release()
     
     def log_message(self, format, *args):
         """Suppress logging."""
         pass
 
 
+class DashboardServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Threaded HTTP server with bounded request workers and connections.
+    
+    Each connection runs on its own thread, at most `max_connections` at once;
+    further connections wait in the listen backlog, so a burst of clients cannot
+    spawn unbounded threads. While one waits, responses carry `Connection: close`
+    so keep-alive clients hand their slot back instead of holding it until they
+    idle out (REQUEST_TIMEOUT). At most `workers` requests are handled at once;
+    a worker is held per request, not per connection. /api/stream clients give
+    their worker back and are capped separately by `max_streams`.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, workers=HTTP_WORKERS, max_streams=MAX_STREAMS,
+                 max_connections=MAX_CONNECTIONS):
+        super().__init__(server_address, handler_class)
+        self.workers = threading.BoundedSemaphore(workers)
+        self.streams = threading.BoundedSemaphore(max_streams)
+        self.connections = threading.BoundedSemaphore(max_connections)
+        self.crowded = threading.Event()  # set while an accepted connection waits for a slot
+        self._local = threading.local()
+    
+    def process_request(self, request, client_address):
+        if not self.connections.acquire(blocking=False):
+            self.crowded.set()
+            self.connections.acquire()
+            self.crowded.clear()
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self.connections.release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.connections.release()
+    
+    def acquire_worker(self):
+        """Wait for one of the request workers; held by this thread until release_worker()."""
+        self.workers.acquire()
+        self._local.holds_worker = True
+    
+    def release_worker(self):
+        """Give this thread's worker slot back early (idempotent)."""
+        if getattr(self._local, 'holds_worker', False):
+            self._local.holds_worker = False
+            self.workers.release()
+
+
 def main():
     """Start the dashboard server."""
     import socket
@@ -518,7 +1090,13 @@ def main():
     if port != 5000:
         print(f"⚠️  Port 5000 was in use, using port {port} instead")
     
-    with socketserver.TCPServer(("", port), DashboardHandler) as httpd:
+    print_startup_diagnostics()
+    scheduler.start()
+    task_model.start()
+    probes.start()
+    history.start()
+    log_index.start()
+    with DashboardServer(("", port), DashboardHandler) as httpd:
         httpd.serve_forever()
 
 
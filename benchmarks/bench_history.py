@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Metrics history benchmark: batched SQLite writes and rollup range queries.
+Fills a temporary history database with several months of synthetic samples
+through MetricsHistory.record()/flush(), prunes it like the live writer does,
+then times typical /api/history range queries against each resolution tier.
+
+Usage: python3 benchmarks/bench_history.py [--days 90] [--metrics 8] [--interval 60]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics_history import MetricsHistory  # noqa: E402
+
+BATCH_SAMPLES = 60  # samples per metric per flush, like a minute of live writes at 1s
+
+
+def fill(history, metrics, days, interval, now):
+    start = int(now - days * 86400)
+    rows = 0
+    started = time.perf_counter()
+    for i, ts in enumerate(range(start, int(now), interval)):
+        history.record({name: 50 + 40 * math.sin(ts / 3600 + k) for k, name in enumerate(metrics)}, ts=ts)
+        if i % BATCH_SAMPLES == BATCH_SAMPLES - 1:
+            rows += history.flush()
+    rows += history.flush()
+    elapsed = time.perf_counter() - started
+    history.prune(now)
+    return rows, elapsed
+
+
+def time_query(history, metric, start, end, step, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = history.query(metric, start, end, step)
+        timings.append(time.perf_counter() - t)
+    return {
+        'resolution': result['resolution'],
+        'step': result['step'],
+        'points': len(result['points']),
+        'medianMs': round(statistics.median(timings) * 1000, 3),
+        'maxMs': round(max(timings) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--metrics', type=int, default=8)
+    parser.add_argument('--interval', type=int, default=60, help='seconds between synthetic samples')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    metrics = [f'bench.metric{k}' for k in range(args.metrics)]
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.sqlite3')
+        history = MetricsHistory(path)
+        rows, elapsed = fill(history, metrics, args.days, args.interval, now)
+        queries = {
+            'lastHour': (now - 3600, now, None),
+            'lastDay': (now - 86400, now, 300),
+            'lastWeek': (now - 7 * 86400, now, 3600),
+            'allTime': (now - args.days * 86400, now, 86400),
+        }
+        results = {
+            name: time_query(history, metrics[0], start, end, step, args.repeat)
+            for name, (start, end, step) in queries.items()
+        }
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 1e6
+    print(json.dumps({
+        'days': args.days,
+        'metrics': args.metrics,
+        'rowsWritten': rows,
+        'writeRowsPerSec': round(rows / elapsed),
+        'dbSizeMb': round(size_mb, 1),
+        'queries': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Bytes-on-wire benchmark for gzip negotiation on / and /api/data.
+Fills a stub scheduler with synthetic logs, tasks and cron jobs, has N clients
+fetch each route with and without `Accept-Encoding: gzip`, and reports bytes
+sent, the saving, and how many renders/compressions the shared cache performed.
+
+Usage: python3 benchmarks/bench_http_compression.py [--clients 50] [--app app_stdlib|app]
+"""
+
+import argparse
+import gzip
+import http.client
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import iter_log_lines  # noqa: E402
+from collector_scheduler import CollectorScheduler  # noqa: E402
+from http_cache import RenderCache  # noqa: E402
+from snapshot_stream import SnapshotStream  # noqa: E402
+
+
+def install_stubs(mod, task_count):
+    """Point the app at synthetic data shaped like the real collectors' output."""
+    logs = []
+    for line in iter_log_lines():
+        event = mod._parse_log_line(line)
+        if event:
+            logs.append(dict(event, id=len(logs) + 1))  # the tailer numbers events; the logs panel pages by id
+        if len(logs) >= 80:
+            break
+    now_ms = int(time.time() * 1000)
+    tasks = [
+        {'key': f'agent:main:subagent:{i:08x}', 'name': f'Refactor module {i} and update its call sites',
+         'summary': 'agent • gpt-5 • from agent:main:main', 'status': ('todo', 'pending', 'completed', 'failed')[i % 4],
+         'updatedAt': now_ms - i * 90000}
+        for i in range(task_count)
+    ]
+    cron = [{'name': f'nightly-job-{i} every 1d', 'schedule': 'scheduled'} for i in range(12)]
+
+    scheduler = CollectorScheduler()
+    scheduler.register('logs', lambda: logs, 3600)
+    stats = dict.fromkeys(mod.TASK_STATUSES, 0)
+    for task in tasks:
+        stats[task['status']] += 1
+    scheduler.register('tasks', lambda: (tasks, None, stats), 3600)
+    scheduler.register('cron_jobs', lambda: cron, 3600)
+    if hasattr(mod, 'get_codex_usage'):
+        scheduler.register('codex_usage', lambda: None, 3600)
+        scheduler.register('openclaw_usage', lambda: None, 3600)
+    mod.scheduler = scheduler
+    mod.snapshot_stream = SnapshotStream(scheduler, mod.build_api_payload)
+    mod.rendered = RenderCache()
+
+
+def stdlib_fetcher(mod):
+    server = mod.DashboardServer(('127.0.0.1', 0), mod.DashboardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local = threading.local()
+
+    def fetch(path, headers):
+        if not hasattr(local, 'conn'):
+            local.conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        local.conn.request('GET', path, headers=headers)
+        resp = local.conn.getresponse()
+        return resp.read(), resp.getheader('Content-Encoding')
+    return fetch, server.shutdown
+
+
+def flask_fetcher(mod):
+    client = mod.app.test_client()
+
+    def fetch(path, headers):
+        resp = client.get(path, headers=headers)
+        return resp.get_data(), resp.headers.get('Content-Encoding')
+    return fetch, lambda: None
+
+
+def measure(mod, fetch, path, clients, accept_encoding):
+    mod.rendered.renders = mod.rendered.compressions = 0
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+    sent = 0
+    body = encoding = None
+    started = time.perf_counter()
+    for _ in range(clients):
+        body, encoding = fetch(path, headers)
+        sent += len(body)
+    elapsed = time.perf_counter() - started
+    # Every client must get the same content regardless of encoding
+    decoded = gzip.decompress(body) if encoding == 'gzip' else body
+    return {
+        'encoding': encoding or 'identity',
+        'bytesPerResponse': len(body),
+        'decodedBytes': len(decoded),
+        'bytesOnWire': sent,
+        'renders': mod.rendered.renders,
+        'compressions': mod.rendered.compressions,
+        'ms': round(elapsed * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=120)
+    parser.add_argument('--app', default='app_stdlib', choices=['app_stdlib', 'app'])
+    args = parser.parse_args()
+
+    mod = importlib.import_module(args.app)
+    install_stubs(mod, args.tasks)
+    fetch, shutdown = stdlib_fetcher(mod) if args.app == 'app_stdlib' else flask_fetcher(mod)
+
+    results = {}
+    for path in ('/', '/api/data'):
+        identity = measure(mod, fetch, path, args.clients, None)
+        gzipped = measure(mod, fetch, path, args.clients, 'gzip, deflate, br')
+        results[path] = {
+            'identity': identity,
+            'gzip': gzipped,
+            'savedPercent': round(100 * (1 - gzipped['bytesOnWire'] / identity['bytesOnWire']), 1),
+        }
+    shutdown()
+    print(json.dumps({'app': args.app, 'clients': args.clients, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the stdlib server: single-threaded HTTP/1.0 vs threaded keep-alive.
+Runs each server mode in-process against stubbed data, drives it with N concurrent
+pollers on persistent connections plus one client hitting a slow /healthz (a
+stand-in for a blocked `openclaw` subprocess), and reports p50/p99 latency.
+A third case gives the threaded server fewer workers than there are keep-alive
+pollers and times /healthz on fresh connections, which must not wait for the
+pollers to idle out.
+
+Usage: python3 benchmarks/bench_http_concurrency.py [--clients 50] [--seconds 10]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_stdlib  # noqa: E402
+from collector_scheduler import CollectorScheduler  # noqa: E402
+from snapshot_stream import SnapshotStream  # noqa: E402
+
+
+def install_stubs(slow_health_seconds):
+    """Point the server at fixed synthetic data so runs are reproducible."""
+    now_ms = int(time.time() * 1000)
+    tasks = [
+        {'key': f'agent:main:subagent:{i}', 'name': f'subagent:{i} (model)',
+         'status': ('pending', 'completed', 'failed')[i % 3], 'updatedAt': now_ms - i * 60000}
+        for i in range(80)
+    ]
+    logs = [{'id': i + 1, 'time': f'2026-01-01T00:00:{i % 60:02d}Z', 'level': 'info', 'subsystem': 'lane',
+             'message': f'[lane] Completed: session:{i}'} for i in range(80)]
+    cron = [{'name': f'job-{i} every 15m', 'schedule': 'scheduled'} for i in range(10)]
+
+    scheduler = CollectorScheduler()
+    scheduler.register('logs', lambda: logs, 3600)
+    stats = dict.fromkeys(app_stdlib.TASK_STATUSES, 0)
+    for task in tasks:
+        stats[task['status']] += 1
+    scheduler.register('tasks', lambda: (tasks, None, stats), 3600)
+    scheduler.register('cron_jobs', lambda: cron, 3600)
+    app_stdlib.scheduler = scheduler
+    app_stdlib.snapshot_stream = SnapshotStream(scheduler, app_stdlib.build_api_payload)
+
+    def slow_health():
+        time.sleep(slow_health_seconds)
+        return {'status': 'ok'}
+    app_stdlib.get_health_data = slow_health
+
+
+class LegacyHandler(app_stdlib.DashboardHandler):
+    protocol_version = 'HTTP/1.0'
+    timeout = None
+
+
+class LegacyServer(socketserver.TCPServer):
+    """One request at a time, so there are no worker slots to take or connections to shed."""
+    crowded = threading.Event()
+
+    def acquire_worker(self):
+        pass
+
+    def release_worker(self):
+        pass
+
+
+def start_server(mode, workers, max_connections=app_stdlib.MAX_CONNECTIONS):
+    if mode == 'legacy':
+        server = LegacyServer(('127.0.0.1', 0), LegacyHandler)
+    else:
+        server = app_stdlib.DashboardServer(('127.0.0.1', 0), app_stdlib.DashboardHandler,
+                                            workers=workers, max_connections=max_connections)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def poller(port, path, stop, interval, latencies, errors):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                errors.append(resp.status)
+            else:
+                latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        # Poll with jitter, like many tabs on REFRESH_INTERVAL
+        stop.wait(interval * random.uniform(0.5, 1.5))
+    conn.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(mode, args):
+    server = start_server(mode, args.workers)
+    port = server.server_address[1]
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=poller, args=(port, random.choice(['/', '/api/data']), stop,
+                                              args.interval, latencies, errors), daemon=True)
+        for _ in range(args.clients)
+    ]
+    slow = threading.Thread(target=poller, args=(port, '/healthz', stop, 1.0, [], errors), daemon=True)
+    for t in threads + [slow]:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads + [slow]:
+        t.join(timeout=args.slow_health + 5)
+    server.shutdown()
+    server.server_close()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / args.seconds, 1),
+        'p50Ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p99Ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+    }
+
+
+def run_oversubscribed(args):
+    """More keep-alive pollers than workers; time /healthz on fresh connections."""
+    slow_health = app_stdlib.get_health_data
+    app_stdlib.get_health_data = lambda: {'status': 'ok'}  # measure waiting for a slot, not the probe
+    server = start_server('threaded', args.few_workers)
+    port = server.server_address[1]
+    stop = threading.Event()
+    latencies, errors, probes = [], [], []
+    threads = [
+        threading.Thread(target=poller, args=(port, '/api/data', stop, args.keepalive_interval, latencies, errors),
+                         daemon=True)
+        for _ in range(args.keepalive_clients)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(min(1.0, args.seconds / 2))  # let every poller open its connection first
+    deadline = time.monotonic() + args.seconds
+    try:
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=app_stdlib.REQUEST_TIMEOUT * 2)
+            try:
+                conn.request('GET', '/healthz')
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status == 200:
+                    probes.append(time.perf_counter() - started)
+                else:
+                    errors.append(resp.status)
+            except (OSError, http.client.HTTPException) as e:
+                errors.append(type(e).__name__)
+            finally:
+                conn.close()
+            time.sleep(1.0)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join(timeout=5)
+        server.shutdown()
+        server.server_close()
+        app_stdlib.get_health_data = slow_health
+    return {
+        'workers': args.few_workers,
+        'keepaliveClients': args.keepalive_clients,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'healthzProbes': len(probes),
+        'healthzP50Ms': round(percentile(probes, 50) * 1000, 2) if probes else None,
+        'healthzMaxMs': round(max(probes) * 1000, 2) if probes else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--interval', type=float, default=0.2, help='mean seconds between polls per client')
+    parser.add_argument('--slow-health', type=float, default=1.0, help='seconds the stub /healthz blocks')
+    parser.add_argument('--workers', type=int, default=app_stdlib.HTTP_WORKERS)
+    parser.add_argument('--few-workers', type=int, default=2,
+                        help='workers in the oversubscribed case')
+    parser.add_argument('--keepalive-clients', type=int, default=8,
+                        help='keep-alive pollers in the oversubscribed case')
+    parser.add_argument('--keepalive-interval', type=float, default=2.0,
+                        help='mean seconds between their polls (under REQUEST_TIMEOUT, so they never idle out)')
+    args = parser.parse_args()
+
+    random.seed(0)
+    install_stubs(args.slow_health)
+    results = {mode: run(mode, args) for mode in ('legacy', 'threaded')}
+    results['oversubscribed'] = run_oversubscribed(args)
+    print(json.dumps({'clients': args.clients, 'seconds': args.seconds, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Load test for both dashboard servers: browser tabs, API scripts and monitors polling with jitter.
+Each server runs in its own process with its collectors replaced by seeded
+synthetic data (logs, tasks from a generated session store, cron jobs) that
+changes every --churn seconds, so runs are reproducible and renders are real.
+Clients poll on the pages' own schedule: a tab loads / and then, like the
+page's polling fallback, refreshes every REFRESH_INTERVAL (app.py fetches
+/api/data, app_stdlib.py reloads /); API clients poll /api/data and monitors
+poll /healthz. Clients revalidate with If-None-Match like a browser cache.
+Reports throughput, p50/p95/p99 latency and error rate per route, per server.
+
+Usage: python3 benchmarks/bench_http_load.py [--tabs 50] [--api-clients 5] [--monitors 3]
+           [--seconds 30] [--interval 10] [--servers app_stdlib,app]
+"""
+
+import argparse
+import http.client
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generators import iter_log_lines, iter_sessions  # noqa: E402
+
+SERVERS = ('app_stdlib', 'app')
+CRON_JOBS = [{'name': f'nightly-job-{i} every 1d', 'schedule': 'scheduled'} for i in range(12)]
+
+
+def install_stubs(mod, sessions, churn, seed):
+    """Replace the app's collectors with synthetic data that changes every `churn` seconds.
+
+    Health probes are replaced with ones that always pass.
+    """
+    from session_model import TaskModel
+    from session_store import _record
+
+    lines = iter_log_lines(seed=seed)
+    events = []
+
+    def logs():
+        # Each refresh brings the next few high-signal events, as a live log would
+        while True:
+            event = mod._parse_log_line(next(lines))
+            if event:
+                events.append(dict(event, id=len(events) + 1))
+                if len(events) % 5 == 0:
+                    return events[-mod.LOG_BUFFER_SIZE:]
+
+    now = int(time.time() * 1000)
+    records = {key: _record(entry) for key, entry in iter_sessions(sessions, now, seed=seed) if 'subagent' in key}
+    model = TaskModel(mod._describe_task, mod.TASK_STAGES, statuses=mod.TASK_STATUSES)
+    touched = itertools.cycle(sorted(records))
+
+    def tasks():
+        key = next(touched)
+        records[key] = records[key]._replace(updated_at=int(time.time() * 1000))
+        model.sync(dict(records))
+        tasks, stats = model.view()
+        return tasks, None, stats
+
+    stubs = {'logs': logs, 'tasks': tasks, 'cron_jobs': lambda: CRON_JOBS}
+    if hasattr(mod, 'get_codex_usage'):
+        stubs.update(codex_usage=lambda: None, openclaw_usage=lambda: None)
+    for name, func in stubs.items():
+        mod.scheduler.register(name, func, churn)
+    # The real probes run the openclaw CLI and stat host paths, which would make /healthz host-dependent
+    for name in list(mod.probes._probes):
+        mod.probes.register(name, lambda: True)
+    mod.probes.run_all()
+
+
+def serve(name, args, ready):
+    """Child process: start one server on stubbed data and report its port."""
+    os.environ['HOME'] = tempfile.mkdtemp(prefix='openclaw-load-')  # nothing touches the real ~/.openclaw
+    sys.path.insert(0, ROOT)
+    mod = importlib.import_module(name)
+    install_stubs(mod, args.sessions, args.churn, args.seed)
+    mod.scheduler.snapshot()  # first collection before any client connects
+    if name == 'app':
+        import logging
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)  # per-request access lines would dominate
+        server = make_server('127.0.0.1', 0, mod.app, threaded=True)  # what app.run() serves with
+    else:
+        server = mod.DashboardServer(('127.0.0.1', 0), mod.DashboardHandler)
+    ready.put((server.server_address[1], mod.REFRESH_INTERVAL))
+    server.serve_forever()
+
+
+def client(port, plan, interval, args, rng, stop, record):
+    """Request `plan` in order, then its last path every `interval` (± jitter) until `stop`.
+
+    Ticks are fixed-rate like setInterval: a slow response doesn't push the
+    schedule back, so overload shows up as latency instead of fewer requests.
+    """
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=args.timeout)
+    validators = {}
+    due = time.monotonic() + rng.uniform(0, interval)  # tabs and monitors don't all start together
+    paths = itertools.chain(plan, itertools.repeat(plan[-1]))
+    while not stop.wait(max(0.0, due - time.monotonic())):
+        path = next(paths)
+        headers = {'Accept-Encoding': 'gzip'}
+        if path in validators and not args.no_revalidate:
+            headers['If-None-Match'] = validators[path]
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            record(path, resp.status, time.perf_counter() - started)
+            if resp.getheader('ETag'):
+                validators[path] = resp.getheader('ETag')
+        except (OSError, http.client.HTTPException) as e:
+            record(path, type(e).__name__, time.perf_counter() - started)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=args.timeout)
+        due += interval * rng.uniform(1 - args.jitter, 1 + args.jitter)
+    conn.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies, statuses, seconds):
+    requests = sum(statuses.values())
+    errors = sum(n for status, n in statuses.items() if not isinstance(status, int) or status >= 400)
+
+    def ms(pct):
+        value = percentile(latencies, pct)
+        return round(value * 1000, 2) if value is not None else None
+    return {
+        'requests': requests,
+        'rps': round(requests / seconds, 1),
+        'notModified': statuses.get(304, 0),
+        'errors': errors,
+        'errorRate': round(errors / requests, 4) if requests else None,
+        'p50Ms': ms(50),
+        'p95Ms': ms(95),
+        'p99Ms': ms(99),
+        'statuses': {str(status): n for status, n in sorted(statuses.items(), key=str)},
+    }
+
+
+def run(name, args):
+    """Start `name` in a child process, poll it for --seconds, and summarize per route."""
+    ctx = multiprocessing.get_context('spawn')
+    ready = ctx.Queue()
+    proc = ctx.Process(target=serve, args=(name, args, ready), daemon=True)
+    proc.start()
+    try:
+        while True:
+            try:
+                port, refresh_interval = ready.get(timeout=1)
+                break
+            except queue.Empty:
+                if not proc.is_alive():
+                    raise RuntimeError(f"{name} server exited with code {proc.exitcode} before listening")
+        tab_poll = '/api/data' if name == 'app' else '/'
+        kinds = [
+            ('tab', ['/', tab_poll], args.interval or refresh_interval, args.tabs),
+            ('api', ['/api/data'], args.api_interval, args.api_clients),
+            ('monitor', ['/healthz'], args.monitor_interval, args.monitors),
+        ]
+        latencies, statuses = defaultdict(list), defaultdict(Counter)
+        lock = threading.Lock()
+
+        def record(path, status, seconds):
+            with lock:
+                statuses[path][status] += 1
+                if status in (200, 304):
+                    latencies[path].append(seconds)
+
+        stop = threading.Event()
+        threads = []
+        for kind, plan, interval, count in kinds:
+            for i in range(count):
+                rng = random.Random(f'{args.seed}:{kind}:{i}')
+                threads.append(threading.Thread(target=client, daemon=True,
+                                                args=(port, plan, interval, args, rng, stop, record)))
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        stop.wait(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join(timeout=args.timeout + 1)
+        elapsed = time.monotonic() - started
+    finally:
+        proc.terminate()
+        proc.join()
+
+    routes = {path: summarize(latencies[path], statuses[path], elapsed) for path in sorted(statuses)}
+    total = summarize([s for values in latencies.values() for s in values],
+                      sum(statuses.values(), Counter()), elapsed)
+    return {'tabPolls': tab_poll, 'refreshInterval': args.interval or refresh_interval,
+            'routes': routes, 'total': total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', default=','.join(SERVERS), help='comma-separated: app_stdlib,app')
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--tabs', type=int, default=50, help='browser tabs (load /, then refresh)')
+    parser.add_argument('--interval', type=float, default=None,
+                        help="tab refresh seconds (default: the server's REFRESH_INTERVAL)")
+    parser.add_argument('--api-clients', type=int, default=5)
+    parser.add_argument('--api-interval', type=float, default=2.0)
+    parser.add_argument('--monitors', type=int, default=3)
+    parser.add_argument('--monitor-interval', type=float, default=5.0)
+    parser.add_argument('--jitter', type=float, default=0.25, help='± fraction applied to every interval')
+    parser.add_argument('--no-revalidate', action='store_true', help="don't send If-None-Match")
+    parser.add_argument('--churn', type=float, default=5.0, help='seconds between stub data changes')
+    parser.add_argument('--sessions', type=int, default=2000, help='sessions in the synthetic store')
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    servers = [s for s in args.servers.split(',') if s]
+    unknown = set(servers) - set(SERVERS)
+    if unknown:
+        parser.error(f"unknown servers: {', '.join(sorted(unknown))} (choose from {', '.join(SERVERS)})")
+    if 'app' in servers and importlib.util.find_spec('flask') is None:
+        print("⚠️  Flask not installed; skipping app.py", file=sys.stderr)
+        servers.remove('app')
+
+    results = {}
+    for name in servers:
+        print(f"🚀 {name}: {args.tabs} tabs, {args.api_clients} API clients, {args.monitors} monitors "
+              f"for {args.seconds:g}s ...", file=sys.stderr)
+        results[name] = run(name, args)
+        for path, r in results[name]['routes'].items():
+            print(f"   {path:<10} {r['rps']:>8} rps  p50 {r['p50Ms']} ms  p95 {r['p95Ms']} ms  "
+                  f"p99 {r['p99Ms']} ms  errors {r['errors']}", file=sys.stderr)
+
+    print(json.dumps({
+        'seconds': args.seconds,
+        'clients': {'tabs': args.tabs, 'api': args.api_clients, 'monitors': args.monitors},
+        'jitter': args.jitter,
+        'churn': args.churn,
+        'servers': results,
+        'note': 'servers run one at a time, each in its own process; latency counts 200 and 304 responses',
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
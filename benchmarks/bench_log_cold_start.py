@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: readlines() of the whole log vs. reverse block seek.
+Generates a synthetic openclaw-*.log (2 GB by default) and times how long each
+strategy takes to produce the activity feed from a cold tailer. The speedup
+compares both at the legacy path's event count (it stops at the last 220 lines);
+the reverse seek is also timed at the full --limit. Also times the
+merged read right after a rotation, when the newest file holds only a few
+lines and the rest of the window comes from the previous file.
+
+Usage: python3 benchmarks/bench_log_cold_start.py [--size-mb 2048] [--keep]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_stdlib  # noqa: E402  (stdlib parser, no Flask needed)
+from benchmarks.generators import write_log  # noqa: E402
+from benchmarks.generators import iter_log_lines  # noqa: E402
+from log_tail import merge_last_events, read_last_events  # noqa: E402
+
+
+def legacy_readlines(path, parse_line):
+    """The pre-tailer path: read every line, keep the last 220, parse those."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+    events = [e for e in (parse_line(line) for line in lines[-220:]) if e is not None]
+    return events[-80:]
+
+
+def timed(func, *args, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=2048)
+    parser.add_argument('--limit', type=int, default=500, help='events to collect (LOG_BUFFER_SIZE)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dir', default=None, help='where to write the synthetic log')
+    parser.add_argument('--keep', action='store_true', help='keep the generated log')
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp(prefix='openclaw-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, 'openclaw-2026-01-01.log')
+    print(f"Generating {args.size_mb} MB synthetic log at {path} ...", file=sys.stderr)
+    lines = write_log(path, args.size_mb * 1024 * 1024)
+
+    parse = app_stdlib._parse_log_line
+    legacy_s, legacy_events = timed(legacy_readlines, path, parse, repeat=args.repeat)
+    # Same amount of work as the legacy path, then the full buffer the tailer actually fills
+    same_s, (same_events, _, same_scanned) = timed(read_last_events, path, parse, len(legacy_events),
+                                                   repeat=args.repeat)
+    reverse_s, (events, _, scanned) = timed(read_last_events, path, parse, args.limit, repeat=args.repeat)
+
+    # Just after a rotation: a fresh file with a handful of lines next to the full one
+    rotated = os.path.join(workdir, 'openclaw-2026-01-02.log')
+    with open(rotated, 'w') as f:
+        f.writelines(iter_log_lines(50, seed=1, start=datetime(2026, 1, 2, tzinfo=timezone.utc)))
+    files = [(p, os.path.getsize(p), os.path.getmtime(p)) for p in (path, rotated)]
+    newest_s, (newest_events, _, _) = timed(read_last_events, rotated, parse, args.limit, repeat=args.repeat)
+    merged_s, (merged_events, _, merged_scanned) = timed(merge_last_events, files, parse, args.limit,
+                                                         repeat=args.repeat)
+    os.remove(rotated)
+
+    print(json.dumps({
+        'fileBytes': os.path.getsize(path),
+        'fileLines': lines,
+        'legacyReadlines': {'seconds': round(legacy_s, 4), 'events': len(legacy_events)},
+        'reverseSeekSameEvents': {'seconds': round(same_s, 6), 'events': len(same_events),
+                                  'bytesScanned': same_scanned, 'sameEvents': same_events == legacy_events},
+        'reverseSeek': {'seconds': round(reverse_s, 6), 'events': len(events), 'bytesScanned': scanned},
+        'speedup': round(legacy_s / same_s, 1) if same_s else None,
+        'afterRotation': {
+            'newestFileOnly': {'seconds': round(newest_s, 6), 'events': len(newest_events)},
+            'mergedFiles': {'seconds': round(merged_s, 6), 'events': len(merged_events),
+                            'bytesScanned': merged_scanned},
+        },
+        'note': 'warm page cache; best of --repeat runs; speedup is legacyReadlines vs reverseSeekSameEvents',
+    }, indent=2))
+
+    if not args.keep:
+        os.remove(path)
+        if not args.dir:
+            os.rmdir(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Log scan benchmark: text-mode parsing vs. the mmap byte-level prefilter.
+Generates synthetic logs with the default level mix and a quieter one (fewer
+kept lines), then scans each end to end with both paths and reports MB/s. The
+text path decodes and parses every line; scan_events() decodes only the lines
+LOG_PREFILTER selects. Both must produce the same events.
+
+Usage: python3 benchmarks/bench_log_prefilter.py [--size-mb 200] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_stdlib  # noqa: E402  (stdlib parser, no Flask needed)
+from benchmarks.generators import write_log  # noqa: E402
+from log_tail import scan_events  # noqa: E402
+
+MIXES = {
+    'default': {},
+    'quiet': {
+        'level_mix': {'debug': 0.7, 'info': 0.28, 'warn': 0.015, 'error': 0.005},
+        'lane_ratio': 0.01,
+        'tool_ratio': 0.01,
+    },
+}
+
+# Appended to every log: lines on the edge of the structured layout that the parser keeps
+EDGE_LINES = [
+    '2026-01-01T00:00:00Z debug [lane] \n',  # empty message: free-form once stripped
+    '2026-01-01T00:00:01Z debug [lane]\t \n',
+    '2026-01-01T00:00:02Z debug [lane]\n',
+]
+
+
+def text_scan(path, parse_line):
+    """The text-mode path: decode, strip and parse every line."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return [e for e in map(parse_line, f) if e is not None]
+
+
+def best_of(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    parse = app_stdlib._parse_log_line
+    prefilter = app_stdlib.LOG_PREFILTER
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kwargs in MIXES.items():
+            path = os.path.join(tmp, f'openclaw-{name}.log')
+            lines = write_log(path, args.size_mb * 1024 * 1024, **kwargs)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(EDGE_LINES)
+            lines += len(EDGE_LINES)
+            mb = os.path.getsize(path) / 1e6
+            text_s, text_events = best_of(lambda: text_scan(path, parse), args.repeat)
+            mmap_s, (mmap_events, _) = best_of(lambda: scan_events(path, parse, prefilter), args.repeat)
+            with open(path, 'rb') as f:
+                candidates = len(prefilter.lines(f.read()))
+            os.remove(path)
+            results[name] = {
+                'lines': lines,
+                'keptEvents': len(text_events),
+                'candidateLines': candidates,
+                'textMBps': round(mb / text_s, 1),
+                'mmapPrefilterMBps': round(mb / mmap_s, 1),
+                'speedup': round(text_s / mmap_s, 2),
+                'sameEvents': mmap_events == text_events,
+            }
+
+    print(json.dumps({'sizeMb': args.size_mb, 'mixes': results, 'note': 'warm page cache; best of --repeat runs'},
+                     indent=2))
+
+
+if __name__ == '__main__':
+    main()
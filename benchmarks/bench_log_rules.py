@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Log summarization microbenchmark: per-line regex loop vs. compiled rule engine.
+Parses the same synthetic lines with the original uncompiled parse/summarize
+code and with the current _parse_log_line(), checks both produce identical
+events, and reports lines/sec for each.
+
+Usage: python3 benchmarks/bench_log_rules.py [--lines 200000] [--app app_stdlib|app]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import iter_log_lines  # noqa: E402
+
+
+def legacy_summarize(raw, unwrap_json):
+    """_summarize_log_message() as it was before the rule engine."""
+    s = raw.strip()
+    if unwrap_json:
+        if s.startswith('{"0"'):
+            m1 = re.search(r'"1":"([^"]+)"', s)
+            m0 = re.search(r'"0":"([^"]+)"', s)
+            s = (m1.group(1) if m1 else (m0.group(1) if m0 else s))
+            s = s.replace('\\\"', '"').replace('\\n', ' ').replace('\\t', ' ').strip()
+        if '"_meta"' in s and 'embedded run' not in s and 'lane ' not in s and 'sendMessage ok' not in s:
+            return ''
+    replacements = [
+        (r"embedded run tool start:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool started: \1"),
+        (r"embedded run tool end:.*tool=([a-zA-Z0-9_-]+).*$", r"Tool finished: \1"),
+        (r"embedded run done:.*aborted=(true|false).*$", r"Run finished (aborted=\1)"),
+        (r"lane enqueue: lane=([^\s]+).*$", r"Queued: \1"),
+        (r"lane dequeue: lane=([^\s]+).*$", r"Started: \1"),
+        (r"lane task done: lane=([^\s]+).*$", r"Completed: \1"),
+        (r"telegram sendMessage ok chat=([^\s]+).*$", r"Telegram sent to chat \1"),
+    ]
+    for pattern, repl in replacements:
+        m = re.search(pattern, s)
+        if m:
+            return re.sub(pattern, repl, s)
+    if len(s) > 220:
+        s = s[:220] + "…"
+    return s
+
+
+def legacy_parse(line, unwrap_json):
+    """The old per-line body of get_openclaw_logs()."""
+    line = line.strip()
+    if not line:
+        return None
+    m = re.match(r"^(\S+)\s+(\w+)\s+\[([^\]]+)\]\s+(.*)$", line)
+    if m:
+        ts, level, subsystem, msg = m.groups()
+        keep = level.lower() in {"error", "warn"}
+        if not keep:
+            keep = any(k in msg for k in [
+                "lane task done", "lane enqueue", "lane dequeue",
+                "embedded run", "sendMessage ok", "failed", "timeout"
+            ])
+        if not keep:
+            return None
+        summary = legacy_summarize(msg, unwrap_json)
+        if unwrap_json and not summary:
+            return None
+        return {'time': ts, 'level': level.lower(), 'subsystem': subsystem, 'message': f"[{subsystem}] {summary}"}
+    summary = legacy_summarize(line, unwrap_json)
+    if unwrap_json and not summary:
+        return None
+    return {'time': '', 'level': '', 'subsystem': '', 'message': summary}
+
+
+def rate(func, lines):
+    started = time.perf_counter()
+    out = [func(line) for line in lines]
+    return len(lines) / (time.perf_counter() - started), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--app', default='app_stdlib', choices=['app_stdlib', 'app'])
+    args = parser.parse_args()
+
+    module = importlib.import_module(args.app)
+    unwrap_json = args.app == 'app'
+    lines = list(iter_log_lines(count=args.lines))
+
+    # Summarizer alone, on every message (worst case: no keep filter in front)
+    messages = [line.split('] ', 1)[-1] for line in lines]
+    # Lines several rules match, with the later rule's match further left: list order must still win
+    messages += [
+        'lane enqueue: lane=session:1 then embedded run tool start: runId=r1 tool=exec',
+        'telegram sendMessage ok chat=42 after lane task done: lane=session:2',
+        'lane dequeue: lane=session:3 embedded run done: runId=r2 aborted=false',
+        'embedded run tool end: runId=r3 tool=read; embedded run tool start: runId=r4 tool=write',
+    ]
+    before_sum, legacy_out = rate(lambda m: legacy_summarize(m, unwrap_json), messages)
+    after_sum, new_out = rate(module._summarize_log_message, messages)
+    if legacy_out != new_out:
+        raise SystemExit('summaries differ between legacy and rule engine')
+
+    # Full per-line parse as used by the tailer
+    before_parse, legacy_events = rate(lambda line: legacy_parse(line, unwrap_json), lines)
+    after_parse, new_events = rate(module._parse_log_line, lines)
+    if legacy_events != new_events:
+        raise SystemExit('parsed events differ between legacy and rule engine')
+
+    print(json.dumps({
+        'app': args.app,
+        'lines': len(lines),
+        'summarize': {'beforeLinesPerSec': int(before_sum), 'afterLinesPerSec': int(after_sum),
+                      'speedup': round(after_sum / before_sum, 2)},
+        'parseLine': {'beforeLinesPerSec': int(before_parse), 'afterLinesPerSec': int(after_parse),
+                      'speedup': round(after_parse / before_parse, 2)},
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
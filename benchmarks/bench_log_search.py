@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Log search benchmark: FTS5 ingest rate and /api/logs/search query latency.
+Writes a synthetic log, indexes it with LogIndex into a temporary database
+(then appends more lines to show the incremental pass), and times typical
+searches: free text, level and subsystem filters, time ranges and a second page.
+
+Usage: python3 benchmarks/bench_log_search.py [--size-mb 300] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import iter_log_lines, write_log  # noqa: E402
+from log_index import LogIndex  # noqa: E402
+import app_stdlib  # noqa: E402
+
+
+def time_search(index, repeat, **kwargs):
+    timings = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        results, cursor = index.search(**kwargs)
+        timings.append(time.perf_counter() - t)
+    return {
+        'results': len(results),
+        'hasMore': cursor is not None,
+        'medianMs': round(statistics.median(timings) * 1000, 2),
+        'maxMs': round(max(timings) * 1000, 2),
+    }, cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=300)
+    parser.add_argument('--append-lines', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'openclaw-2026-01-01.log')
+        lines = write_log(log_path, args.size_mb * 1024 * 1024)
+        index = LogIndex(os.path.join(tmp, 'openclaw-*.log'), app_stdlib._index_fields,
+                         path=os.path.join(tmp, 'logs.sqlite3'))
+
+        started = time.perf_counter()
+        indexed = index.index_once()
+        ingest = time.perf_counter() - started
+
+        with open(log_path, 'a') as f:
+            f.writelines(iter_log_lines(args.append_lines, seed=1))
+        started = time.perf_counter()
+        appended = index.index_once()
+        incremental = time.perf_counter() - started
+
+        queries = {
+            'text': {'text': 'timeout'},
+            'rareText': {'text': 'rate limited'},
+            'prefix': {'text': 'sessions_sp*'},
+            'level': {'level': 'error'},
+            'textLevelSubsystem': {'text': 'failed', 'level': 'error,warn', 'subsystem': 'gateway'},
+            'timeRange': {'start': '2026-01-01T00:30:00Z', 'end': '2026-01-01T00:31:00Z'},
+        }
+        results = {}
+        for name, kwargs in queries.items():
+            results[name], cursor = time_search(index, args.repeat, **kwargs)
+            if name == 'text' and cursor:
+                results['textPage2'], _ = time_search(index, args.repeat, cursor=cursor, **kwargs)
+
+        db_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp) if f.startswith('logs.')) / 1e6
+
+    print(json.dumps({
+        'logLines': lines,
+        'indexedLines': indexed,
+        'ingestLinesPerSec': round(indexed / ingest),
+        'appendedLines': appended,
+        'incrementalMs': round(incremental * 1000, 1),
+        'indexMb': round(db_mb, 1),
+        'queries': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
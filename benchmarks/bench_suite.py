@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Collector and renderer benchmark suite with a regression baseline.
+Generates an openclaw-*.log and sessions.json stores of several sizes, then
+times the log tailer (cold and incremental), the message summarizer, the task
+collector (cold, unchanged store, one changed session) and both dashboard
+renderers. Each result reports the best time, throughput and peak traced
+memory; with --baseline, any result slower or larger than the saved baseline
+by more than the tolerance is listed and the exit status is 1.
+
+Usage: python3 benchmarks/bench_suite.py [--log-mb 64] [--sessions 1000,10000,100000]
+           [--save-baseline bench.json | --baseline bench.json [--tolerance 0.25]]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+WORKDIR = tempfile.mkdtemp(prefix='openclaw-bench-')
+# Keep the apps' session store, history and index files away from the real ~/.openclaw
+os.environ['HOME'] = WORKDIR
+os.environ['OPENCLAW_DASHBOARD_HISTORY'] = os.path.join(WORKDIR, 'history.sqlite3')
+os.environ['OPENCLAW_DASHBOARD_LOG_INDEX'] = os.path.join(WORKDIR, 'logs.sqlite3')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_stdlib  # noqa: E402
+from benchmarks.generators import DEFAULT_LEVEL_MIX, iter_log_lines, write_log, write_sessions_store  # noqa: E402
+from collector_scheduler import Snapshot  # noqa: E402
+from session_model import TaskModel  # noqa: E402
+
+try:
+    import app  # Flask version: session-store task collector and Jinja renderer
+except ImportError:
+    app = None
+
+STORE_PATH = os.path.join(WORKDIR, '.openclaw', 'agents', 'main', 'sessions', 'sessions.json')
+CRON_JOBS = [{'name': f'job-{i}', 'schedule': '*/15 * * * *'} for i in range(25)]
+_versions = itertools.count(1)
+
+
+def measure(func, setup=None, repeat=3, items=None, unit=None):
+    """Best wall time of `repeat` runs, then one traced run for peak memory.
+
+    `setup` runs untimed before each run; `items(result)` counts the work done
+    for the throughput figure. As in timeit, the garbage collector is off while
+    timing, so a collection triggered by earlier garbage doesn't land in a run.
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        result = None
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    out = {'seconds': round(best, 6), 'peakBytes': peak}
+    if items:
+        count = items(result)
+        out.update({'items': count, 'unit': unit, 'perSecond': round(count / best, 1) if best else None})
+    return out
+
+
+def bench_logs(log_dir, args):
+    """Log collector: cold start over the generated file, then polls after appends."""
+    path = os.path.join(log_dir, 'openclaw-2026-01-01.log')
+    level_mix = dict(DEFAULT_LEVEL_MIX, **args.level_mix)
+    gen = {'level_mix': level_mix, 'lane_ratio': args.lane_ratio, 'tool_ratio': args.tool_ratio}
+    print(f"📝 Generating {args.log_mb} MB log ...", file=sys.stderr)
+    lines = write_log(path, args.log_mb * 1024 * 1024, **gen)
+    info = {'fileLines': lines, 'fileBytes': os.path.getsize(path)}
+    appended = iter_log_lines(10 ** 9, seed=7, start=datetime(2026, 1, 2, tzinfo=timezone.utc), **gen)
+    messages = [line.split('] ', 1)[-1] for line in iter_log_lines(args.summarize_lines, seed=3, **gen)]
+
+    def append():
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(itertools.islice(appended, args.append_lines))
+
+    results = {}
+    for name, module in _apps():
+        module.LOG_DIR = log_dir
+
+        def cold():
+            module._log_tailer = None
+        results[f'{name}.logs.cold'] = measure(module.get_openclaw_logs, setup=cold, repeat=args.repeat,
+                                               items=lambda _: module._log_tailer.bytes_read, unit='bytes')
+        module.get_openclaw_logs()
+        results[f'{name}.logs.append'] = measure(module.get_openclaw_logs, setup=append, repeat=args.repeat,
+                                                 items=lambda _: args.append_lines, unit='lines')
+        results[f'{name}.summarize'] = measure(lambda: [module._summarize_log_message(m) for m in messages],
+                                               repeat=args.repeat, items=len, unit='lines')
+    return info, results
+
+
+def _fresh_task_model():
+    if app is not None:
+        app._session_store = None
+        app.task_model = TaskModel(app._describe_task, app.TASK_STAGES, statuses=app.TASK_STATUSES)
+        return app.get_subagents_list
+    # Without Flask, run the same store reader and task model with the stdlib describer
+    from session_store import SessionStoreCache
+    store = SessionStoreCache(STORE_PATH, key_filter=lambda key: 'subagent' in key)
+    model = TaskModel(app_stdlib._describe_task, app_stdlib.TASK_STAGES, statuses=app_stdlib.TASK_STATUSES)
+
+    def collect():
+        model.sync(store.load())
+        tasks, stats = model.view()
+        return tasks, None, stats
+    collect.model = model
+    return collect
+
+
+def _touch_one_session():
+    """Bump one session's updatedAt in place, as the agent does when a task reports progress."""
+    with open(STORE_PATH, 'r+', encoding='utf-8') as f:
+        text = f.read()
+        at = text.index('"updatedAt": ', text.index(':subagent:')) + len('"updatedAt": ')
+        end = text.index(',', at)
+        f.seek(at)
+        f.write(str(int(text[at:end]) + 1).rjust(end - at))
+    st = os.stat(STORE_PATH)
+    os.utime(STORE_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def bench_tasks(count, args):
+    """Task collector over a store of `count` sessions."""
+    print(f"📝 Generating sessions.json with {count} sessions ...", file=sys.stderr)
+    write_sessions_store(STORE_PATH, count, int(time.time() * 1000), aborted_ratio=args.aborted_ratio)
+    state = {}
+
+    def cold():
+        state['collect'] = _fresh_task_model()
+
+    def tasks_in(result):
+        return len(result[0])
+
+    results = {'storeBytes': os.path.getsize(STORE_PATH)}
+    results['cold'] = measure(lambda: state['collect'](), setup=cold, repeat=args.repeat,
+                              items=tasks_in, unit='tasks')
+    results['unchanged'] = measure(lambda: state['collect'](), repeat=args.repeat, items=tasks_in, unit='tasks')
+    results['oneChanged'] = measure(lambda: state['collect'](), setup=_touch_one_session, repeat=args.repeat,
+                                    items=tasks_in, unit='tasks')
+    tasks, _, stats = state['collect']()
+    model = app.task_model if app is not None else state['collect'].model
+
+    def invalidate():
+        model._view = None  # forces the list and the status-count copy to be rebuilt
+
+    # calculate_stats() is gone: counts are kept by the task model, so this times handing out a new view
+    results['stats'] = measure(model.view, setup=invalidate, repeat=args.repeat,
+                               items=lambda view: sum(view[1].values()), unit='tasks')
+    if sum(stats.values()) != len(tasks):
+        raise AssertionError(f"status counts {stats} do not add up to {len(tasks)} tasks")
+    return results, state['collect']()
+
+
+def bench_render(logs, tasks, args):
+    """Both renderers on a fresh snapshot per run, so no page or panel cache is hit."""
+    values = {'logs': logs, 'tasks': tasks, 'cron_jobs': CRON_JOBS,
+              'codex_usage': None, 'openclaw_usage': None}
+    state = {}
+
+    def fresh():
+        state['snap'] = Snapshot(next(_versions), values, epoch='bench')
+
+    results = {}
+    if app is not None:
+        def render_flask():
+            with app.app.app_context():
+                return app.render_dashboard(state['snap'])
+        results['app.render'] = measure(render_flask, setup=fresh, repeat=args.repeat,
+                                        items=len, unit='bytes')
+    results['app_stdlib.render'] = measure(lambda: app_stdlib.get_dashboard_html(state['snap']), setup=fresh,
+                                           repeat=args.repeat, items=len, unit='bytes')
+    return results
+
+
+def _apps():
+    yield 'app_stdlib', app_stdlib
+    if app is not None:
+        yield 'app', app
+
+
+def flatten(results):
+    """{'group.name': {'seconds', 'peakBytes'}} for every timed result."""
+    flat = {}
+    for name, value in results.items():
+        if isinstance(value, dict) and 'seconds' in value:
+            flat[name] = value
+        elif isinstance(value, dict):
+            flat.update({f'{name}.{k}': v for k, v in flatten(value).items()})
+    return flat
+
+
+def compare(results, baseline, tolerance, memory_tolerance, floors=(0.002, 256 * 1024)):
+    """Lines describing each result against the baseline, and whether any regressed.
+
+    Growth under `floors` (seconds, bytes) is ignored: a 20 µs result is
+    dominated by noise, so relative tolerances alone would flap.
+    """
+    current, saved = flatten(results), flatten(baseline.get('results', {}))
+    lines, regressed = [], False
+    for name in sorted(saved):
+        if name not in current:
+            lines.append(f"⚠️  {name}: in the baseline but not run")
+            continue
+        for field, limit, floor in zip(('seconds', 'peakBytes'), (tolerance, memory_tolerance), floors):
+            old, new = saved[name].get(field), current[name].get(field)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + limit and new - old > floor:
+                regressed = True
+                lines.append(f"❌ {name} {field}: {old} -> {new} ({ratio:.2f}x, limit {1 + limit:.2f}x)")
+            else:
+                lines.append(f"✅ {name} {field}: {ratio:.2f}x")
+    return lines, regressed
+
+
+def _level_mix(value):
+    """Parse 'error=0.1,warn=0.2' into a dict."""
+    mix = {}
+    for part in filter(None, value.split(',')):
+        level, _, weight = part.partition('=')
+        mix[level.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--log-mb', type=int, default=64)
+    parser.add_argument('--level-mix', type=_level_mix, default={}, help="e.g. 'error=0.2,debug=0.4'")
+    parser.add_argument('--lane-ratio', type=float, default=0.3)
+    parser.add_argument('--tool-ratio', type=float, default=0.2)
+    parser.add_argument('--append-lines', type=int, default=20000, help='lines appended before each poll')
+    parser.add_argument('--summarize-lines', type=int, default=100000)
+    parser.add_argument('--sessions', default='1000,10000,100000',
+                        help='comma-separated store sizes (up to 500000)')
+    parser.add_argument('--aborted-ratio', type=float, default=0.04)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', help='compare against this saved report')
+    parser.add_argument('--save-baseline', help='write the report here as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown (0.25 = 25%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='allowed peak memory growth')
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sessions.split(',') if n]
+    os.makedirs(os.path.dirname(STORE_PATH))
+    os.makedirs(os.path.join(WORKDIR, 'logs'))
+    try:
+        log_info, results = bench_logs(os.path.join(WORKDIR, 'logs'), args)
+        tasks = None
+        for count in sizes:
+            results[f'tasks.{count}'], tasks = bench_tasks(count, args)
+        if tasks is None:
+            tasks = ([], None, dict.fromkeys(app_stdlib.TASK_STATUSES, 0))
+        logs = app_stdlib.get_openclaw_logs()
+        results.update(bench_render(logs, tasks, args))
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+    report = {
+        'python': sys.version.split()[0],
+        'flask': app is not None,
+        'log': log_info,
+        'renderSessions': sizes[-1] if sizes else 0,
+        'results': results,
+        'note': 'warm page cache; best of --repeat runs; peakBytes from one tracemalloc run',
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressed = compare(results, baseline, args.tolerance, args.memory_tolerance)
+        print('\n'.join(lines), file=sys.stderr)
+        if regressed:
+            print(f"❌ Regression against {args.baseline}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Within tolerance of {args.baseline}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generators for dashboard benchmarks.
+Produces OpenClaw-style log files in the `ISO level [subsystem] message` format
+the collectors parse, and sessions.json stores shaped like the agent's own.
+"""
+
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_LEVEL_MIX = {'debug': 0.55, 'info': 0.35, 'warn': 0.07, 'error': 0.03}
+SUBSYSTEMS = ['gateway', 'agent', 'lane', 'telegram', 'cron', 'tools', 'sessions']
+TOOLS = ['read', 'write', 'exec', 'browser', 'web_search', 'memory_get', 'sessions_spawn']
+LANES = ['main', 'subagent', 'cron', 'session:agent:main:telegram:group:42']
+
+
+def _lane_message(rng):
+    lane = rng.choice(LANES)
+    kind = rng.choice(['enqueue', 'dequeue', 'task done'])
+    if kind == 'task done':
+        return f"lane task done: lane={lane} durationMs={rng.randint(5, 90000)} active=0 queued=0"
+    return f"lane {kind}: lane={lane} queueSize={rng.randint(0, 4)}"
+
+
+def _tool_message(rng):
+    run_id = f"{rng.getrandbits(64):016x}"
+    tool = rng.choice(TOOLS)
+    kind = rng.choice(['tool start', 'tool end', 'done'])
+    if kind == 'done':
+        return f"embedded run done: runId={run_id} sessionId={run_id[:8]} durationMs={rng.randint(100, 600000)} aborted={rng.choice(['false', 'false', 'true'])}"
+    return f"embedded run {kind}: runId={run_id} tool={tool} toolCallId=call_{run_id[:10]}"
+
+
+def _noise_message(rng):
+    choice = rng.random()
+    if choice < 0.2:
+        return f'{{"0":"{{\\"subsystem\\":\\"gateway/ws\\"}}","1":"res ✓ chat.history {rng.randint(1, 900)}ms","_meta":{{"runtime":"node"}}}}'
+    if choice < 0.3:
+        return f"telegram sendMessage ok chat={rng.randint(-10**12, -10**11)} message={rng.randint(1, 99999)}"
+    words = ['heartbeat', 'config', 'reload', 'model', 'cache', 'hit', 'ws', 'connected', 'skills', 'snapshot']
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(4, 24))) + f" id={rng.getrandbits(48):012x}"
+
+
+def _error_message(rng):
+    return rng.choice([
+        f"tool exec failed: exit code {rng.randint(1, 127)}",
+        f"request timeout after {rng.randint(5, 120)}s",
+        "gateway connection reset by peer",
+        f"model call failed: 429 rate limited (retry in {rng.randint(1, 60)}s)",
+    ])
+
+
+def iter_log_lines(count=None, level_mix=None, lane_ratio=0.08, tool_ratio=0.06,
+                   start=None, step_ms=250, seed=0):
+    """Yield synthetic log lines (with trailing newline) in timestamp order.
+
+    `lane_ratio` and `tool_ratio` are the fraction of lane lifecycle and embedded
+    run/tool events; the rest are noise lines at levels drawn from `level_mix`.
+    Runs forever when `count` is None.
+    """
+    rng = random.Random(seed)
+    mix = level_mix or DEFAULT_LEVEL_MIX
+    levels, weights = zip(*mix.items())
+    ts = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(milliseconds=step_ms)
+    n = 0
+    while count is None or n < count:
+        ts += step
+        r = rng.random()
+        if r < lane_ratio:
+            level, msg = 'debug', _lane_message(rng)
+        elif r < lane_ratio + tool_ratio:
+            level, msg = 'info', _tool_message(rng)
+        else:
+            level = rng.choices(levels, weights)[0]
+            msg = _error_message(rng) if level in ('warn', 'error') else _noise_message(rng)
+        yield f"{ts.isoformat(timespec='milliseconds').replace('+00:00', 'Z')} {level} [{rng.choice(SUBSYSTEMS)}] {msg}\n"
+        n += 1
+
+
+def write_log(path, size_bytes, **kwargs):
+    """Write a synthetic log of roughly `size_bytes` to `path`; returns the line count.
+
+    Large targets are produced by repeating a generated block, so a multi-GB file
+    takes seconds rather than minutes; timestamps repeat across blocks.
+    """
+    block_lines = list(iter_log_lines(count=20000, **kwargs))
+    block = ''.join(block_lines).encode('utf-8')
+    written = 0
+    lines = 0
+    with open(path, 'wb') as f:
+        while written + len(block) <= size_bytes:
+            f.write(block)
+            written += len(block)
+            lines += len(block_lines)
+        for line in block_lines:
+            raw = line.encode('utf-8')
+            if written + len(raw) > size_bytes:
+                break
+            f.write(raw)
+            written += len(raw)
+            lines += 1
+    return lines
+
+
+MODELS = ['openai-codex/gpt-5.3-codex', 'lmstudio/qwen3-coder-30b', 'minimax/MiniMax-M2.5', 'anthropic/claude-sonnet-4-5']
+SESSION_KINDS = {'subagent': 0.85, 'telegram:group': 0.08, 'telegram:slash': 0.04, 'cron': 0.03}
+
+
+def iter_sessions(count, now_ms, max_age_ms=3 * 86400 * 1000, aborted_ratio=0.04, padding=300, seed=0):
+    """Yield (key, entry) pairs for a synthetic session store, as the agent writes them.
+
+    Session kinds follow SESSION_KINDS (only subagent sessions become tasks);
+    ages are skewed towards recent activity. `padding` adds that many bytes of
+    fields the dashboard ignores (delivery context, skills snapshot) per entry.
+    """
+    rng = random.Random(seed)
+    kinds, weights = zip(*SESSION_KINDS.items())
+    filler = 'x' * padding
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        age = int(max_age_ms * rng.random() ** 3)
+        entry = {
+            'sessionId': session_id,
+            'updatedAt': now_ms - age,
+            'model': rng.choice(MODELS),
+            'abortedLastRun': rng.random() < aborted_ratio,
+            'inputTokens': rng.randint(0, 400000),
+            'outputTokens': rng.randint(0, 60000),
+            'totalTokens': rng.randint(1000, 460000),
+            'contextTokens': 400000,
+            'deliveryContext': {'channel': 'telegram', 'to': f"telegram:{rng.randint(10**8, 10**9)}"},
+            'skillsSnapshot': {'prompt': filler, 'skills': [{'name': t} for t in TOOLS[:rng.randint(1, len(TOOLS))]]},
+        }
+        if kind == 'subagent':
+            entry['label'] = f"{rng.choice(['review', 'fix', 'summarize', 'research', 'draft'])} task {rng.randint(1, 9999)}"
+            entry['spawnedBy'] = rng.choice(['agent:main:main', 'agent:main:telegram:group:42'])
+        yield f"agent:main:{kind}:{session_id}", entry
+
+
+def write_sessions_store(path, count, now_ms, **kwargs):
+    """Write a sessions.json of `count` entries to `path` (streamed, one entry at a time)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for i, (key, entry) in enumerate(iter_sessions(count, now_ms, **kwargs)):
+            f.write(',\n' if i else '\n')
+            f.write(f"  {json.dumps(key)}: {json.dumps(entry)}")
+        f.write('\n}\n')
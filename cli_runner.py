@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Single-flight runner for the CLI commands behind the dashboard.
+Calls are keyed by argv: concurrent callers of the same command share one
+subprocess, and a finished result is reused for a short TTL, so collectors,
+probes and requests asking for the same data fork it once. A per-command
+circuit breaker stops spawning a command that keeps failing or hanging, and a
+global cap bounds how many CLI processes run at once.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import subprocess
+import threading
+import time
+
+DEFAULT_TTL = 5.0  # seconds a finished result is reused for the same argv
+MAX_PROCESSES = 4  # CLI subprocesses allowed to run at once, across all commands
+FAILURE_THRESHOLD = 3  # consecutive failures (error, timeout or non-zero exit) that open a circuit; a missing binary isn't one
+BASE_COOLDOWN = 15.0  # seconds a circuit stays open the first time; doubles on each re-open
+MAX_COOLDOWN = 300.0
+COUNTERS = ('runs', 'coalesced', 'cached', 'rejected', 'timeouts', 'errors')
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of running a command whose circuit is open."""
+
+
+class CommandError(RuntimeError):
+    """A command ran but exited non-zero."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Breaker:
+    def __init__(self):
+        self.failures = 0  # consecutive
+        self.opens = 0  # consecutive re-opens, drives the backoff
+        self.open_until = 0.0
+
+    def is_open(self, now):
+        return now < self.open_until
+
+    def record(self, ok, now):
+        if ok:
+            self.failures = self.opens = 0
+            self.open_until = 0.0
+            return
+        self.failures += 1
+        # A failed trial after a cooldown re-opens straight away
+        if self.failures >= FAILURE_THRESHOLD or self.opens:
+            self.opens += 1
+            self.open_until = now + min(MAX_COOLDOWN, BASE_COOLDOWN * 2 ** (self.opens - 1))
+
+
+class CommandRunner:
+    """subprocess.run(argv, capture_output=True, text=True) with per-argv coalescing.
+
+    `counts` maps each command to how often it was actually run, joined an
+    in-flight run ("coalesced"), was answered from the TTL cache ("cached"), or
+    was refused by its open circuit ("rejected"), plus how many runs timed out
+    ("timeouts") or failed to start ("errors"); `exit_codes` counts completed
+    runs per command by exit status. Exceptions (timeouts, missing binaries)
+    are shared with waiting callers but not cached; completed runs are cached
+    whatever their exit status.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_processes=MAX_PROCESSES):
+        self.ttl = ttl
+        self.counts = {}
+        self.exit_codes = {}
+        self._inflight = {}
+        self._results = {}
+        self._breakers = {}
+        self._slots = threading.BoundedSemaphore(max_processes)
+        self._lock = threading.Lock()
+
+    def _count(self, key, field):
+        counts = self.counts.setdefault(' '.join(key), dict.fromkeys(COUNTERS, 0))
+        counts[field] += 1
+
+    def run(self, argv, timeout=10):
+        """Run `argv` (or join/reuse an identical run) and return its CompletedProcess.
+
+        Raises CircuitOpenError while the command is cooling down after repeated
+        failures, and subprocess.TimeoutExpired if no process slot frees up in time.
+        """
+        key = tuple(argv)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.ttl:
+                self._count(key, 'cached')
+                return cached[1]
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                breaker = self._breakers.setdefault(key, _Breaker())
+                if breaker.is_open(time.monotonic()):
+                    self._count(key, 'rejected')
+                    raise CircuitOpenError(
+                        f"'{' '.join(key)}' paused after {breaker.failures} consecutive failures"
+                    )
+                call = self._inflight[key] = _Call()
+                self._count(key, 'runs')
+            else:
+                self._count(key, 'coalesced')
+
+        if not leader:
+            call.done.wait()
+        else:
+            self._execute(key, call, timeout)
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def output(self, argv, timeout=10):
+        """Like run(), but return stdout and raise CommandError on a non-zero exit."""
+        result = self.run(argv, timeout)
+        if result.returncode != 0:
+            err = (result.stderr or result.stdout or '').strip()
+            raise CommandError(f"'{' '.join(argv)}' exited with {result.returncode}: {err[:140]}")
+        return result.stdout
+
+    def _execute(self, key, call, timeout):
+        started = time.monotonic()
+        slot = self._slots.acquire(timeout=timeout)
+        try:
+            if not slot:
+                # Host is busy with other commands; not this command's fault
+                call.error = subprocess.TimeoutExpired(list(key), timeout)
+            else:
+                remaining = max(0.1, timeout - (time.monotonic() - started))
+                try:
+                    call.result = subprocess.run(list(key), capture_output=True, text=True, timeout=remaining)
+                except Exception as e:
+                    call.error = e
+        finally:
+            if slot:
+                self._slots.release()
+            with self._lock:
+                del self._inflight[key]
+                # A missing binary fails instantly and callers treat it as "not installed", so it
+                # must keep raising FileNotFoundError rather than turn into CircuitOpenError
+                if slot and not isinstance(call.error, FileNotFoundError):
+                    ok = call.error is None and call.result.returncode == 0
+                    self._breakers[key].record(ok, time.monotonic())
+                if call.error is None:
+                    self._results[key] = (time.monotonic(), call.result)
+                    codes = self.exit_codes.setdefault(' '.join(key), {})
+                    codes[call.result.returncode] = codes.get(call.result.returncode, 0) + 1
+                else:
+                    self._count(key, 'timeouts' if isinstance(call.error, subprocess.TimeoutExpired) else 'errors')
+            call.done.set()
+
+    def stats(self):
+        """Totals plus per-command counters, exit statuses and circuit state."""
+        now = time.monotonic()
+        with self._lock:
+            commands = {cmd: dict(c) for cmd, c in self.counts.items()}
+            for cmd, codes in self.exit_codes.items():
+                commands[cmd]['exitCodes'] = {str(code): n for code, n in sorted(codes.items())}
+            for key, breaker in self._breakers.items():
+                entry = commands.get(' '.join(key))
+                if entry is not None:
+                    entry['circuit'] = 'open' if breaker.is_open(now) else 'closed'
+                    entry['failures'] = breaker.failures
+        totals = {field: sum(c[field] for c in commands.values()) for field in COUNTERS}
+        return dict(totals, commands=commands)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Background collector scheduler for the OpenClaw dashboard.
+Runs each collector on its own interval and publishes the results into a
+versioned in-memory snapshot, so request handlers never call collectors inline.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import secrets
+import threading
+import time
+import zlib
+
+DEFAULT_DEADLINE = 3.0  # seconds a request will wait for a collector's first result
+
+
+class Snapshot:
+    """Immutable view of the latest published collector results.
+
+    `partial` names collectors that have not published yet (their registered
+    default is shown instead); `stale` names collectors whose last good result
+    is still shown because a refresh overran interval + deadline or failed.
+    `errors` maps failing collectors to their last error. `changed_at` is when
+    the version last moved.
+    """
+
+    def __init__(self, version=0, values=None, updated_at=None, partial=(), stale=(),
+                 epoch='', changed_at=None, errors=None):
+        self.version = version
+        self.values = dict(values or {})
+        self.updated_at = dict(updated_at or {})
+        self.partial = frozenset(partial)
+        self.stale = frozenset(stale)
+        self.errors = dict(errors or {})
+        self.epoch = epoch
+        self.changed_at = time.time() if changed_at is None else changed_at
+
+    @property
+    def tag(self):
+        """Opaque content version; differs whenever anything rendered from this snapshot differs."""
+        tag = f"{self.epoch}-{self.version}"
+        if self.partial or self.stale or self.errors:
+            flags = f"{sorted(self.partial)}{sorted(self.stale)}{sorted(self.errors.items())}".encode('utf-8')
+            tag += f"-{zlib.crc32(flags):08x}"
+        return tag
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+    def age(self, name):
+        """Seconds since the collector last published, or None if it never has."""
+        ts = self.updated_at.get(name)
+        return None if ts is None else max(0.0, time.time() - ts)
+
+
+class _Collector:
+    def __init__(self, name, func, interval, deadline, default):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.deadline = deadline
+        self.default = default
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.thread = None
+        self.error = None  # last failure, cleared by the next success
+
+
+class CollectorScheduler:
+    """Runs registered collectors on background threads and keeps the latest snapshot.
+
+    `observe(name, seconds, error)`, if given, is called after every collector
+    run with its duration and the error it raised (None on success).
+    """
+
+    def __init__(self, observe=None):
+        self.observe = observe
+        self._collectors = {}
+        self._publish_lock = threading.Lock()
+        self._changed = threading.Condition(self._publish_lock)
+        self._start_lock = threading.Lock()
+        # Distinguishes versions of this process from those of a previous run
+        self.epoch = secrets.token_hex(4)
+        self._snapshot = Snapshot(epoch=self.epoch)
+        self._stop = threading.Event()
+        self._started = False
+
+    def register(self, name, func, interval, deadline=DEFAULT_DEADLINE, default=None):
+        """Register a zero-argument collector to run every `interval` seconds.
+
+        `deadline` bounds how long a request waits for the first result;
+        `default` is served in its place until the collector publishes.
+        """
+        self._collectors[name] = _Collector(name, func, interval, deadline, default)
+
+    def start(self):
+        """Start one daemon thread per collector; all run immediately and in parallel."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            self._stop.clear()
+            for c in self._collectors.values():
+                c.thread = threading.Thread(
+                    target=self._loop, args=(c,), name=f"collector-{c.name}", daemon=True
+                )
+                c.thread.start()
+
+    def stop(self):
+        with self._start_lock:
+            self._stop.set()
+            self._started = False
+
+    def _loop(self, c):
+        while not self._stop.is_set():
+            self.run_once(c.name)
+            self._stop.wait(c.interval)
+
+    def run_once(self, name):
+        """Run one collector now and publish its result.
+
+        A collector signals a failed refresh by raising; its last good value
+        keeps being served (marked stale) and the error is reported.
+        """
+        c = self._collectors[name]
+        with c.lock:
+            started = time.perf_counter()
+            try:
+                value = c.func()
+            except Exception as e:
+                c.error = str(e) or type(e).__name__
+                if self.observe is not None:
+                    self.observe(name, time.perf_counter() - started, e)
+                # Don't hold cold-start requests for a collector that already failed
+                c.ready.set()
+                return
+            if self.observe is not None:
+                self.observe(name, time.perf_counter() - started, None)
+            c.error = None
+            self.publish(name, value)
+
+    def publish(self, name, value):
+        """Publish a collector result; the version only moves when the value changes."""
+        with self._changed:
+            current = self._snapshot
+            changed = name not in current.values or current.values[name] != value
+            values = dict(current.values)
+            values[name] = value
+            updated_at = dict(current.updated_at)
+            updated_at[name] = time.time()
+            self._snapshot = Snapshot(
+                current.version + 1 if changed else current.version, values, updated_at,
+                epoch=self.epoch, changed_at=time.time() if changed else current.changed_at
+            )
+            if changed:
+                self._changed.notify_all()
+        c = self._collectors.get(name)
+        if c is not None:
+            c.ready.set()
+
+    def update(self, name, func):
+        """Publish func(current value) for a collector without running it.
+
+        Serialized with the collector's own runs, so a value derived from the
+        last result can't overwrite a newer one. Skipped until it has published.
+        """
+        c = self._collectors[name]
+        with c.lock:
+            current = self._snapshot.values
+            if name in current:
+                self.publish(name, func(current[name]))
+
+    def wait_for_change(self, version, timeout=None):
+        """Block until the published version differs from `version` (or timeout); True if it did."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._snapshot.version != version, timeout)
+
+    def snapshot(self):
+        """Return the latest snapshot without blocking on collectors that already published.
+
+        On a cold start the collector threads are fanned out in parallel and the
+        caller waits at most each collector's own deadline, so the wait is bounded
+        by the slowest deadline rather than the sum of every collector's runtime.
+        """
+        self.start()
+        snap = self._snapshot
+        missing = [c for c in self._collectors.values() if c.name not in snap.values]
+        if missing:
+            started = time.monotonic()
+            for c in missing:
+                c.ready.wait(max(0.0, started + c.deadline - time.monotonic()))
+            snap = self._snapshot
+
+        now = time.time()
+        errors = {c.name: c.error for c in self._collectors.values() if c.error is not None}
+        partial = [c.name for c in self._collectors.values() if c.name not in snap.values]
+        stale = [
+            c.name for c in self._collectors.values()
+            if c.name in snap.updated_at
+            and (c.name in errors or now - snap.updated_at[c.name] > c.interval + c.deadline)
+        ]
+        if not partial and not stale and not errors:
+            return snap
+
+        values = dict(snap.values)
+        for name in partial:
+            values[name] = self._collectors[name].default
+        return Snapshot(snap.version, values, snap.updated_at, partial, stale,
+                        epoch=snap.epoch, changed_at=snap.changed_at, errors=errors)
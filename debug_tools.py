@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+On-demand diagnostics behind the /debug/* endpoints of a running dashboard.
+/debug/profile samples every thread's Python stack with sys._current_frames()
+for the requested number of seconds and returns collapsed stacks (for flame
+graphs) or pstats output. /debug/memory starts and stops tracemalloc, lists the
+top allocation sites and diffs named snapshots; while it traces, each collector
+run's peak allocation is recorded. Nothing is hooked or running until asked for.
+The endpoints are disabled unless OPENCLAW_DASHBOARD_DEBUG_TOKEN is set, and
+then require it as a bearer token.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import hmac
+import io
+import json
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEBUG_TOKEN = os.environ.get('OPENCLAW_DASHBOARD_DEBUG_TOKEN', '')
+PROFILE_INTERVAL = 0.005  # seconds between stack samples
+DEFAULT_PROFILE_SECONDS = 10
+MAX_PROFILE_SECONDS = 120
+PSTATS_LINES = 60  # functions listed in format=text
+TRACE_FRAMES = 10  # frames kept per traced allocation (?frames= overrides)
+MAX_SNAPSHOTS = 8  # named tracemalloc snapshots kept for comparisons
+DEFAULT_TOP = 25
+
+# Leaf frames of threads that are parked rather than working; dropped unless ?idle=1
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'readinto'),
+    ('socketserver.py', 'serve_forever'),
+}
+_THREAD_NUMBER = re.compile(r'-\d+\b')
+
+
+def _json(status, data):
+    return status, 'application/json', json.dumps(data).encode('utf-8')
+
+
+def authorize(authorization, token=None):
+    """None if the request may use /debug endpoints, else a (status, content type, body) error.
+
+    Answers 404 while no debug token is configured, so the endpoints look
+    absent, and 401 for a missing or wrong `Authorization: Bearer` header.
+    """
+    token = DEBUG_TOKEN if token is None else token
+    if not token:
+        return 404, 'text/plain; charset=utf-8', b'Not found'
+    scheme, _, supplied = (authorization or '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(supplied.strip().encode(), token.encode()):
+        return _json(401, {'error': 'a valid debug token is required (Authorization: Bearer ...)'})
+    return None
+
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _func(code):
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+class _SampledStats:
+    """pstats-loadable profile built from stack samples; times are samples x interval."""
+
+    def __init__(self, samples, interval):
+        calls, own, total, callers = Counter(), Counter(), Counter(), {}
+        for (_, stack), count in samples.items():
+            funcs = [_func(code) for code in stack]
+            own[funcs[-1]] += count
+            for func in set(funcs):
+                calls[func] += count
+                total[func] += count
+            for pair in set(zip(funcs, funcs[1:])):
+                callers.setdefault(pair[1], Counter())[pair[0]] += count
+        self.stats = {
+            func: (n, n, own[func] * interval, total[func] * interval,
+                   {caller: (c, c, 0.0, c * interval) for caller, c in callers.get(func, {}).items()})
+            for func, n in calls.items()
+        }
+
+    def create_stats(self):
+        pass
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler over all threads; one profile runs at a time."""
+
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self._running = threading.Lock()
+
+    def sample(self, seconds, idle=False):
+        """Counter of (thread name, stack of code objects root first) -> samples, and the number of ticks."""
+        samples = Counter()
+        me = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        ticks = 0
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if not idle and (os.path.basename(stack[0].co_filename), stack[0].co_name) in IDLE_FRAMES:
+                    continue
+                stack.reverse()
+                # Per-connection threads are numbered; fold them into one root per target
+                name = _THREAD_NUMBER.sub('', names.get(ident, str(ident)))
+                samples[(name, tuple(stack))] += 1
+            ticks += 1
+            time.sleep(self.interval)
+        return samples, ticks
+
+    def api(self, params):
+        """(status, content type, body) for /debug/profile given its query parameters.
+
+        Parameters: seconds (default 10, at most 120), format (collapsed, text
+        or pstats) and idle=1 to keep samples of parked threads.
+        """
+        try:
+            seconds = float(params.get('seconds') or DEFAULT_PROFILE_SECONDS)
+        except ValueError:
+            return _json(400, {'error': 'seconds must be a number'})
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return _json(400, {'error': f'seconds must be between 0 and {MAX_PROFILE_SECONDS}'})
+        fmt = params.get('format') or 'collapsed'
+        if fmt not in ('collapsed', 'text', 'pstats'):
+            return _json(400, {'error': 'format must be collapsed, text or pstats'})
+        if not self._running.acquire(blocking=False):
+            return _json(409, {'error': 'a profile is already running'})
+        try:
+            samples, ticks = self.sample(seconds, idle=params.get('idle') in ('1', 'true'))
+        finally:
+            self._running.release()
+
+        if fmt == 'collapsed':
+            lines = [
+                ';'.join([name] + [_label(code) for code in stack]) + f' {count}'
+                for (name, stack), count in sorted(samples.items(), key=lambda item: -item[1])
+            ]
+            return 200, 'text/plain; charset=utf-8', ('\n'.join(lines) + '\n').encode('utf-8')
+        if not samples:
+            return _json(200, {'samples': 0, 'ticks': ticks, 'note': 'no thread was busy while sampling'})
+        stats = pstats.Stats(_SampledStats(samples, self.interval), stream=io.StringIO())
+        if fmt == 'pstats':
+            # The file pstats.Stats() / snakeviz load; dump_stats() only writes to a path
+            return 200, 'application/octet-stream', marshal.dumps(stats.stats)
+        stats.stream.write(f"{sum(samples.values())} samples over {ticks} ticks of {self.interval * 1000:g} ms; "
+                           f"times are samples x interval (wall clock)\n")
+        stats.sort_stats('cumulative').print_stats(PSTATS_LINES)
+        return 200, 'text/plain; charset=utf-8', stats.stream.getvalue().encode('utf-8')
+
+
+def _max_rss():
+    """Peak resident set size of the process in bytes, or None if unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # kilobytes except on macOS
+
+
+def _site(stat, group):
+    frame = stat.traceback[-1]  # tracebacks run oldest to most recent frame
+    site = {'site': frame.filename if group == 'filename' else f"{frame.filename}:{frame.lineno}"}
+    if group == 'traceback':
+        site['traceback'] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+    return site
+
+
+class MemoryTracer:
+    """tracemalloc control, named snapshots and per-collector peak allocation.
+
+    `track(name, func)` wraps a collector. While tracemalloc is tracing, a run
+    records the peak traced bytes above where it started. The peak is
+    process-wide, so only one run is measured at a time. A run that overlaps a
+    measured one is counted as skipped instead of reporting a mixed peak.
+    """
+
+    def __init__(self):
+        self.collectors = {}  # name -> {'runs', 'skipped', 'lastPeakBytes', 'maxPeakBytes'}
+        self._snapshots = OrderedDict()
+        self._measuring = threading.Lock()
+        self._lock = threading.Lock()
+
+    def track(self, name, func):
+        def tracked():
+            if not tracemalloc.is_tracing():
+                return func()
+            if not self._measuring.acquire(blocking=False):
+                self._record(name, None)
+                return func()
+            try:
+                start = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                try:
+                    return func()
+                finally:
+                    if tracemalloc.is_tracing():
+                        self._record(name, max(0, tracemalloc.get_traced_memory()[1] - start))
+            finally:
+                self._measuring.release()
+        return tracked
+
+    def _record(self, name, peak):
+        with self._lock:
+            entry = self.collectors.setdefault(
+                name, {'runs': 0, 'skipped': 0, 'lastPeakBytes': None, 'maxPeakBytes': 0}
+            )
+            if peak is None:
+                entry['skipped'] += 1
+                return
+            entry['runs'] += 1
+            entry['lastPeakBytes'] = peak
+            entry['maxPeakBytes'] = max(entry['maxPeakBytes'], peak)
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def status(self):
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            collectors = {name: dict(entry) for name, entry in self.collectors.items()}
+            snapshots = list(self._snapshots)
+        return {
+            'tracing': tracemalloc.is_tracing(),
+            'frames': tracemalloc.get_traceback_limit(),
+            'tracedBytes': current,
+            'peakTracedBytes': peak,
+            'maxRssBytes': _max_rss(),
+            'snapshots': snapshots,
+            'collectors': collectors,
+        }
+
+    def api(self, params):
+        """(status, content type, body) for /debug/memory given its query parameters.
+
+        action=status (default) | start [frames] | stop | snapshot [name] |
+        top [limit, group] | compare base [to, limit, group]. `group` is lineno
+        (default), filename or traceback; `compare` diffs snapshot `base`
+        against snapshot `to`, or against the current heap.
+        """
+        action = params.get('action') or 'status'
+        try:
+            limit = int(params.get('limit') or DEFAULT_TOP)
+            frames = int(params.get('frames') or TRACE_FRAMES)
+        except ValueError:
+            return _json(400, {'error': 'limit and frames must be numbers'})
+        group = params.get('group') or 'lineno'
+        if group not in ('lineno', 'filename', 'traceback'):
+            return _json(400, {'error': 'group must be lineno, filename or traceback'})
+
+        if action == 'status':
+            return _json(200, self.status())
+        if action == 'start':
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(max(1, min(frames, 100)))
+            return _json(200, self.status())
+        if action == 'stop':
+            # Snapshots can't be compared with a later trace, so they go too
+            tracemalloc.stop()
+            with self._lock:
+                self._snapshots.clear()
+            return _json(200, self.status())
+        if action not in ('snapshot', 'top', 'compare'):
+            return _json(400, {'error': 'action must be status, start, stop, snapshot, top or compare'})
+        if not tracemalloc.is_tracing():
+            return _json(409, {'error': 'tracemalloc is not tracing; start it with action=start'})
+
+        if action == 'snapshot':
+            with self._lock:
+                name = params.get('name') or f"s{len(self._snapshots) + 1}"
+                self._snapshots[name] = self._take()
+                self._snapshots.move_to_end(name)
+                while len(self._snapshots) > MAX_SNAPSHOTS:
+                    self._snapshots.popitem(last=False)
+            return _json(200, dict(self.status(), snapshot=name))
+        if action == 'top':
+            snapshot = self._take()
+            stats = snapshot.statistics(group)
+            return _json(200, {
+                'tracedBytes': sum(stat.size for stat in stats),
+                'top': [dict(_site(stat, group), sizeBytes=stat.size, count=stat.count) for stat in stats[:limit]],
+            })
+
+        with self._lock:
+            base = self._snapshots.get(params.get('base') or '')
+            to = self._snapshots.get(params['to']) if params.get('to') else None
+        if base is None or (params.get('to') and to is None):
+            return _json(404, {'error': 'unknown snapshot', 'snapshots': self.status()['snapshots']})
+        diffs = (to or self._take()).compare_to(base, group)
+        return _json(200, {
+            'base': params['base'],
+            'to': params.get('to') or 'current',
+            'sizeDiffBytes': sum(d.size_diff for d in diffs),
+            'top': [
+                dict(_site(d, group), sizeBytes=d.size, sizeDiffBytes=d.size_diff, count=d.count, countDiff=d.count_diff)
+                for d in diffs[:limit]
+            ],
+        })
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Background data-source probes for the health endpoints.
+Each probe runs on its own daemon thread and stores its last result with the
+time it ran and how long it took; /healthz and /readyz only read those results,
+so a health check never spawns a process on the request path.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import threading
+import time
+
+PROBE_INTERVAL = 30  # seconds between background probes of a source
+MIN_PROBE_INTERVAL = 5  # rate cap: a source is never probed more often than this
+
+
+class ProbeResult:
+    def __init__(self, ok, checked_at, latency, error=None):
+        self.ok = ok
+        self.checked_at = checked_at
+        self.latency = latency
+        self.error = error
+
+    def as_dict(self):
+        return {
+            'ok': self.ok,
+            'ageSeconds': round(max(0.0, time.time() - self.checked_at), 1),
+            'latencyMs': round(self.latency * 1000, 1),
+            'error': self.error,
+        }
+
+
+class _Probe:
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.lock = threading.Lock()
+        self.result = None
+        self.thread = None
+
+
+class HealthProbes:
+    """Runs registered source probes in the background and keeps their last results."""
+
+    def __init__(self, interval=PROBE_INTERVAL, min_interval=MIN_PROBE_INTERVAL):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.started_at = time.time()
+        self._probes = {}
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+
+    def register(self, name, func):
+        """Register a zero-argument probe; it returns truthy if the source is usable."""
+        self._probes[name] = _Probe(name, func)
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            self._stop.clear()
+            for p in self._probes.values():
+                p.thread = threading.Thread(target=self._loop, args=(p,), name=f"probe-{p.name}", daemon=True)
+                p.thread.start()
+
+    def stop(self):
+        with self._start_lock:
+            self._stop.set()
+            self._started = False
+
+    def _loop(self, p):
+        while not self._stop.is_set():
+            self.run_once(p.name)
+            self._stop.wait(self.interval)
+
+    def run_once(self, name):
+        """Probe one source now, unless it was probed within `min_interval`; returns its result."""
+        p = self._probes[name]
+        with p.lock:
+            if p.result is not None and time.time() - p.result.checked_at < self.min_interval:
+                return p.result
+            started = time.monotonic()
+            try:
+                ok, error = bool(p.func()), None
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            p.result = ProbeResult(ok, time.time(), time.monotonic() - started, error)
+            return p.result
+
+    def run_all(self):
+        """Probe every source in parallel (rate-capped); for startup, not for request handlers."""
+        threads = [threading.Thread(target=self.run_once, args=(name,), daemon=True) for name in self._probes]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.results()
+
+    def results(self):
+        """{source: ProbeResult or None if not probed yet}; starts the background probes if needed."""
+        self.start()
+        return {name: p.result for name, p in self._probes.items()}
+
+    def ready(self, required):
+        """True once every source in `required` has been probed and is usable."""
+        results = self.results()
+        return all(results.get(name) is not None and results[name].ok for name in required)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+HTTP conditional-request helpers for snapshot-backed responses.
+Every response rendered from a snapshot carries an ETag (the snapshot tag) and,
+when a date can tell its versions apart, a Last-Modified; a matching
+If-None-Match or If-Modified-Since is answered with 304 before anything is
+rendered or serialized. The ETag is authoritative: If-Modified-Since is only
+consulted without it.
+Bodies are rendered, and gzipped for clients that accept it, once per snapshot
+and shared by every client polling the same version.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+GZIP_LEVEL = 6
+RENDER_HISTORY = 8  # (route, snapshot) bodies kept; only the latest few are ever requested
+
+
+def etag_for(snap, encoding=None):
+    """Strong ETag for the snapshot; each content-coding is a distinct representation."""
+    return f'"{snap.tag}-{encoding}"' if encoding else f'"{snap.tag}"'
+
+
+def _flagged(snap):
+    return bool(snap.partial or snap.stale or snap.errors)
+
+
+def last_modified(snap, now=None):
+    """Last-Modified for `snap` in whole seconds, or None if a date can't validate it.
+
+    HTTP dates have one-second resolution, so a second is only claimed once it
+    has fully passed after the change: a client holding that date fetched after
+    every change up to it. Flagged snapshots (partial, stale, errors) change
+    without their version moving, so they carry no date at all.
+    """
+    if _flagged(snap):
+        return None
+    now = time.time() if now is None else now
+    changed = int(snap.changed_at)
+    return changed + 1 if now >= changed + 1 else changed
+
+
+def validator_headers(snap, encoding=None):
+    """Headers that let clients revalidate instead of re-downloading."""
+    headers = [('ETag', etag_for(snap, encoding))]
+    modified = last_modified(snap)
+    if modified is not None:
+        headers.append(('Last-Modified', formatdate(modified, usegmt=True)))
+    return headers + [
+        # Always revalidate: the snapshot can change at any moment
+        ('Cache-Control', 'no-cache'),
+        ('Vary', 'Accept-Encoding'),
+    ]
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip (explicitly or via *) with a non-zero q."""
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding.strip().lower()] = q
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def negotiate_encoding(accept_encoding):
+    """Content-coding to send for a request's Accept-Encoding: 'gzip' or None (identity)."""
+    return 'gzip' if accepts_gzip(accept_encoding) else None
+
+
+class _Rendered:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.identity = None
+        self.gzip = None
+
+
+class RenderCache:
+    """Response bodies per (route, snapshot tag), rendered and compressed at most once each.
+
+    Concurrent requests for the same version wait for the first one's render
+    instead of repeating it; the gzip form is only built once a client asks for it.
+    `observe(route, seconds)`, if given, is called with the duration of each render.
+    """
+
+    def __init__(self, history=RENDER_HISTORY, observe=None):
+        self.history = history
+        self.observe = observe
+        self.requests = 0
+        self.renders = 0
+        self.compressions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, route, snap):
+        key = (route, snap.tag)
+        with self._lock:
+            self.requests += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Rendered()
+                while len(self._entries) > self.history:
+                    self._entries.popitem(last=False)
+            return entry
+
+    def respond(self, route, snap, render, encoding=None):
+        """Return (body bytes, headers) for `snap`; `render(snap)` returns str or bytes.
+
+        `encoding` is the negotiated content-coding ('gzip' or None); headers are
+        the validators for that representation plus Content-Encoding when set.
+        """
+        entry = self._entry(route, snap)
+        with entry.lock:
+            if entry.identity is None:
+                started = time.perf_counter()
+                body = render(snap)
+                entry.identity = body.encode('utf-8') if isinstance(body, str) else body
+                self.renders += 1
+                if self.observe is not None:
+                    self.observe(route, time.perf_counter() - started)
+            if encoding == 'gzip' and entry.gzip is None:
+                # mtime=0 keeps the bytes identical across processes for the same content
+                entry.gzip = gzip.compress(entry.identity, compresslevel=GZIP_LEVEL, mtime=0)
+                self.compressions += 1
+            body = entry.gzip if encoding == 'gzip' else entry.identity
+        headers = validator_headers(snap, encoding)
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        return body, headers
+
+
+def is_not_modified(snap, if_none_match=None, if_modified_since=None):
+    """True if the client's cached copy still matches `snap` (If-None-Match wins over IMS).
+
+    Either encoding's ETag matches: both represent the same snapshot content.
+    If-Modified-Since matches only if the version changed strictly before the
+    date and the snapshot is unflagged (see last_modified()).
+    """
+    if if_none_match:
+        etags = (etag_for(snap), etag_for(snap, 'gzip'))
+        for candidate in if_none_match.split(','):
+            candidate = candidate.strip()
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+            if candidate == '*' or candidate in etags:
+                return True
+        return False
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+        return not _flagged(snap) and snap.changed_at < since
+    return False
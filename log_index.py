@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Full-text search index over every OpenClaw log line.
+A background thread ingests `openclaw-*.log` files incrementally into SQLite:
+each file's inode and byte offset are stored with the rows they produced, so
+the indexer resumes where it stopped, even across restarts. Messages go into
+an FTS5 table; time, level and subsystem are indexed columns, and results are
+paged newest-first with an opaque cursor.
+Shared by app.py and app_stdlib.py; stdlib only (needs SQLite built with FTS5).
+"""
+
+import contextlib
+import glob
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from paged_lists import decode_cursor, encode_cursor
+
+INDEX_PATH = os.environ.get(
+    'OPENCLAW_DASHBOARD_LOG_INDEX', os.path.expanduser('~/.openclaw/dashboard/logs.sqlite3')
+)
+INDEX_INTERVAL = 5  # seconds between passes over the log files
+READ_CHUNK = 4 * 1024 * 1024  # bytes ingested per transaction
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE,
+    dev INTEGER NOT NULL, ino INTEGER NOT NULL, offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, file INTEGER NOT NULL,
+    ts TEXT NOT NULL, level TEXT NOT NULL, subsystem TEXT NOT NULL, message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_level ON events (level, id);
+CREATE INDEX IF NOT EXISTS events_subsystem ON events (subsystem, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5 (
+    message, content='events', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts (rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+"""
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match; a trailing * makes it a prefix."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms)
+
+
+class LogIndex:
+    """Incremental SQLite FTS5 index of log lines.
+
+    `parse_line(line)` returns (time, level, subsystem, message) for a raw line,
+    or None to skip it. `pattern` is a glob (or a zero-argument callable
+    returning one) for the log files to follow.
+    """
+
+    def __init__(self, pattern, parse_line, path=INDEX_PATH, interval=INDEX_INTERVAL):
+        self.pattern = pattern
+        self.parse_line = parse_line
+        self.path = path
+        self.interval = interval
+        self.error = None
+        self.lines_indexed = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        """Open the database on first use; False (with `error` set) if it can't be opened."""
+        if self._db is not None:
+            return True
+        if self.error and self.error.startswith('search disabled'):
+            return False
+        try:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self.error = f"search disabled: {e}"
+            print(f"⚠️  Log {self.error}", file=sys.stderr)
+            return False
+        self._db = db
+        return True
+
+    def start(self):
+        """Start the background indexer (idempotent)."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='log-index', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._start_lock:
+            self._stop.set()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.index_once()
+            except (OSError, sqlite3.Error) as e:
+                self.error = f"indexing failed: {e}"
+            self._stop.wait(self.interval)
+
+    def index_once(self):
+        """Ingest everything appended to the log files since the last pass; returns lines added."""
+        with self._db_lock:
+            if not self._connect():
+                return 0
+        pattern = self.pattern() if callable(self.pattern) else self.pattern
+        paths = []
+        for path in glob.glob(pattern):
+            try:
+                paths.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+        added = 0
+        # Oldest file first, so row ids follow time across rotated files
+        for _, path in sorted(paths):
+            try:
+                added += self._index_file(path)
+            except FileNotFoundError:
+                continue
+            if self._stop.is_set():
+                break
+        self.error = None
+        return added
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._db.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _index_file(self, path):
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            with self._db_lock:
+                row = self._db.execute('SELECT id, dev, ino, offset FROM files WHERE path = ?', (path,)).fetchone()
+            if row is None or (row[1], row[2]) != (st.st_dev, st.st_ino) or st.st_size < row[3]:
+                # New, replaced or truncated file: forget what it contributed and start over
+                with self._db_lock, self._transaction():
+                    if row is not None:
+                        self._db.execute('DELETE FROM events WHERE file = ?', (row[0],))
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO files (id, path, dev, ino, offset) VALUES (?, ?, ?, ?, 0)',
+                        (row[0] if row else None, path, st.st_dev, st.st_ino)
+                    )
+                    file_id = self._db.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()[0]
+                offset = 0
+            else:
+                file_id, offset = row[0], row[3]
+
+            added = 0
+            f.seek(offset)
+            while not self._stop.is_set():
+                data = f.read(READ_CHUNK)
+                end = data.rfind(b'\n') + 1
+                if end == 0:
+                    if len(data) < READ_CHUNK:
+                        break  # nothing new, or only an unfinished line
+                    end = len(data)  # a single line longer than a chunk: index it in pieces
+                rows = []
+                for raw in data[:end].decode('utf-8', errors='replace').splitlines():
+                    fields = self.parse_line(raw)
+                    if fields is not None:
+                        rows.append((file_id,) + tuple(fields))
+                offset += end
+                # Rows and the offset that produced them commit together, so a restart resumes exactly
+                with self._db_lock, self._transaction():
+                    self._db.executemany(
+                        'INSERT INTO events (file, ts, level, subsystem, message) VALUES (?, ?, ?, ?, ?)', rows
+                    )
+                    self._db.execute('UPDATE files SET offset = ? WHERE id = ?', (offset, file_id))
+                added += len(rows)
+                self.lines_indexed += len(rows)
+                f.seek(offset)
+            return added
+
+    def search(self, text=None, level=None, subsystem=None, start=None, end=None,
+               limit=DEFAULT_LIMIT, cursor=None):
+        """Newest-first matching events and the cursor for the next page (None at the end).
+
+        `text` is matched with FTS5 (all words, `word*` for prefixes); `level` and
+        `subsystem` may be comma-separated lists; `start`/`end` bound the log
+        timestamp (ISO 8601, compared as strings like the log writes them).
+        """
+        clauses, params = [], []
+        if cursor:
+            position = decode_cursor(cursor)
+            if not isinstance(position, dict) or not isinstance(position.get('before'), int):
+                raise ValueError('invalid cursor')
+            clauses.append('e.id < ?')
+            params.append(position['before'])
+        for column, value in (('level', level), ('subsystem', subsystem)):
+            if value:
+                values = [v.strip().lower() if column == 'level' else v.strip() for v in value.split(',')]
+                clauses.append(f"e.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if start:
+            clauses.append('e.ts >= ?')
+            params.append(start)
+        if end:
+            clauses.append('e.ts <= ?')
+            params.append(end)
+        query = fts_query(text or '')
+        if query:
+            sql = ('SELECT e.id, e.ts, e.level, e.subsystem, e.message FROM events_fts '
+                   'JOIN events e ON e.id = events_fts.rowid WHERE events_fts MATCH ?')
+            params.insert(0, query)
+            if clauses:
+                sql += ' AND ' + ' AND '.join(clauses)
+            sql += ' ORDER BY events_fts.rowid DESC LIMIT ?'
+        else:
+            sql = 'SELECT e.id, e.ts, e.level, e.subsystem, e.message FROM events e'
+            if clauses:
+                sql += ' WHERE ' + ' AND '.join(clauses)
+            sql += ' ORDER BY e.id DESC LIMIT ?'
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        params.append(limit + 1)
+        with self._db_lock:
+            if not self._connect():
+                raise sqlite3.OperationalError(self.error)
+            rows = self._db.execute(sql, params).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        results = [{'time': ts, 'level': lvl, 'subsystem': sub, 'message': msg} for _, ts, lvl, sub, msg in rows]
+        next_cursor = encode_cursor({'before': rows[-1][0]}) if more else None
+        return results, next_cursor
+
+    def api(self, params):
+        """(status, body) for /api/logs/search given its query parameters as a dict of strings.
+
+        Parameters: q, level, subsystem, from, to, limit, cursor.
+        """
+        self.start()
+        started = time.perf_counter()
+        try:
+            limit = int(params.get('limit') or DEFAULT_LIMIT)
+        except ValueError:
+            return 400, {'error': 'limit must be a number'}
+        try:
+            results, next_cursor = self.search(
+                params.get('q'), params.get('level'), params.get('subsystem'),
+                params.get('from'), params.get('to'), limit, params.get('cursor')
+            )
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except sqlite3.Error as e:
+            return 503, {'error': str(e)}
+        return 200, {
+            'results': results,
+            'nextCursor': next_cursor,
+            'tookMs': round((time.perf_counter() - started) * 1000, 2),
+        }
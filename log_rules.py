@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Compiled log summarization rules for the OpenClaw dashboard.
+Rules are loaded from log_rules.json (plus an optional user file) and compiled
+once into a literal prefilter and a single combined alternation, so each log
+line is summarized in one regex pass instead of one search per rule.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import json
+import os
+import re
+import sys
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'log_rules.json')
+USER_RULES_PATH = os.environ.get(
+    'OPENCLAW_DASHBOARD_RULES', os.path.expanduser('~/.openclaw/dashboard/log_rules.json')
+)
+
+_META_CHARS = set('.^$*+?{}[]\\|()')
+_TEMPLATE_REF = re.compile(r'\\(\d+)|\\g<(\d+)>')
+
+
+def _literal_prefix(pattern):
+    """Longest plain-text prefix of a regex, used as that rule's prefilter literal."""
+    out = []
+    for ch in pattern:
+        if ch in _META_CHARS:
+            # A quantifier makes the preceding character optional or repeatable
+            if ch in '*?{' and out:
+                out.pop()
+            break
+        out.append(ch)
+    return ''.join(out)
+
+
+def _top_level_alternatives(pattern):
+    """Split a regex on the `|`s outside groups and character classes."""
+    branches, start, depth, i = [], 0, 0, 0
+    in_class = False
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            i += 1  # skip the escaped character
+        elif in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal member, not the end of the class
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _prefilter_literals(pattern):
+    """One literal per top-level alternative; a line matching the pattern contains one of them."""
+    return [_literal_prefix(branch) for branch in _top_level_alternatives(pattern)]
+
+
+def _compile_template(template):
+    """Split a `\\1`-style replacement into literal text and group references."""
+    parts = []
+    pos = 0
+    for m in _TEMPLATE_REF.finditer(template):
+        if m.start() > pos:
+            parts.append(template[pos:m.start()])
+        parts.append(int(m.group(1) or m.group(2)))
+        pos = m.end()
+    if pos < len(template):
+        parts.append(template[pos:])
+    return parts
+
+
+class LogRuleEngine:
+    """Summarize log messages with a fixed set of compiled rewrite rules.
+
+    Each rule is {"name", "match", "replace", optional "literal"}. `match` is a
+    regex searched in the message; `replace` may reference its groups as `\\1`.
+    A line is only searched when one of the rules' literals occurs in it; by
+    default each top-level alternative of `match` contributes its literal
+    prefix, and "literal" may override that with a string or a list. When
+    several rules match, the earliest rule in the list wins, wherever its match is.
+    Rule patterns must not use numeric backreferences, since they are combined
+    into one alternation.
+    """
+
+    def __init__(self, rules, keep_keywords=()):
+        self.rules = []
+        alternatives = []
+        literals = []
+        group = 1
+        for i, rule in enumerate(rules):
+            pattern = rule['match']
+            inner = re.compile(pattern).groups
+            literal = rule['literal'] if 'literal' in rule else _prefilter_literals(pattern)
+            literal = [literal] if isinstance(literal, str) else list(literal)
+            self.rules.append({
+                'name': rule.get('name', f'rule{i}'),
+                'group': group,
+                'groups': inner,
+                'template': _compile_template(rule['replace']),
+                'regex': re.compile(pattern),
+                'literals': None if '' in literal else tuple(literal),
+            })
+            alternatives.append(f'(?P<r{i}>{pattern})')
+            literals.extend(literal)
+            group += inner + 1
+
+        self._combined = re.compile('|'.join(alternatives)) if alternatives else None
+        # An empty literal means that rule cannot be prefiltered
+        self._literals = None if '' in literals else tuple(dict.fromkeys(literals))
+        self.keep_keywords = tuple(dict.fromkeys(keep_keywords))
+        self._keep = re.compile('|'.join(map(re.escape, self.keep_keywords))) if self.keep_keywords else None
+
+    def keeps(self, msg):
+        """True if the message contains any of the keep keywords."""
+        return self._keep is not None and self._keep.search(msg) is not None
+
+    def summarize(self, s):
+        """Rewrite `s` with the first matching rule, or return None if no rule applies."""
+        if self._combined is None:
+            return None
+        if self._literals is not None:
+            for literal in self._literals:
+                if literal in s:
+                    break
+            else:
+                return None
+
+        m = self._combined.search(s)
+        if m is None:
+            return None
+        index = int(m.lastgroup[1:])
+        rule = self.rules[index]
+        base = rule['group']
+        # The alternation finds the leftmost match; an earlier rule matching further right still wins
+        for earlier in self.rules[:index]:
+            literals = earlier['literals']
+            if literals is not None and not any(literal in s for literal in literals):
+                continue
+            em = earlier['regex'].search(s)
+            if em is not None:
+                m, rule, base = em, earlier, 0
+                break
+        out = [s[:m.start()]]
+        for part in rule['template']:
+            if isinstance(part, int):
+                out.append(m.group(base + part) or '')
+            else:
+                out.append(part)
+        out.append(s[m.end():])
+        return ''.join(out)
+
+
+def _read_rules_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('rules', []), data.get('keep', [])
+
+
+def load_rule_engine(path=RULES_PATH, user_path=USER_RULES_PATH):
+    """Build the engine from the bundled rules plus the user's rules file, if present.
+
+    User rules are tried before the bundled ones and their keep keywords are added
+    to the bundled list. A broken user file is reported and ignored.
+    """
+    rules, keep = _read_rules_file(path)
+    if user_path and os.path.exists(user_path):
+        try:
+            user_rules, user_keep = _read_rules_file(user_path)
+            return LogRuleEngine(list(user_rules) + list(rules), list(keep) + list(user_keep))
+        except (OSError, ValueError, KeyError, re.error) as e:
+            print(f"⚠️  Ignoring log rules in {user_path}: {e}", file=sys.stderr)
+    return LogRuleEngine(rules, keep)
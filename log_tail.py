@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Incremental tailer for OpenClaw log files.
+Follows every file matching the pattern, remembering each one's device + inode
+and the byte offset it has consumed, so each refresh decodes only newly
+appended bytes instead of the whole log. Events from several files (the end of
+a rotated file and the start of its successor) are merged by timestamp, and
+the directory listing is cached by the directory's mtime. An optional byte-level
+prefilter skips decoding lines the parser would drop.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import glob
+import heapq
+import itertools
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+READ_CHUNK = 1024 * 1024  # bytes per read() when catching up
+REVERSE_BLOCK = 64 * 1024  # bytes per backward seek on a cold start
+FOLLOWED_FILES = 2  # newest files checked on every poll; older ones only when the directory changes
+MMAP_MIN_BYTES = 8 * 1024 * 1024  # backfills at least this large are scanned through mmap
+SCAN_CHUNK = 4 * 1024 * 1024  # bytes prefiltered at a time by scan_events()
+HEAD_BYTES = 128  # leading bytes remembered per followed file, to spot it being rewritten in place
+
+
+def _mtime_stamp(mtime):
+    """A file mtime in the log's timestamp format (ISO 8601 UTC), for comparing with event times."""
+    return datetime.fromtimestamp(mtime, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+class LinePrefilter:
+    """Pick out, at byte level, the lines a log parser could keep.
+
+    A line is a candidate if it contains one of `tokens` (ASCII
+    case-insensitively) or doesn't start with the `structured` bytes pattern,
+    since free-form lines (stack traces, JSON blobs) are kept by the parsers. A
+    buffer is lowercased once and searched token by token with bytes.find(), so
+    only candidate lines are ever decoded. Candidates are a superset: the parser
+    still makes the final call.
+    """
+
+    def __init__(self, tokens, structured):
+        self.tokens = tuple(dict.fromkeys(t.lower().encode('utf-8') for t in tokens if t))
+        self._structured = re.compile(structured)
+        # Anchored on the newline itself so the regex engine can skip ahead with a literal search
+        self._freeform = re.compile(b'\n(?!' + structured + b')')
+
+    def lines(self, buf):
+        """Candidate lines of `buf` (newline-separated lines), in order and without newlines."""
+        folded = buf.lower()
+        size = len(buf)
+        ends = set()  # candidate lines, by the offset of their newline
+        for token in self.tokens:
+            hit = folded.find(token)
+            while hit != -1:
+                end = folded.find(b'\n', hit)
+                if end == -1:
+                    ends.add(size)
+                    break
+                ends.add(end)
+                hit = folded.find(token, end)
+        starts = [m.end() for m in self._freeform.finditer(buf)]
+        if not self._structured.match(buf):
+            starts.append(0)
+        for start in starts:
+            end = buf.find(b'\n', start)
+            ends.add(size if end == -1 else end)
+        lines = []
+        for end in sorted(ends):
+            start = buf.rfind(b'\n', 0, end) + 1
+            if end > start:
+                lines.append(buf[start:end])
+        return lines
+
+
+def scan_events(path, parse_line, prefilter, start=0, end=None, chunk=SCAN_CHUNK):
+    """Events of the complete lines in [start, end) of `path`, decoding only prefilter candidates.
+
+    The file is memory-mapped and prefiltered `chunk` bytes at a time; `start`
+    must be the beginning of a line. Returns (events, offset just past the last
+    complete line). The range must not be truncated while it is being scanned.
+    """
+    events = []
+    with open(path, 'rb') as f:
+        end = os.fstat(f.fileno()).st_size if end is None else end
+        if end <= start:
+            return events, start
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                stop = mm.rfind(b'\n', pos, min(end, pos + chunk)) + 1
+                if stop == 0:
+                    # A line longer than a chunk, or the unfinished last line
+                    stop = mm.find(b'\n', pos, end) + 1
+                    if stop == 0:
+                        break
+                for raw in prefilter.lines(mm[pos:stop]):
+                    event = parse_line(raw.decode('utf-8', errors='ignore'))
+                    if event is not None:
+                        events.append(event)
+                pos = stop
+    return events, pos
+
+
+class _ReverseReader:
+    """Iterate the kept events of `path` newest-first, reading backwards in fixed-size blocks.
+
+    The file is opened on the first next(). An unterminated last line is left
+    unread; `offset` is then just past the last complete line, and `scanned`
+    counts the bytes read so far. With a `prefilter`, only candidate lines are decoded.
+    """
+
+    def __init__(self, path, parse_line, end=None, block_size=REVERSE_BLOCK, prefilter=None):
+        self.path = path
+        self.parse_line = parse_line
+        self.prefilter = prefilter
+        self.end = end
+        self.block_size = block_size
+        self.offset = end
+        self.scanned = 0
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            end = self.end if self.end is not None else os.fstat(f.fileno()).st_size
+            self.offset = end
+            pos = end
+            buf = b''  # bytes from `pos` up to the earliest unprocessed newline
+            trailing = None  # length of the unterminated last line, once located
+            while pos > 0:
+                start = max(0, pos - self.block_size)
+                f.seek(start)
+                buf = f.read(pos - start) + buf
+                pos = start
+                self.scanned = end - pos
+
+                lines = buf.split(b'\n')
+                if trailing is None:
+                    if len(lines) == 1 and pos > 0:
+                        continue  # no newline yet; keep reading backwards
+                    trailing = len(lines.pop())
+                    self.offset = end - trailing
+
+                # lines[0] may start mid-line unless we reached the top of the file
+                if pos > 0:
+                    buf = lines[0]
+                    lines = lines[1:]
+                else:
+                    buf = b''
+                if self.prefilter is not None:
+                    lines = self.prefilter.lines(b'\n'.join(lines))
+                for raw in reversed(lines):
+                    event = self.parse_line(raw.decode('utf-8', errors='ignore'))
+                    if event is not None:
+                        yield event
+
+
+def read_last_events(path, parse_line, limit, end=None, block_size=REVERSE_BLOCK, prefilter=None):
+    """Collect the newest `limit` kept events by reading `path` backwards in fixed-size blocks.
+
+    Stops as soon as `limit` lines survive `parse_line`, so the cost depends on how
+    far back those events are rather than on the file size. An unterminated last
+    line is left unread. Returns (events oldest-first, offset just past the last
+    complete line, bytes scanned).
+    """
+    reader = _ReverseReader(path, parse_line, end, block_size, prefilter)
+    events = iter(reader)
+    try:
+        newest = list(itertools.islice(events, limit))
+    finally:
+        events.close()
+    newest.reverse()
+    return newest, reader.offset, reader.scanned
+
+
+class _Newest:
+    """Heap key that pops the latest timestamp first (heapq is a min-heap)."""
+
+    __slots__ = ('stamp',)
+
+    def __init__(self, stamp):
+        self.stamp = stamp
+
+    def __lt__(self, other):
+        return self.stamp > other.stamp
+
+    def __eq__(self, other):
+        return self.stamp == other.stamp
+
+
+def merge_last_events(files, parse_line, limit, block_size=REVERSE_BLOCK, prefilter=None):
+    """The newest `limit` kept events across `files`, merged by timestamp.
+
+    `files` is [(path, size, mtime)], oldest mtime first. Each file is read
+    backwards, and opened only once the merge reaches events older than the
+    file's mtime (nothing in it can be newer), so a window filled from the
+    newest file never touches the rest. Events without a timestamp sort with the
+    event after them. Returns (events oldest-first, {path: offset just past the
+    last complete line, or the size for files never opened}, bytes scanned).
+    """
+    pending = list(files)
+    readers = []
+    heap = []
+    merged = []
+
+    def push(rank, events, stamp):
+        for event in events:
+            stamp = event.get('time') or stamp
+            heapq.heappush(heap, (_Newest(stamp), -rank, event, events))
+            return
+
+    try:
+        while len(merged) < limit:
+            # Open older files while they could hold events at least as new as the heap's best
+            while pending and (not heap or heap[0][0].stamp <= _mtime_stamp(pending[-1][2])):
+                path, size, mtime = pending.pop()
+                reader = _ReverseReader(path, parse_line, size, block_size, prefilter)
+                readers.append(reader)
+                push(len(pending), iter(reader), _mtime_stamp(mtime))
+            if not heap:
+                break
+            newest, rank, event, events = heapq.heappop(heap)
+            merged.append(event)
+            push(-rank, events, newest.stamp)
+    finally:
+        for _, _, _, events in heap:
+            events.close()
+
+    merged.reverse()
+    offsets = {path: size for path, size, _ in files}
+    offsets.update((reader.path, reader.offset) for reader in readers)
+    return merged, offsets, sum(reader.scanned for reader in readers)
+
+
+class LogDirectory:
+    """The files matching `pattern` (a glob within one literal directory), oldest mtime first.
+
+    Creating, deleting or renaming a file changes the directory's mtime and
+    appending doesn't, so the glob and per-file stats only run again after the
+    directory changes; otherwise a listing costs a single stat.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.directory = os.path.dirname(pattern) or '.'
+        self.listings = 0
+        self._mtime = None
+        self._files = []
+
+    def files(self):
+        """([(path, stat_result)] as of the last listing, whether it was just relisted)."""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime, self._files = None, []
+            return [], False
+        if mtime == self._mtime:
+            return self._files, False
+        files = []
+        for path in glob.glob(self.pattern):
+            try:
+                files.append((path, os.stat(path)))
+            except FileNotFoundError:
+                continue
+        files.sort(key=lambda f: f[1].st_mtime)
+        self._mtime, self._files = mtime, files
+        self.listings += 1
+        return files, True
+
+
+class _FileState:
+    def __init__(self, inode, offset=0):
+        self.inode = inode
+        self.offset = offset
+        self.partial = b''
+        self.seen = None  # (size, mtime_ns) when `head` was last checked
+        self.head = b''
+
+    def rewritten(self, path, st):
+        """True if the file shrank or its first bytes changed since last seen; records size, mtime and head."""
+        if st.st_size < self.offset:
+            return True
+        seen = (st.st_size, st.st_mtime_ns)
+        if seen == self.seen:
+            return False
+        self.seen = seen
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(HEAD_BYTES)
+        except OSError:
+            return False
+        # A copytruncate followed by new writes can grow past the offset; the start of the file gives it away
+        if head[:len(self.head)] != self.head:
+            return True
+        self.head = head
+        return False
+
+
+class LogTailer:
+    """Follow the files matching `pattern`, feeding parsed events into a bounded buffer.
+
+    `parse_line` takes one decoded line and returns an event dict, or None to drop it.
+    Each file is read from its own offset: a new file (or the same path with a
+    new inode) starts at 0, and so does a file truncated or rewritten in place,
+    spotted by its size dropping below the offset or its first HEAD_BYTES
+    changing (checked when its size or mtime moves). Events read
+    from several files in one poll are merged by timestamp, so a rotation neither
+    empties the feed nor drops the old file's last lines. The newest
+    FOLLOWED_FILES files are checked on every poll, the rest when the directory
+    changes. The very first poll seeds the buffer with merge_last_events()
+    rather than reading the files from the top. Each buffered event is stamped
+    with an increasing `id`, a stable paging key. With a LinePrefilter only
+    candidate lines are decoded, and backfills of MMAP_MIN_BYTES or more are
+    scanned with scan_events().
+    """
+
+    def __init__(self, pattern, parse_line, maxlen=500, prefilter=None):
+        self.pattern = pattern
+        self.parse_line = parse_line
+        self.prefilter = prefilter
+        self.events = deque(maxlen=maxlen)
+        self.listing = LogDirectory(pattern)
+        self.files = {}  # path -> _FileState
+        self.bytes_read = 0
+        self.last_id = 0
+        self._seeded = False
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """Consume anything appended since the last poll and return the buffered events."""
+        with self._lock:
+            files, relisted = self.listing.files()
+            if not files:
+                return list(self.events)
+
+            if not self._seeded:
+                # Seed the buffer from the end of the files instead of replaying all of them
+                self._seeded = True
+                events, offsets, scanned = merge_last_events(
+                    [(path, st.st_size, st.st_mtime) for path, st in files], self.parse_line, self.events.maxlen,
+                    prefilter=self.prefilter
+                )
+                self.bytes_read += scanned
+                for path, st in files:
+                    state = self.files[path] = _FileState((st.st_dev, st.st_ino), offsets[path])
+                    state.rewritten(path, st)
+                for event in events:
+                    self._append(event)
+
+            if relisted:
+                listed = {path for path, _ in files}
+                for path in [p for p in self.files if p not in listed]:
+                    del self.files[path]
+                check = [path for path, _ in files]
+            else:
+                check = [path for path, _ in files[-FOLLOWED_FILES:]]
+
+            batches = []
+            for path in check:
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                inode = (st.st_dev, st.st_ino)
+                state = self.files.get(path)
+                if state is None or state.inode != inode or state.rewritten(path, st):
+                    state = self.files[path] = _FileState(inode)
+                    state.rewritten(path, st)
+                if st.st_size > state.offset:
+                    batches.append(self._read_from(path, state, st.st_size))
+
+            for _, event in heapq.merge(*batches, key=lambda item: item[0]):
+                self._append(event)
+            return list(self.events)
+
+    def _read_from(self, path, state, end):
+        """New events of one file as [(timestamp, event)]; untimed events take the previous timestamp."""
+        parsed = []
+        if self.prefilter is not None and not state.partial and end - state.offset >= MMAP_MIN_BYTES:
+            parsed, offset = scan_events(path, self.parse_line, self.prefilter, state.offset, end)
+            self.bytes_read += offset - state.offset
+            state.offset = offset
+        else:
+            with open(path, 'rb') as f:
+                f.seek(state.offset)
+                while state.offset < end:
+                    chunk = f.read(min(READ_CHUNK, end - state.offset))
+                    if not chunk:
+                        break
+                    state.offset += len(chunk)
+                    self.bytes_read += len(chunk)
+                    data = state.partial + chunk
+                    # The last piece has no newline yet; hold it until the writer finishes the line
+                    cut = data.rfind(b'\n') + 1
+                    state.partial = data[cut:]
+                    if self.prefilter is not None:
+                        lines = self.prefilter.lines(data[:cut])
+                    else:
+                        lines = data[:cut].split(b'\n')[:-1]
+                    for raw in lines:
+                        event = self.parse_line(raw.decode('utf-8', errors='ignore'))
+                        if event is not None:
+                            parsed.append(event)
+        events = []
+        stamp = ''
+        for event in parsed:
+            stamp = event.get('time') or stamp
+            events.append((stamp, event))
+        return events
+
+    def _append(self, event):
+        self.last_id += 1
+        event['id'] = self.last_id
+        self.events.append(event)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Persistent time series of dashboard metrics in SQLite.
+A background thread samples the current metrics on a fixed interval and writes
+them in batches (one WAL transaction per flush). Every write also updates
+1-minute and 1-hour rollups, so range queries read pre-aggregated rows; raw
+samples and minute rollups are pruned after their retention period.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+HISTORY_PATH = os.environ.get(
+    'OPENCLAW_DASHBOARD_HISTORY', os.path.expanduser('~/.openclaw/dashboard/history.sqlite3')
+)
+SAMPLE_INTERVAL = 15  # seconds between metric samples
+FLUSH_INTERVAL = 60  # seconds between batched writes
+RAW_RETENTION = 2 * 86400  # seconds raw samples are kept
+MINUTE_RETENTION = 30 * 86400  # seconds 1-minute rollups are kept; hourly rollups are kept forever
+PRUNE_INTERVAL = 3600
+MAX_POINTS = 1000  # cap on points returned by one query
+
+# (table, bucket seconds, retention seconds or None)
+TIERS = [
+    ('samples', 1, RAW_RETENTION),
+    ('rollup_1m', 60, MINUTE_RETENTION),
+    ('rollup_1h', 3600, None),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    metric TEXT NOT NULL, ts INTEGER NOT NULL, value REAL NOT NULL,
+    PRIMARY KEY (metric, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    metric TEXT NOT NULL, bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL, sum REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL,
+    PRIMARY KEY (metric, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1h (
+    metric TEXT NOT NULL, bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL, sum REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL,
+    PRIMARY KEY (metric, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO {table} (metric, bucket, count, sum, min, max) VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT (metric, bucket) DO UPDATE SET
+    count = count + 1, sum = sum + excluded.sum,
+    min = MIN(min, excluded.min), max = MAX(max, excluded.max)
+"""
+
+
+class MetricsHistory:
+    """Batched SQLite writer and range-query reader for numeric metrics.
+
+    `sample()` returns {metric name: number} for the current moment; it is
+    called every `sample_interval` seconds once start() has run.
+    """
+
+    def __init__(self, path=HISTORY_PATH, sample=None, sample_interval=SAMPLE_INTERVAL,
+                 flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.sample = sample
+        self.sample_interval = sample_interval
+        self.flush_interval = flush_interval
+        self.error = None
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_prune = 0.0
+        self._db = None
+
+    def _connect(self):
+        """Open the database on first use; False (with `error` set) if it can't be opened."""
+        if self._db is not None:
+            return True
+        if self.error and self.error.startswith('history disabled'):
+            return False
+        try:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self.error = f"history disabled: {e}"
+            print(f"⚠️  Metrics {self.error}", file=sys.stderr)
+            return False
+        self._db = db
+        return True
+
+    def start(self):
+        """Start the background sampler/writer (idempotent)."""
+        with self._start_lock:
+            if self._thread is not None or self.sample is None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='metrics-history', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._start_lock:
+            self._stop.set()
+            self._thread = None
+        self.flush()
+
+    def _loop(self):
+        last_flush = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.record(self.sample())
+            except Exception as e:
+                self.error = f"sample failed: {e}"
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+            self._stop.wait(self.sample_interval)
+
+    def record(self, metrics, ts=None):
+        """Queue one sample of each metric; written on the next flush."""
+        ts = int(time.time() if ts is None else ts)
+        rows = [(name, ts, float(value)) for name, value in metrics.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        with self._pending_lock:
+            self._pending.extend(rows)
+
+    def flush(self):
+        """Write queued samples and their rollups in one transaction; returns rows written."""
+        try:
+            with self._db_lock:
+                # Taken under the DB lock so readers see each row either pending or written
+                with self._pending_lock:
+                    rows, self._pending = self._pending, []
+                if not rows:
+                    return 0
+                minute = [(m, ts - ts % 60, v, v, v) for m, ts, v in rows]
+                hour = [(m, ts - ts % 3600, v, v, v) for m, ts, v in rows]
+                if not self._connect():
+                    return 0
+                self._db.execute('BEGIN')
+                try:
+                    self._db.executemany('INSERT OR REPLACE INTO samples VALUES (?, ?, ?)', rows)
+                    self._db.executemany(_UPSERT_ROLLUP.format(table='rollup_1m'), minute)
+                    self._db.executemany(_UPSERT_ROLLUP.format(table='rollup_1h'), hour)
+                    self._db.execute('COMMIT')
+                except sqlite3.Error:
+                    self._db.execute('ROLLBACK')
+                    raise
+            self.error = None
+        except sqlite3.Error as e:
+            self.error = f"write failed: {e}"
+            return 0
+        if time.time() - self._last_prune > PRUNE_INTERVAL:
+            self.prune()
+        return len(rows)
+
+    def prune(self, now=None):
+        """Drop raw samples and minute rollups past their retention."""
+        now = time.time() if now is None else now
+        self._last_prune = now
+        with self._db_lock:
+            if not self._connect():
+                return
+            for table, _, retention in TIERS:
+                if retention is None:
+                    continue
+                column = 'ts' if table == 'samples' else 'bucket'
+                self._db.execute(f'DELETE FROM {table} WHERE {column} < ?', (int(now - retention),))
+
+    def _pending_rows(self, metric=None):
+        with self._pending_lock:
+            return [row for row in self._pending if metric is None or row[0] == metric]
+
+    def metrics(self):
+        """Names of all metrics with hourly history or samples waiting to be written."""
+        with self._db_lock:
+            names = {name for name, _, _ in self._pending_rows()}
+            if self._connect():
+                names.update(r[0] for r in self._db.execute('SELECT DISTINCT metric FROM rollup_1h'))
+        return sorted(names)
+
+    def query(self, metric, start, end, step=None):
+        """Points [[t, avg, min, max], ...] for `metric` in [start, end], `step` seconds apart.
+
+        Reads the coarsest tier whose buckets fit in `step` and still cover
+        `start`; `step` defaults to a value giving at most MAX_POINTS points.
+        Samples still waiting for the next batched write are merged in.
+        """
+        start, end = int(start), int(end)
+        span = max(1, end - start)
+        step = max(int(step or 0), -(-span // MAX_POINTS), 1)
+        now = time.time()
+        covering = [(name, size) for name, size, retention in TIERS if retention is None or start >= now - retention]
+        fitting = [tier for tier in covering if tier[1] <= step]
+        # Coarsest tier whose buckets fit in one step, else the finest one that reaches back to `start`
+        table, bucket = fitting[-1] if fitting else covering[0]
+        step = -(-step // bucket) * bucket  # whole buckets per point
+        if table == 'samples':
+            sql = ('SELECT (ts / :step) * :step AS t, SUM(value), COUNT(*), MIN(value), MAX(value) FROM samples '
+                   'WHERE metric = :metric AND ts BETWEEN :start AND :end GROUP BY t ORDER BY t')
+        else:
+            sql = (f'SELECT (bucket / :step) * :step AS t, SUM(sum), SUM(count), MIN(min), MAX(max) FROM {table} '
+                   'WHERE metric = :metric AND bucket BETWEEN :start AND :end GROUP BY t ORDER BY t')
+        params = {'metric': metric, 'start': start - start % bucket, 'end': end, 'step': step}
+        with self._db_lock:
+            if not self._connect():
+                raise sqlite3.OperationalError(self.error)
+            rows = self._db.execute(sql, params).fetchall()
+            pending = self._pending_rows(metric)
+        points = {t: [total, count, lo, hi] for t, total, count, lo, hi in rows}
+        for _, ts, value in pending:
+            if params['start'] <= ts - ts % bucket <= end:
+                point = points.setdefault(ts // step * step, [0.0, 0, value, value])
+                point[0] += value
+                point[1] += 1
+                point[2] = min(point[2], value)
+                point[3] = max(point[3], value)
+        return {
+            'metric': metric,
+            'from': start,
+            'to': end,
+            'step': step,
+            'resolution': table,
+            'points': [[t, round(total / count, 4), lo, hi] for t, (total, count, lo, hi) in sorted(points.items())],
+        }
+
+    def api(self, params):
+        """(status, body) for /api/history given its query parameters as a dict of strings.
+
+        Without `metric`, lists the recorded metrics. `from`/`to` are Unix
+        seconds (default: the last 24 hours) and `step` is in seconds.
+        """
+        self.start()
+        metric = params.get('metric')
+        try:
+            if not metric:
+                return 200, {'metrics': self.metrics()}
+            end = float(params.get('to') or time.time())
+            start = float(params.get('from') or end - 86400)
+            step = int(params['step']) if params.get('step') else None
+        except ValueError:
+            return 400, {'error': 'from, to and step must be numbers'}
+        except sqlite3.Error as e:
+            return 503, {'error': str(e)}
+        # float() accepts 'inf' and 'nan'; SQLite integers stop at 2**63
+        if not all(math.isfinite(v) and abs(v) < 2 ** 62 for v in (start, end)) or abs(step or 0) >= 2 ** 62:
+            return 400, {'error': 'from, to and step must be finite Unix seconds'}
+        if start > end:
+            return 400, {'error': 'from must not be after to'}
+        try:
+            return 200, self.query(metric, start, end, step)
+        except sqlite3.Error as e:
+            return 503, {'error': str(e)}
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Paged, filterable views of the dashboard lists (activity, tasks, cron jobs).
+Each snapshot's lists are indexed once, with row positions grouped by status,
+level, subsystem and so on, so /api/logs, /api/tasks and /api/cron answer a
+filtered page with a binary search instead of a scan. Cursors carry the sort
+key of the last row returned, so paging doesn't skip or repeat rows while new
+ones arrive.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import base64
+import heapq
+import json
+import threading
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor(); raises ValueError on anything it didn't produce."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"invalid cursor: {e}")
+
+
+class PagedList:
+    """Rows in display order plus a position index for each field in `indexed`.
+
+    `key(row)` must strictly decrease along the list (newest first) and be
+    JSON-able; lists compare like tuples. Without `key`, rows are paged by
+    position. Indexed values are matched case-insensitively.
+    """
+
+    def __init__(self, rows, key=None, indexed=()):
+        self.rows = rows
+        self.keys = [key(row) for row in rows] if key else [-pos for pos in range(len(rows))]
+        self.indexes = {}
+        for field in indexed:
+            index = self.indexes[field] = {}
+            for pos, row in enumerate(rows):
+                index.setdefault(str(row.get(field) or '').lower(), []).append(pos)
+
+    def _positions(self, filters):
+        """Ascending positions of rows matching every filter, or None for all rows."""
+        positions = None
+        for field, values in filters.items():
+            index = self.indexes[field]
+            matched = list(heapq.merge(*(index.get(value, ()) for value in set(values))))
+            positions = matched if positions is None else sorted(set(positions).intersection(matched))
+        return positions
+
+    def page(self, limit=DEFAULT_LIMIT, cursor=None, filters=None, fields=None):
+        """(rows, next cursor or None, rows matching in total) for the page after `cursor`.
+
+        `filters` maps indexed fields to accepted values; `fields` projects each
+        row onto those keys.
+        """
+        positions = self._positions({f: [v.lower() for v in values] for f, values in (filters or {}).items()})
+        total = len(self.rows) if positions is None else len(positions)
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        start = 0
+        if cursor:
+            position = decode_cursor(cursor)
+            if not isinstance(position, dict) or 'after' not in position:
+                raise ValueError('invalid cursor')
+            after = position['after']
+            # First matching row whose key sorts after the cursor (keys decrease along the list)
+            lo, hi = 0, total
+            try:
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if self.keys[mid if positions is None else positions[mid]] < after:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+            except TypeError:
+                raise ValueError('invalid cursor')
+            start = lo
+        end = min(start + limit, total)
+        chosen = range(start, end) if positions is None else positions[start:end]
+        rows = [self.rows[pos] for pos in chosen]
+        next_cursor = encode_cursor({'after': self.keys[chosen[-1]]}) if end < total else None
+        if fields:
+            rows = [{f: row[f] for f in fields if f in row} for row in rows]
+        return rows, next_cursor, total
+
+
+class PagedViews:
+    """Named PagedLists built from scheduler snapshots, once per snapshot tag.
+
+    `builders` maps a view name to a function(snapshot) returning its PagedList.
+    """
+
+    def __init__(self, builders):
+        self.builders = builders
+        self._built = {}
+        self._lock = threading.Lock()
+
+    def view(self, name, snap):
+        with self._lock:
+            entry = self._built.get(name)
+            if entry is not None and entry[0] == snap.tag:
+                return entry[1]
+        view = self.builders[name](snap)
+        with self._lock:
+            self._built[name] = (snap.tag, view)
+        return view
+
+    def api(self, name, snap, params):
+        """(status, body) for a list endpoint given its query parameters as a dict of strings.
+
+        Parameters: limit, cursor, fields (comma-separated), and one filter per
+        indexed field (comma-separated values, any of which may match).
+        """
+        view = self.view(name, snap)
+        try:
+            limit = int(params.get('limit') or DEFAULT_LIMIT)
+        except ValueError:
+            return 400, {'error': 'limit must be a number'}
+        filters = {
+            field: [v.strip() for v in params[field].split(',')]
+            for field in view.indexes if params.get(field)
+        }
+        fields = [f.strip() for f in params['fields'].split(',') if f.strip()] if params.get('fields') else None
+        try:
+            rows, next_cursor, total = view.page(limit, params.get('cursor'), filters, fields)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        return 200, {'results': rows, 'nextCursor': next_cursor, 'total': total}
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Prometheus text-format metrics behind /metrics.
+Counters and histograms are updated on the request and collector hot paths:
+after a label set's first use, an update is a dict lookup, a bisect and a few
+additions under that series' own lock, so threads only contend on one series.
+Values the dashboard already counts elsewhere (CLI runner, caches, log tailer,
+snapshot gauges) are read by collector callbacks only when /metrics is scraped.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import bisect
+import math
+import threading
+import time
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Seconds; spans a cached 304 up to a CLI call running into its 10 s timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _CounterSeries:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class _HistogramSeries:
+    __slots__ = ('bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager observing the seconds spent in its block."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('series', 'started')
+
+    def __init__(self, series):
+        self.series = series
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.series.observe(time.perf_counter() - self.started)
+
+
+class _Family:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self.labels()  # an unlabeled metric is exported from the start, at zero
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """The series for these label values (positional, in `labelnames` order)."""
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _items(self):
+        with self._lock:
+            items = list(self._series.items())
+        for values, series in items:
+            yield tuple(zip(self.labelnames, values)), series
+
+
+class Counter(_Family):
+    kind = 'counter'
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for labels, series in self._items():
+            yield self.name + '_total', labels, series.value
+
+
+class Histogram(_Family):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self):
+        for labels, series in self._items():
+            with series.lock:
+                counts, total = list(series.counts), series.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield self.name + '_bucket', labels + (('le', _format_value(float(bound))),), cumulative
+            yield self.name + '_sum', labels, total
+            yield self.name + '_count', labels, cumulative
+
+
+class MetricsRegistry:
+    """Metric families plus scrape-time collectors, rendered in Prometheus text format.
+
+    A collector is a function returning (name, kind, help, samples) tuples, with
+    samples as [(labels dict, value)]; counters read this way are named with
+    their `_total` suffix already. A collector that raises is skipped for that
+    scrape and counted in `<namespace>_scrape_errors_total`.
+    """
+
+    def __init__(self, namespace='openclaw_dashboard'):
+        self.namespace = namespace
+        self._families = []
+        self._collectors = []
+        self.scrape_errors = self.counter('scrape_errors', 'Metric collectors that raised during a scrape.')
+
+    def _add(self, family):
+        self._families.append(family)
+        return family
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(f"{self.namespace}_{name}", help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(f"{self.namespace}_{name}", help, labelnames, buckets))
+
+    def add_collector(self, collect):
+        self._collectors.append(collect)
+
+    def render(self):
+        """The full /metrics body."""
+        lines = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collect in self._collectors:
+            try:
+                families = list(collect())
+            except Exception:
+                self.scrape_errors.inc()
+                continue
+            for name, kind, help, samples in families:
+                name = f"{self.namespace}_{name}"
+                base = name[:-len('_total')] if kind == 'counter' and name.endswith('_total') else name
+                lines.append(f"# HELP {base} {help}")
+                lines.append(f"# TYPE {base} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
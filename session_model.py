@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Incremental task model for the dashboard's session-derived task list.
+Successive session stores are diffed by key, so the status counters and the
+newest-first order are updated per changed session instead of being rebuilt.
+A task's status also depends on its age: a timer wheel holds the moment each
+task crosses its next age threshold, and a background thread wakes at exactly
+that moment so the transition is published (and streamed) right away.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import bisect
+import threading
+import time
+
+WHEEL_TICK_MS = 1000  # resolution of one timer-wheel slot
+WHEEL_SLOTS = 512  # slots per revolution (~8.5 minutes at 1 s ticks)
+IDLE_WAKE = 60.0  # seconds the timer thread sleeps when nothing is scheduled
+BULK_SORT_MIN = 64  # more additions than this in one sync re-sort the index instead of inserting
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+class TimerWheel:
+    """Hashed timer wheel keyed by an arbitrary hashable.
+
+    Each key has at most one timer; schedule() replaces it. Timers more than one
+    revolution out share a slot with nearer ones and are skipped until due.
+    """
+
+    def __init__(self, tick_ms=WHEEL_TICK_MS, slots=WHEEL_SLOTS):
+        self.tick_ms = tick_ms
+        self.slots = [dict() for _ in range(slots)]
+        self.due = {}  # key -> due time (ms)
+        self._tick = None  # last tick advance() swept
+
+    def __len__(self):
+        return len(self.due)
+
+    def _slot(self, when):
+        return self.slots[(when // self.tick_ms) % len(self.slots)]
+
+    def schedule(self, key, when):
+        self.cancel(key)
+        self.due[key] = when
+        self._slot(when)[key] = when
+
+    def cancel(self, key):
+        when = self.due.pop(key, None)
+        if when is not None:
+            del self._slot(when)[key]
+
+    def advance(self, now):
+        """Remove and return [(due, key)] for every timer due at or before `now`, in due order."""
+        tick = now // self.tick_ms
+        start = tick if self._tick is None else min(self._tick, tick)
+        # After a long gap every slot is swept once rather than once per elapsed tick
+        ticks = range(start, tick + 1) if tick - start < len(self.slots) else range(len(self.slots))
+        fired = []
+        for t in ticks:
+            slot = self.slots[t % len(self.slots)]
+            expired = [(when, key) for key, when in slot.items() if when <= now]
+            for when, key in expired:
+                del slot[key]
+                del self.due[key]
+            fired.extend(expired)
+        self._tick = tick
+        fired.sort(key=lambda item: item[0])
+        return fired
+
+    def next_due(self):
+        """Earliest due time, or None if no timer is scheduled."""
+        if not self.due:
+            return None
+        tick = self._tick if self._tick is not None else min(self.due.values()) // self.tick_ms
+        # Scan one revolution ahead; the first slot holding a timer for its own round wins
+        for t in range(tick, tick + len(self.slots)):
+            current = [when for when in self.slots[t % len(self.slots)].values() if when // self.tick_ms <= t]
+            if current:
+                return min(current)
+        return min(self.due.values())
+
+
+class TaskModel:
+    """Tasks derived from session records, kept current one changed session at a time.
+
+    `describe(key, record)` returns the task dict minus its status; records need
+    `updated_at` (ms) and `aborted` attributes (see session_store.SessionRecord).
+    `stages` are ascending (age limit ms, status) pairs: a task is in the first
+    stage whose limit its age is under, else `final`; aborted tasks are `failed`.
+    `on_due` is called from the timer thread when a task reaches its next stage;
+    it should call advance() and publish the new view.
+    """
+
+    def __init__(self, describe, stages, final='completed', failed='failed',
+                 statuses=None, on_due=None, wheel=None):
+        self.describe = describe
+        self.stages = tuple(stages)
+        self.final = final
+        self.failed = failed
+        self.on_due = on_due
+        self.stats = dict.fromkeys(statuses or [s for _, s in self.stages] + [final, failed], 0)
+        self.version = 0
+        self.transitions = 0  # status changes fired by the wheel
+        self._source = None  # mapping passed to the last sync()
+        self._records = {}
+        self._tasks = {}
+        self._order = []  # (updatedAt, key) ascending; the task list is its reverse
+        self._wheel = wheel or TimerWheel()
+        self._view = None  # (version, tasks, stats)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _status(self, record, now):
+        """(status, ms when it next changes or None) for a record at time `now`."""
+        if record.aborted:
+            return self.failed, None
+        age = max(0, now - record.updated_at)
+        for limit, status in self.stages:
+            if age < limit:
+                return status, record.updated_at + limit
+        return self.final, None
+
+    def _count(self, status, delta):
+        if status in self.stats:
+            self.stats[status] += delta
+
+    def _remove(self, key):
+        task = self._tasks.pop(key)
+        record = self._records.pop(key)
+        del self._order[bisect.bisect_left(self._order, (record.updated_at, key))]
+        self._count(task['status'], -1)
+        self._wheel.cancel(key)
+
+    def _add(self, key, record, now):
+        """Add a task; the caller places (updated_at, key) in the sorted order."""
+        status, due = self._status(record, now)
+        task = self.describe(key, record)
+        task['status'] = status
+        self._tasks[key] = task
+        self._records[key] = record
+        self._count(status, 1)
+        if due is not None:
+            self._wheel.schedule(key, due)
+
+    def _advance(self, now):
+        """Apply every stage change due by `now`; returns how many statuses changed."""
+        changed = 0
+        for _, key in self._wheel.advance(now):
+            # Judged at `now`, so a task that slept through several stages lands in the right one
+            status, next_due = self._status(self._records[key], now)
+            old = self._tasks[key]
+            if status != old['status']:
+                self._count(old['status'], -1)
+                self._count(status, 1)
+                # Snapshots may still hold the old dict, so replace rather than mutate it
+                self._tasks[key] = dict(old, status=status)
+                changed += 1
+            if next_due is not None:
+                self._wheel.schedule(key, next_due)
+        self.transitions += changed
+        return changed
+
+    def sync(self, records, now=None):
+        """Diff `records` ({key: record}) against the previous call and fire due transitions.
+
+        Only added, removed and changed sessions are re-described. `records` is
+        treated as immutable: passing the same mapping object again (as
+        SessionStoreCache does while the file is unchanged) skips the diff.
+        Returns how many tasks changed.
+        """
+        now = now_ms() if now is None else now
+        with self._lock:
+            changed = 0
+            added = []
+            if records is not self._source:
+                for key in [key for key in self._records if key not in records]:
+                    self._remove(key)
+                    changed += 1
+                for key, record in records.items():
+                    previous = self._records.get(key)
+                    if previous == record:
+                        continue
+                    if previous is not None:
+                        self._remove(key)
+                    # A session that never updated has no age to derive a status from
+                    if record.updated_at:
+                        self._add(key, record, now)
+                        added.append((record.updated_at, key))
+                    changed += previous is not None or bool(record.updated_at)
+                if len(added) > BULK_SORT_MIN:
+                    self._order.extend(added)
+                    self._order.sort()
+                else:
+                    for entry in added:
+                        bisect.insort(self._order, entry)
+                self._source = records
+            changed += self._advance(now)
+            if changed:
+                self.version += 1
+        if changed:
+            self._wake.set()  # the earliest deadline may have moved
+        return changed
+
+    def advance(self, now=None):
+        """Fire the transitions due by `now` without a new session store; returns how many changed."""
+        with self._lock:
+            changed = self._advance(now_ms() if now is None else now)
+            if changed:
+                self.version += 1
+            return changed
+
+    def view(self):
+        """(tasks newest first, {status: count}) as of the latest sync; new objects per version."""
+        with self._lock:
+            if self._view is None or self._view[0] != self.version:
+                tasks = [self._tasks[key] for _, key in reversed(self._order)]
+                self._view = (self.version, tasks, dict(self.stats))
+            return self._view[1], self._view[2]
+
+    def next_due(self):
+        with self._lock:
+            return self._wheel.next_due()
+
+    def start(self):
+        """Start the thread that calls `on_due` as each scheduled transition comes due (idempotent)."""
+        if self._thread is not None or self.on_due is None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='task-timers', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            due = self.next_due()
+            if due is not None and due <= now_ms():
+                try:
+                    self.on_due()
+                except Exception:
+                    pass
+                if self.next_due() == due:
+                    # on_due didn't advance the model; don't spin on the same timer
+                    self._stop.wait(1.0)
+                continue
+            self._wake.wait(IDLE_WAKE if due is None else (due - now_ms()) / 1000.0)
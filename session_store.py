@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Cached, streaming reader for the OpenClaw session store (sessions.json).
+The store is re-parsed only when its (inode, size, mtime_ns) fingerprint changes,
+and parsing walks the top-level object one entry at a time, keeping only the
+entries and fields the dashboard uses as compact records.
+Stdlib only.
+"""
+
+import json
+import os
+import threading
+from collections import namedtuple
+from json.decoder import scanstring
+
+READ_CHUNK = 256 * 1024
+_WHITESPACE = ' \t\r\n'
+
+SessionRecord = namedtuple('SessionRecord', 'updated_at aborted model label spawned_by')
+
+
+def _record(s):
+    return SessionRecord(
+        updated_at=int(s.get('updatedAt', 0) or 0),
+        aborted=bool(s.get('abortedLastRun', False)),
+        model=s.get('model', 'unknown'),
+        label=s.get('label'),
+        spawned_by=s.get('spawnedBy', 'main'),
+    )
+
+
+def iter_store_entries(f, key_filter=None, chunk_size=READ_CHUNK):
+    """Yield (key, value) for each top-level entry of a JSON object read from text file `f`.
+
+    Only one entry's value is materialized at a time; entries whose key fails
+    `key_filter` are decoded and dropped immediately. Raises json.JSONDecodeError
+    on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    state = 'start'
+    key = None
+
+    def fill():
+        nonlocal buf, pos, eof
+        # Read at least as much as is buffered so a long value is retried O(log n) times
+        data = f.read(max(chunk_size, len(buf) - pos))
+        if not data:
+            eof = True
+        buf = buf[pos:] + data
+        pos = 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise json.JSONDecodeError('Unexpected end of sessions store', buf, pos)
+            fill()
+            continue
+
+        ch = buf[pos]
+        if state == 'start':
+            if ch != '{':
+                raise json.JSONDecodeError("Expecting '{'", buf, pos)
+            pos += 1
+            state = 'first_key'
+        elif state in ('first_key', 'key'):
+            if ch == '}' and state == 'first_key':
+                return
+            if ch != '"':
+                raise json.JSONDecodeError('Expecting property name', buf, pos)
+            try:
+                key, end = scanstring(buf, pos + 1)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            pos = end
+            state = 'colon'
+        elif state == 'colon':
+            if ch != ':':
+                raise json.JSONDecodeError("Expecting ':'", buf, pos)
+            pos += 1
+            state = 'value'
+        elif state == 'value':
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end >= len(buf) and not eof:
+                # A number or literal may continue in the next chunk
+                fill()
+                continue
+            pos = end
+            state = 'separator'
+            if key_filter is None or key_filter(key):
+                yield key, value
+        elif state == 'separator':
+            pos += 1
+            if ch == '}':
+                return
+            if ch != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos - 1)
+            state = 'key'
+
+
+class SessionStoreCache:
+    """Parsed view of sessions.json, refreshed only when the file's fingerprint changes."""
+
+    def __init__(self, path, key_filter=None):
+        self.path = path
+        self.key_filter = key_filter
+        self.fingerprint = None
+        self.records = {}
+        self.loads = 0
+        self.parses = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return {session key: SessionRecord} for the entries that pass `key_filter`."""
+        with self._lock:
+            self.loads += 1
+            st = os.stat(self.path)
+            fingerprint = (st.st_ino, st.st_size, st.st_mtime_ns)
+            if fingerprint == self.fingerprint:
+                return self.records
+
+            records = {}
+            with open(self.path, 'r', encoding='utf-8') as f:
+                # Fingerprint what was actually opened, in case the file was replaced meanwhile
+                st = os.fstat(f.fileno())
+                fingerprint = (st.st_ino, st.st_size, st.st_mtime_ns)
+                for key, value in iter_store_entries(f, self.key_filter):
+                    if isinstance(value, dict):
+                        records[key] = _record(value)
+            self.records = records
+            self.fingerprint = fingerprint
+            self.parses += 1
+            return records
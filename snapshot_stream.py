@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events feed of dashboard snapshot changes.
+Each client gets one full snapshot, then only the sections that changed:
+new log events are appended, tasks are upserted/removed by key, and any other
+section is replaced whole. Work happens once per published change, not per poll.
+Shared by app.py and app_stdlib.py; stdlib only.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+PAYLOAD_HISTORY = 64  # payload versions kept for Last-Event-ID resume
+
+
+def _append_delta(old, new):
+    """Items appended to `old` to get `new` (old may have scrolled off the front), or None."""
+    for k in range(len(old) + 1):
+        overlap = len(old) - k
+        if new[:overlap] == old[k:]:
+            return new[overlap:]
+    return None
+
+
+def _keyed_delta(old, new, key):
+    """Upserts and removals that turn list `old` into `new`, matching items by `key`."""
+    before = {item.get(key): item for item in old}
+    after = {item.get(key): item for item in new}
+    upsert = [item for k, item in after.items() if before.get(k) != item]
+    remove = [k for k in before if k not in after]
+    return upsert, remove
+
+
+class SnapshotStream:
+    """Turn scheduler snapshots into SSE frames.
+
+    `build_payload(snapshot)` returns the JSON-able dict of dashboard sections
+    (the /api/data shape). Sections listed in `appended` are treated as logs that
+    grow at the end; sections in `keyed` are lists of dicts matched by `key`.
+    Event ids are "<scheduler epoch>-<version>" so ids from a previous process never match.
+    """
+
+    def __init__(self, scheduler, build_payload, appended=('logs',), keyed=('tasks',), key='key'):
+        self.scheduler = scheduler
+        self.build_payload = build_payload
+        self.appended = set(appended)
+        self.keyed = set(keyed)
+        self.key = key
+        self._payloads = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _event_id(self, snap):
+        return f"{self.scheduler.epoch}-{snap.version}"
+
+    def payload_for(self, snap):
+        """Payload for a snapshot, built once per snapshot tag and shared by all clients."""
+        cache_key = snap.tag
+        with self._lock:
+            entry = self._payloads.get(snap.version)
+            if entry is not None and entry[0] == cache_key:
+                return entry[1]
+        payload = self.build_payload(snap)
+        with self._lock:
+            self._payloads[snap.version] = (cache_key, payload)
+            self._payloads.move_to_end(snap.version)
+            while len(self._payloads) > PAYLOAD_HISTORY:
+                self._payloads.popitem(last=False)
+        return payload
+
+    def _payload_by_id(self, event_id):
+        if not event_id or '-' not in event_id:
+            return None
+        epoch, _, version = event_id.partition('-')
+        if epoch != self.scheduler.epoch or not version.isdigit():
+            return None
+        with self._lock:
+            entry = self._payloads.get(int(version))
+        return entry[1] if entry else None
+
+    def delta(self, old, new):
+        """Section-level changes from payload `old` to `new`."""
+        sections = {}
+        for name, value in new.items():
+            if name in old and old[name] == value:
+                continue
+            prev = old.get(name)
+            if name in self.appended and isinstance(prev, list) and isinstance(value, list):
+                added = _append_delta(prev, value)
+                if added is not None:
+                    sections[name] = {'append': added, 'limit': len(value)}
+                    continue
+            if name in self.keyed and isinstance(prev, list) and isinstance(value, list):
+                upsert, remove = _keyed_delta(prev, value, self.key)
+                sections[name] = {'upsert': upsert, 'remove': remove, 'limit': len(value)}
+                continue
+            sections[name] = {'set': value}
+        return sections
+
+    @staticmethod
+    def format_event(event, data, event_id=None):
+        lines = []
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"event: {event}")
+        lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+        return '\n'.join(lines) + '\n\n'
+
+    def events(self, last_event_id=None, stop=None):
+        """Yield SSE frames forever (until `stop` is set): a snapshot or resume delta, then deltas."""
+        yield f"retry: {RETRY_MS}\n\n"
+
+        snap = self.scheduler.snapshot()
+        current = self.payload_for(snap)
+        base = self._payload_by_id(last_event_id)
+        if base is None:
+            yield self.format_event('snapshot', current, self._event_id(snap))
+        else:
+            sections = self.delta(base, current)
+            if sections:
+                yield self.format_event('delta', sections, self._event_id(snap))
+
+        sent_key = snap.tag
+        while stop is None or not stop.is_set():
+            changed = self.scheduler.wait_for_change(snap.version, timeout=HEARTBEAT_SECONDS)
+            snap = self.scheduler.snapshot()
+            key = snap.tag
+            if not changed and key == sent_key:
+                yield ": keepalive\n\n"
+                continue
+            new = self.payload_for(snap)
+            sections = self.delta(current, new)
+            current, sent_key = new, key
+            if sections:
+                yield self.format_event('delta', sections, self._event_id(snap))